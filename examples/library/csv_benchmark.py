@@ -0,0 +1,116 @@
+# coding: utf-8
+
+# This script measures the throughput (in MB/s) of CSV parsing and writing
+# using `unicodecsv` (used by `rows` on Python 2) and the C `csv` module on top
+# of `io.TextIOWrapper` (used by `rows` on Python 3), then the time `rows`
+# takes to import/export the same file.
+#
+# Usage:
+#     python csv_benchmark.py [filename.csv]
+#
+# If no filename is provided, a CSV with 200,000 rows is generated.
+#
+# Install dependencies:
+#     pip install rows unicodecsv
+
+import csv
+import datetime
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import rows
+
+try:
+    import unicodecsv
+except ImportError:
+    unicodecsv = None
+
+
+def generate_csv(filename, rows_count=200000):
+    random.seed(42)
+    start = datetime.date(2000, 1, 1)
+    with open(filename, mode="w", encoding="utf-8", newline="") as fobj:
+        writer = csv.writer(fobj)
+        writer.writerow(["id", "value", "name", "date", "flag", "amount"])
+        for index in range(rows_count):
+            writer.writerow(
+                [
+                    index,
+                    random.random() * 1000,
+                    "Name {} - ação".format(random.randint(1, 10000)),
+                    start + datetime.timedelta(days=random.randint(0, 7000)),
+                    random.choice(["true", "false"]),
+                    "{:.2f}".format(random.random() * 100),
+                ]
+            )
+
+
+def best_time(function, repeat=3):
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        function()
+        elapsed = time.time() - start
+        result = elapsed if result is None else min(result, elapsed)
+    return result
+
+
+def read_unicodecsv(filename):
+    with open(filename, mode="rb") as fobj:
+        for row in unicodecsv.reader(fobj, encoding="utf-8"):
+            pass
+
+
+def read_stdlib(filename):
+    with open(filename, mode="rb") as fobj:
+        text_fobj = io.TextIOWrapper(fobj, encoding="utf-8", newline="")
+        for row in csv.reader(text_fobj):
+            pass
+
+
+def write_unicodecsv(data):
+    unicodecsv.writer(io.BytesIO(), encoding="utf-8").writerows(data)
+
+
+def write_stdlib(data):
+    text_fobj = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", newline="")
+    csv.writer(text_fobj).writerows(data)
+    text_fobj.flush()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        filename = sys.argv[1]
+    else:
+        filename = os.path.join(tempfile.gettempdir(), "rows-csv-benchmark.csv")
+        if not os.path.exists(filename):
+            print("Generating {}...".format(filename))
+            generate_csv(filename)
+
+    megabytes = os.path.getsize(filename) / (1024.0 ** 2)
+    with open(filename, mode="r", encoding="utf-8", newline="") as fobj:
+        data = list(csv.reader(fobj))
+
+    results = [
+        ("read (stdlib csv)", best_time(lambda: read_stdlib(filename))),
+        ("write (stdlib csv)", best_time(lambda: write_stdlib(data))),
+    ]
+    if unicodecsv is not None:
+        results += [
+            ("read (unicodecsv)", best_time(lambda: read_unicodecsv(filename))),
+            ("write (unicodecsv)", best_time(lambda: write_unicodecsv(data))),
+        ]
+    for name, elapsed in sorted(results):
+        print("{:20}: {:6.3f}s ({:7.2f} MB/s)".format(name, elapsed, megabytes / elapsed))
+
+    table = rows.import_from_csv(filename, samples=5000)
+    results = [
+        ("rows.import_from_csv", best_time(lambda: rows.import_from_csv(filename, samples=5000))),
+        ("rows.export_to_csv", best_time(lambda: rows.export_to_csv(table))),
+    ]
+    for name, elapsed in results:
+        print("{:20}: {:6.3f}s ({:7.2f} MB/s)".format(name, elapsed, megabytes / elapsed))
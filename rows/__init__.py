@@ -20,7 +20,7 @@ from __future__ import unicode_literals
 import rows.plugins as plugins
 from rows.localization import locale_context  # NOQA
 from rows.operations import join, transform, transpose  # NOQA
-from rows.table import FlexibleTable, Table  # NOQA
+from rows.table import ColumnarTable, FlexibleTable, Table  # NOQA
 
 # General imports
 
@@ -30,6 +30,9 @@ from rows.table import FlexibleTable, Table  # NOQA
 import_from_json = plugins.json.import_from_json
 export_to_json = plugins.json.export_to_json
 
+import_from_jsonl = plugins.jsonl.import_from_jsonl
+export_to_jsonl = plugins.jsonl.export_to_jsonl
+
 import_from_dicts = plugins.dicts.import_from_dicts
 export_to_dicts = plugins.dicts.export_to_dicts
 
@@ -66,6 +69,8 @@ if plugins.xlsx:
 
 if plugins.parquet:
     import_from_parquet = plugins.parquet.import_from_parquet
+    if plugins.parquet.has_pyarrow:
+        export_to_parquet = plugins.parquet.export_to_parquet
 
 if plugins.postgresql:
     import_from_postgresql = plugins.postgresql.import_from_postgresql
@@ -30,6 +30,7 @@ import sqlite3
 import sys
 import tempfile
 from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from io import BytesIO
 from pathlib import Path
 
@@ -68,6 +69,12 @@ HOME_PATH = Path.home()
 CACHE_PATH = HOME_PATH / ".cache" / "rows" / "http"
 
 
+@contextmanager
+def _nullcontext():
+    """Do-nothing context manager (`contextlib.nullcontext` needs Python 3.7)"""
+    yield
+
+
 def parse_options(options):
     options_dict = {}
     for option in options:
@@ -205,6 +212,17 @@ def cli(http_cache, http_cache_path):
     multiple=True,
     help="Custom (export) plugin key=value custom option (can be specified multiple times)",
 )
+@click.option(
+    "--lazy",
+    is_flag=True,
+    help="Do not load all rows in memory (field types are detected using `--samples` rows)",
+)
+@click.option(
+    "--samples",
+    type=int,
+    default=5000,
+    help="Number of rows to determine the field types when using `--lazy` (0 = all)",
+)
 @click.option("--quiet", "-q", is_flag=True)
 @click.argument("source")
 @click.argument("destination")
@@ -219,6 +237,8 @@ def convert(
     fields_exclude,
     input_option,
     output_option,
+    lazy,
+    samples,
     quiet,
     source,
     destination,
@@ -227,6 +247,18 @@ def convert(
     input_options = parse_options(input_option)
     output_options = parse_options(output_option)
     progress = not quiet
+    if lazy:
+        if order_by is not None:
+            click.echo("ERROR: `--lazy` cannot be used with `--order-by`", err=True)
+            sys.exit(21)
+        elif output_locale is not None:
+            # Rows would be deserialized using the output locale
+            click.echo(
+                "ERROR: `--lazy` cannot be used with `--output-locale`", err=True
+            )
+            sys.exit(21)
+        input_options["lazy"] = True
+        input_options["samples"] = samples if samples > 0 else None
 
     input_encoding = input_encoding or input_options.get("encoding", None)
     source_info = None
@@ -237,17 +269,12 @@ def convert(
         input_encoding = source_info.encoding or DEFAULT_INPUT_ENCODING
 
     import_fields = _get_import_fields(fields, fields_exclude)
-    if input_locale is not None:
-        with rows.locale_context(input_locale):
-            table = _import_table(
-                source_info or source,
-                encoding=input_encoding,
-                verify_ssl=verify_ssl,
-                import_fields=import_fields,
-                progress=progress,
-                **input_options,
-            )
-    else:
+    input_locale_context = (
+        rows.locale_context(input_locale)
+        if input_locale is not None
+        else _nullcontext()
+    )
+    with input_locale_context:
         table = _import_table(
             source_info or source,
             encoding=input_encoding,
@@ -256,6 +283,17 @@ def convert(
             progress=progress,
             **input_options,
         )
+        if lazy:
+            # Rows are deserialized while exported, so the input locale must
+            # be set until the export finishes
+            export_to_uri(
+                table,
+                destination,
+                encoding=output_encoding or DEFAULT_OUTPUT_ENCODING,
+                export_fields=_get_export_fields(table.field_names, fields_exclude),
+                **output_options,
+            )
+            return
 
     if order_by is not None:
         order_by = _get_field_names(order_by, table.field_names, permit_not=True)
@@ -537,6 +575,30 @@ def print_(
     click.echo(fobj.read())
 
 
+def _export_query_result(result, output, output_encoding, output_locale, frame_style):
+    # TODO: may use sys.stdout.encoding if output_file = '-'
+    output_encoding = output_encoding or sys.stdout.encoding or DEFAULT_OUTPUT_ENCODING
+    if output is None:
+        fobj = BytesIO()
+        if output_locale is not None:
+            with rows.locale_context(output_locale):
+                rows.export_to_txt(
+                    result, fobj, encoding=output_encoding, frame_style=frame_style
+                )
+        else:
+            rows.export_to_txt(
+                result, fobj, encoding=output_encoding, frame_style=frame_style
+            )
+        fobj.seek(0)
+        click.echo(fobj.read())
+    else:
+        if output_locale is not None:
+            with rows.locale_context(output_locale):
+                export_to_uri(result, output, encoding=output_encoding)
+        else:
+            export_to_uri(result, output, encoding=output_encoding)
+
+
 @cli.command(name="query", help="Query a table using SQL")
 @click.option("--input-encoding", default=None)
 @click.option("--output-encoding", default="utf-8")
@@ -559,6 +621,11 @@ def print_(
 @click.option(
     "--frame-style", default="ascii", help="Options: ascii, single, double, none"
 )
+@click.option(
+    "--virtual-tables",
+    is_flag=True,
+    help="Query CSV files directly (SQLite virtual tables) instead of loading them",
+)
 @click.option("--quiet", "-q", is_flag=True)
 @click.argument("query", required=True)
 @click.argument("sources", nargs=-1, required=True)
@@ -572,6 +639,7 @@ def query(
     input_option,
     output,
     frame_style,
+    virtual_tables,
     quiet,
     query,
     sources,
@@ -590,80 +658,93 @@ def query(
         )
         query = "SELECT * FROM {} WHERE {}".format(table_names, query)
 
+    if virtual_tables:
+        if rows.plugins.sqlite_vtable is None:
+            click.echo("ERROR: `--virtual-tables` needs `apsw` installed", err=True)
+            sys.exit(22)
+        filenames = []
+        for uri in sources:
+            source = detect_source(uri, verify_ssl=verify_ssl, progress=progress)
+            if source.plugin_name != "csv":
+                click.echo("ERROR: `--virtual-tables` only supports CSV files", err=True)
+                sys.exit(22)
+            filenames.append(source.uri)
+
+        # Values are deserialized while the query runs, so the input locale
+        # must be set until the result is read (the result is only lazy if
+        # there's no output locale to set while exporting)
+        locale_context = (
+            rows.locale_context(input_locale)
+            if input_locale is not None
+            else _nullcontext()
+        )
+        with locale_context:
+            result = rows.plugins.sqlite_vtable.query_csv(
+                query,
+                filenames,
+                encoding=input_encoding,
+                samples=samples,
+                lazy=output_locale is None,
+            )
+            _export_query_result(
+                result, output, output_encoding, output_locale, frame_style
+            )
+        return
+
     if len(sources) == 1:
         source = detect_source(sources[0], verify_ssl=verify_ssl, progress=progress)
+    else:
+        source = None
 
-        if source.plugin_name in ("sqlite", "postgresql"):
-            # Optimization: query the db directly
-            result = import_from_source(
-                source, input_encoding, query=query, samples=samples
+    if source is not None and source.plugin_name in ("sqlite", "postgresql"):
+        # Optimization: query the db directly
+        result = import_from_source(
+            source, input_encoding, query=query, samples=samples, lazy=True
+        )
+        _export_query_result(result, output, output_encoding, output_locale, frame_style)
+        return
+
+    # TODO: if all sources are SQLite we can also optimize the import
+    # Sources are imported lazily and streamed into a temporary SQLite
+    # database, so the memory usage does not depend on the input size. The
+    # query result is also lazy (streamed into the exporter).
+    database = tempfile.NamedTemporaryFile(suffix=".sqlite", delete=False)
+    database.close()
+    sqlite_connection = sqlite3.Connection(database.name)
+    try:
+        for index, uri in enumerate(sources, start=1):
+            locale_context = (
+                rows.locale_context(input_locale)
+                if input_locale is not None
+                else _nullcontext()
             )
-        else:
-            if input_locale is not None:
-                with rows.locale_context(input_locale):
-                    table = import_from_source(source, input_encoding, samples=samples)
-            else:
-                table = import_from_source(source, input_encoding, samples=samples)
-
-            sqlite_connection = sqlite3.Connection(":memory:")
-            rows.export_to_sqlite(table, sqlite_connection, table_name="table1")
-            result = rows.import_from_sqlite(sqlite_connection, query=query)
-
-    else:
-        # TODO: if all sources are SQLite we can also optimize the import
-        if input_locale is not None:
-            with rows.locale_context(input_locale):
-                tables = [
-                    _import_table(
-                        source,
+            with locale_context:
+                if source is not None:
+                    table = import_from_source(
+                        source, input_encoding, samples=samples, lazy=True
+                    )
+                else:
+                    table = _import_table(
+                        uri,
                         encoding=input_encoding,
                         verify_ssl=verify_ssl,
                         samples=samples,
                         progress=progress,
+                        lazy=True,
                     )
-                    for source in sources
-                ]
-        else:
-            tables = [
-                _import_table(
-                    source,
-                    encoding=input_encoding,
-                    verify_ssl=verify_ssl,
-                    samples=samples,
-                    progress=progress,
-                )
-                for source in sources
-            ]
-
-        sqlite_connection = sqlite3.Connection(":memory:")
-        for index, table in enumerate(tables, start=1):
-            rows.export_to_sqlite(
-                table, sqlite_connection, table_name="table{}".format(index)
-            )
-
-        result = rows.import_from_sqlite(sqlite_connection, query=query)
-
-    # TODO: may use sys.stdout.encoding if output_file = '-'
-    output_encoding = output_encoding or sys.stdout.encoding or DEFAULT_OUTPUT_ENCODING
-    if output is None:
-        fobj = BytesIO()
-        if output_locale is not None:
-            with rows.locale_context(output_locale):
-                rows.export_to_txt(
-                    result, fobj, encoding=output_encoding, frame_style=frame_style
+                rows.export_to_sqlite(
+                    table,
+                    sqlite_connection,
+                    table_name="table{}".format(index),
+                    bulk=True,
                 )
-        else:
-            rows.export_to_txt(
-                result, fobj, encoding=output_encoding, frame_style=frame_style
-            )
-        fobj.seek(0)
-        click.echo(fobj.read())
-    else:
-        if output_locale is not None:
-            with rows.locale_context(output_locale):
-                export_to_uri(result, output, encoding=output_encoding)
-        else:
-            export_to_uri(result, output, encoding=output_encoding)
+        result = rows.import_from_sqlite(
+            sqlite_connection, query=query, samples=samples, lazy=True
+        )
+        _export_query_result(result, output, output_encoding, output_locale, frame_style)
+    finally:
+        sqlite_connection.close()
+        os.unlink(database.name)
 
 
 @cli.command(name="schema", help="Identifies table schema")
@@ -868,10 +949,25 @@ def command_csv_fix(log_filename, log_level, input_dialect, input_encoding,
 @click.option("--input-encoding", default=None)
 @click.option("--dialect", default=None)
 @click.option("--schemas", default=None)
+@click.option("--bulk", is_flag=True, default=False)
+@click.option(
+    "--index",
+    "indexes",
+    multiple=True,
+    help="Comma-separated field names to be indexed (can be repeated)",
+)
 @click.argument("sources", nargs=-1, required=True)
 @click.argument("output", required=True)
 def command_csv_to_sqlite(
-    batch_size, samples, input_encoding, dialect, schemas, sources, output
+    batch_size,
+    samples,
+    input_encoding,
+    dialect,
+    schemas,
+    bulk,
+    indexes,
+    sources,
+    output,
 ):
     # TODO: add --quiet
     # TODO: check if all filenames exist (if not, exit with error)
@@ -902,6 +998,8 @@ def command_csv_to_sqlite(
             callback=progress_bar.update,
             encoding=inspector.encoding,
             schema=inspector.schema,
+            bulk=bulk,
+            indexes=indexes,
         )
         progress_bar.close()
 
@@ -945,6 +1043,14 @@ def command_sqlite_to_csv(batch_size, dialect, source, table_name, output):
 @click.option("--schema", "-s", default=None)
 @click.option("--unlogged", "-u", is_flag=True)
 @click.option("--access-method", "-a")
+@click.option("--backend", type=click.Choice(["psql", "psycopg2"]), default="psql")
+@click.option("--jobs", "-j", type=int, default=1)
+@click.option(
+    "--index",
+    "indexes",
+    multiple=True,
+    help="Comma-separated field names to be indexed (can be repeated)",
+)
 @click.argument("source", required=True)
 @click.argument("database_uri", required=True)
 @click.argument("table_name", required=True)
@@ -957,6 +1063,9 @@ def command_pgimport(
     schema,
     unlogged,
     access_method,
+    backend,
+    jobs,
+    indexes,
     source,
     database_uri,
     table_name,
@@ -1046,6 +1155,9 @@ def command_pgimport(
         unlogged=unlogged,
         access_method=access_method,
         callback=progress_bar.update,
+        backend=backend,
+        jobs=jobs,
+        indexes=indexes,
     )
     progress_bar.description = "{} rows imported".format(import_meta["rows_imported"])
     progress_bar.close()
@@ -1055,11 +1167,12 @@ def command_pgimport(
 @click.option("--is-query", "-q", default=False, is_flag=True)
 @click.option("--output-encoding", "-e", default="utf-8")
 @click.option("--dialect", "-d", default="excel")
+@click.option("--backend", type=click.Choice(["psql", "psycopg2"]), default="psql")
 @click.argument("database_uri", required=True)
 @click.argument("table_name", required=True)
 @click.argument("destination", required=True)
 def command_pgexport(
-    is_query, output_encoding, dialect, database_uri, table_name, destination
+    is_query, output_encoding, dialect, backend, database_uri, table_name, destination
 ):
     # TODO: add --quiet
 
@@ -1072,6 +1185,7 @@ def command_pgexport(
         encoding=output_encoding,
         dialect=dialect,
         callback=updater.update,
+        backend=backend,
     )
     updater.close()
 
@@ -1081,6 +1195,9 @@ def command_pgexport(
 @click.option("--chunk-size", default=8 * 1024 * 1024)
 @click.option("-e", "--encoding", default="utf-8")
 @click.option("--no-create-table", default=False, is_flag=True)
+@click.option("--backend", type=click.Choice(["psql", "psycopg2"]), default="psql")
+@click.option("--jobs", "-j", type=int, default=1)
+@click.option("--partition-by", default=None)
 @click.argument("database_uri_from", required=True)
 @click.argument("table_name_or_query_from", required=True)
 @click.argument("database_uri_to", required=True)
@@ -1090,6 +1207,9 @@ def command_pg2pg(
     chunk_size,
     encoding,
     no_create_table,
+    backend,
+    jobs,
+    partition_by,
     database_uri_from,
     table_name_or_query_from,
     database_uri_to,
@@ -1108,6 +1228,9 @@ def command_pg2pg(
         encoding=encoding,
         create_table=not no_create_table,
         binary=binary,
+        backend=backend,
+        jobs=jobs,
+        partition_by=partition_by,
     )
     progress_bar.description = "{} rows imported".format(import_meta["rows_imported"])
     progress_bar.close()
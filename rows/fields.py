@@ -26,6 +26,7 @@ import uuid
 from base64 import b64decode, b64encode
 from collections import OrderedDict, defaultdict
 from decimal import Decimal, InvalidOperation
+from operator import itemgetter
 from unicodedata import normalize
 
 import six
@@ -541,9 +542,19 @@ def get_items(*indexes):
     Similar to `operator.itemgetter`, but will insert `None` when the object
     does not have the desired index (instead of raising IndexError).
     """
-    return lambda obj: tuple(
-        obj[index] if len(obj) > index else None for index in indexes
-    )
+    if not indexes:
+        return lambda obj: ()
+
+    def get_with_none(obj):
+        return tuple(obj[index] if len(obj) > index else None for index in indexes)
+
+    # `itemgetter` is used when the object has all indexes (the common case)
+    min_length = max(indexes) + 1
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda obj: (obj[index],) if len(obj) >= min_length else (None,)
+    getter = itemgetter(*indexes)
+    return lambda obj: getter(obj) if len(obj) >= min_length else get_with_none(obj)
 
 
 def slug(text, separator="_", permitted_chars=SLUG_CHARS):
@@ -633,6 +644,20 @@ def make_header(field_names, permit_not=False, max_size=None, prefix="field_"):
     return result
 
 
+# Field types whose `deserialize` returns the value untouched if it's an
+# instance of `TYPE` (so `make_deserializer` can skip them)
+NATIVE_TYPE_FIELDS = (
+    BinaryField,
+    BoolField,
+    DateField,
+    DatetimeField,
+    DecimalField,
+    FloatField,
+    IntegerField,
+    JSONField,
+    PercentField,
+    TextField,
+)
 DEFAULT_TYPES = (
     BoolField,
     IntegerField,
@@ -648,8 +673,78 @@ DEFAULT_TYPES = (
 )
 
 
+# Regular expressions which match a superset of the strings accepted by some
+# field types - used by `TypeDetector` to discard a type without calling
+# `deserialize` (and raising/catching an exception) on values which can't be
+# converted
+REGEXP_MAYBE_DATE = re.compile(r"^\d{4}-\d{1,2}-[ ]?\d{1,2}\Z", flags=re.UNICODE)
+REGEXP_MAYBE_DECIMAL = re.compile(
+    r"^\s*[+-]?(?:[\d.]+(?:e[+-]?\d+)?|inf|infinity|s?nan\d*)\s*\Z",
+    flags=re.IGNORECASE | re.UNICODE,
+)
+REGEXP_MAYBE_FLOAT = re.compile(
+    r"^\s*[+-]?(?:[\d_.]+(?:e[+-]?[\d_]+)?|inf|infinity|nan)\s*\Z",
+    flags=re.IGNORECASE | re.UNICODE,
+)
+REGEXP_MAYBE_INTEGER = re.compile(r"^\s*[+-]?\d[\d_]*\s*\Z", flags=re.UNICODE)
+REGEXP_MAYBE_JSON = re.compile(r"^[ \t\n\r]*[\[{\"0-9tfnNI-]")
+
+
+def _maybe_bool(value):
+    value = value.lower()
+    return value in BoolField.TRUE_VALUES or value in BoolField.FALSE_VALUES
+
+
+def _maybe_date(value):
+    return DateField.INPUT_FORMAT != "%Y-%m-%d" or REGEXP_MAYBE_DATE.match(value)
+
+
+def _maybe_datetime(value):
+    return DatetimeField.DATETIME_REGEXP.search(value)
+
+
+def _maybe_decimal(value):
+    # `Decimal` ignores underscores anywhere in the string
+    return not SHOULD_NOT_USE_LOCALE or REGEXP_MAYBE_DECIMAL.match(
+        value.replace("_", "")
+    )
+
+
+def _maybe_float(value):
+    return not SHOULD_NOT_USE_LOCALE or REGEXP_MAYBE_FLOAT.match(value)
+
+
+def _maybe_integer(value):
+    return not SHOULD_NOT_USE_LOCALE or REGEXP_MAYBE_INTEGER.match(value)
+
+
+def _maybe_percent(value):
+    return "%" in value
+
+
+# Cheap checks for non-null text values: if the check fails, the type's
+# `deserialize` would raise `ValueError` for that value. Only the exact
+# built-in classes are listed, so subclasses are always fully tested.
+TYPE_PRESCREENS = {
+    BoolField: _maybe_bool,
+    DateField: _maybe_date,
+    DatetimeField: _maybe_datetime,
+    DecimalField: _maybe_decimal,
+    FloatField: _maybe_float,
+    IntegerField: _maybe_integer,
+    JSONField: REGEXP_MAYBE_JSON.match,
+    PercentField: _maybe_percent,
+}
+
+
 class TypeDetector(object):
-    """Detect data types based on a list of Field classes"""
+    """Detect data types based on a list of Field classes
+
+    Each distinct text value is checked only once per column, types which
+    certainly can't deserialize a value are discarded using `TYPE_PRESCREENS`
+    (without calling `deserialize`) and a column is not checked anymore when
+    only the fallback type is left.
+    """
 
     def __init__(
         self,
@@ -665,15 +760,49 @@ class TypeDetector(object):
         self._is_empty = defaultdict(lambda: True)
         self._samples = []
         self._skip = skip_indexes or tuple()
+        self._seen = defaultdict(set)
+        self._converters = {
+            field_type: make_deserializer(field_type)
+            for field_type in self.field_types
+        }
 
     def check_type(self, index, value):
-        for type_ in self._possible_types[index][:]:
-            if not is_null(value):
-                self._is_empty[index] = False
+        possible_types = self._possible_types[index]
+        if not possible_types or possible_types == [self.fallback_type]:
+            # Nothing left to discard: the result for this column can't change
+            return
+
+        is_text = type(value) is six.text_type
+        if is_text:
+            # Text values are the most common case (CSV etc.) and can't be
+            # equal without behaving the same way on every type
+            seen = self._seen[index]
+            if value in seen:
+                return
+            seen.add(value)
+
+        null = is_null(value)
+        if not null:
+            self._is_empty[index] = False
+        prescreens = TYPE_PRESCREENS if is_text and not null else {}
+        converters, results = self._converters, {}
+        for type_ in possible_types:
+            if type_ in results:
+                continue
+            check = prescreens.get(type_, None)
+            if check is not None and not check(value):
+                results[type_] = False
+                continue
             try:
-                type_.deserialize(value)
+                converters[type_](value)
             except (ValueError, TypeError):
-                self._possible_types[index].remove(type_)
+                results[type_] = False
+            else:
+                results[type_] = True
+        if not all(results.values()):
+            self._possible_types[index] = [
+                type_ for type_ in possible_types if results[type_]
+            ]
 
     def process_row(self, row):
         for index, value in enumerate(row):
@@ -750,6 +879,95 @@ def detect_types(
     return detector.fields
 
 
+def make_deserializer(field_type):
+    """Return a function which deserializes a value to `field_type`
+
+    The returned function has the same result as `field_type.deserialize`, but
+    skips values which already have the correct type and has fast paths for
+    the most common cases (like an integer represented as text). Only the
+    built-in field types are optimized (for other types, including
+    subclasses, `field_type.deserialize` is returned).
+    """
+
+    deserialize = field_type.deserialize
+    if field_type not in NATIVE_TYPE_FIELDS:
+        return deserialize
+
+    if field_type in (IntegerField, FloatField):
+        native_type = field_type.TYPE[0]
+
+        def convert(value):
+            value_type = type(value)
+            if value_type is native_type:
+                return value
+            elif value_type is six.text_type and SHOULD_NOT_USE_LOCALE:
+                try:
+                    return native_type(value)
+                except ValueError:
+                    pass
+            return deserialize(value)
+
+    elif field_type is DecimalField:
+
+        def convert(value):
+            value_type = type(value)
+            if value_type is Decimal:
+                return value
+            elif value_type is six.text_type and SHOULD_NOT_USE_LOCALE:
+                try:
+                    return Decimal(value)
+                except InvalidOperation:
+                    pass
+            return deserialize(value)
+
+    elif field_type is TextField:
+
+        def convert(value):
+            return value if type(value) is six.text_type else deserialize(value)
+
+    elif field_type is BoolField:
+        true_values, false_values = BoolField.TRUE_VALUES, BoolField.FALSE_VALUES
+
+        def convert(value):
+            value_type = type(value)
+            if value_type is bool:
+                return value
+            elif value_type is six.text_type:
+                lowered = value.lower()
+                if lowered in true_values:
+                    return True
+                elif lowered in false_values:
+                    return False
+            return deserialize(value)
+
+    elif field_type is DateField and DateField.INPUT_FORMAT == "%Y-%m-%d":
+        from_iso_format = getattr(datetime.date, "fromisoformat", None)
+
+        def convert(value):
+            value_type = type(value)
+            if value_type is datetime.date:
+                return value
+            elif (
+                value_type is six.text_type
+                and from_iso_format is not None
+                and len(value) == 10
+                and value[4] == value[7] == "-"
+            ):
+                try:
+                    return from_iso_format(value)
+                except ValueError:
+                    pass
+            return deserialize(value)
+
+    else:
+        native_types = field_type.TYPE
+
+        def convert(value):
+            return value if type(value) in native_types else deserialize(value)
+
+    return convert
+
+
 def identify_type(value):
     """Identify the field type for a specific value"""
 
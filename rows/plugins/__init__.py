@@ -19,6 +19,7 @@ from . import dicts as dicts  # NOQA
 from . import plugin_csv as csv  # NOQA
 from . import plugin_html as html  # NOQA
 from . import plugin_json as json  # NOQA
+from . import plugin_jsonl as jsonl  # NOQA
 from . import txt as txt  # NOQA
 
 try:
@@ -36,6 +37,11 @@ try:
 except ImportError:
     sqlite = None
 
+try:
+    from . import sqlite_vtable as sqlite_vtable
+except ImportError:
+    sqlite_vtable = None
+
 try:
     from . import xls as xls
 except ImportError:
@@ -19,26 +19,132 @@ from __future__ import unicode_literals
 
 import zipfile
 from decimal import Decimal
+from itertools import islice
 
-from lxml.etree import fromstring as xml_from_string
-from lxml.etree import tostring as xml_to_string
+from lxml.etree import iterparse
 
 from rows.plugins.utils import create_table
 from rows.utils import Source
 
-
-def xpath(element, xpath, namespaces):
-    return xml_from_string(xml_to_string(element)).xpath(xpath, namespaces=namespaces)
-
-
-def attrib(cell, namespace, name):
-    return cell.attrib["{{{}}}{}".format(namespace, name)]
-
-
-def complete_with_None(lists, size):
-    for element in lists:
-        element.extend([None] * (size - len(element)))
-        yield element
+OFFICE_NAMESPACE = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+TABLE_NAMESPACE = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+
+
+def qualified_name(namespace, name):
+    return "{{{}}}{}".format(namespace, name)
+
+
+TABLE_TAG = qualified_name(TABLE_NAMESPACE, "table")
+ROW_TAG = qualified_name(TABLE_NAMESPACE, "table-row")
+CELL_TAG = qualified_name(TABLE_NAMESPACE, "table-cell")
+TABLE_NAME = qualified_name(TABLE_NAMESPACE, "name")
+COLUMNS_REPEATED = qualified_name(TABLE_NAMESPACE, "number-columns-repeated")
+VALUE_TYPE = qualified_name(OFFICE_NAMESPACE, "value-type")
+VALUE = qualified_name(OFFICE_NAMESPACE, "value")
+DATE_VALUE = qualified_name(OFFICE_NAMESPACE, "date-value")
+STRING_VALUE = qualified_name(OFFICE_NAMESPACE, "string-value")
+
+
+def table_events(fobj):
+    """Parse a `content.xml` file-like object lazily
+
+    Yield `("start", element)`/`("end", element)` for each table and
+    `("row", element)` for each table row. Rows are cleared (and removed from
+    the tree) after being used, so memory usage doesn't grow with the number
+    of rows.
+    """
+    for event, element in iterparse(
+        fobj, events=("start", "end"), tag=(TABLE_TAG, ROW_TAG)
+    ):
+        if element.tag == TABLE_TAG:
+            yield event, element
+        elif event == "end":
+            yield "row", element
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+def cell_value(cell):
+    """Return the value of a `table:table-cell` element"""
+    children = list(cell)
+    if not children:
+        return None
+
+    # TODO: evalute 'boolean' and 'time' types
+    value_type = cell.attrib[VALUE_TYPE]
+    if value_type == "date":
+        return cell.attrib[DATE_VALUE]
+    elif value_type == "float":
+        return cell.attrib[VALUE]
+    elif value_type == "percentage":
+        return "{:%}".format(Decimal(cell.attrib[VALUE]))
+    elif value_type == "string":
+        # get computed string (from formula, for example) or from <p>...</p>
+        return cell.attrib.get(STRING_VALUE, children[0].text)
+    else:  # value_type == some type we don't know
+        return children[0].text
+
+
+def row_values(row_element, end_column=None):
+    """Return the values of a `table:table-row` element
+
+    Repeated cells (`number-columns-repeated`) are expanded only when needed:
+    empty cells repeated at the end of the row are ignored and no cell after
+    `end_column` is read.
+    """
+    row, empty_cells = [], 0
+
+    def extend(value, count):
+        if end_column is not None:
+            count = min(count, end_column - len(row))
+        row.extend([value] * count)
+
+    for cell in row_element.iter(CELL_TAG):
+        if end_column is not None and len(row) >= end_column:
+            break
+        value = cell_value(cell)
+        repeat = cell.get(COLUMNS_REPEATED)
+        if repeat is not None and value is None:
+            empty_cells += int(repeat)
+            continue
+        if empty_cells:
+            extend(None, empty_cells)
+            empty_cells = 0
+        extend(value, int(repeat) if repeat is not None else 1)
+    return row
+
+
+def find_table(events, index=0, sheet_name=None):
+    """Consume `events` until the start of the selected table, return its name"""
+    table_index = -1
+    for event, element in events:
+        if event == "start":
+            table_index += 1
+            name = element.get(TABLE_NAME)
+            if (sheet_name is None and table_index == index) or (
+                sheet_name is not None and name == sheet_name
+            ):
+                return name
+    if sheet_name is not None:
+        raise ValueError("Sheet not found: {}".format(repr(sheet_name)))
+    raise IndexError("list index out of range")
+
+
+def table_rows(events, start_column=0, end_column=None):
+    """Yield the non-empty rows of the current table (consuming `events`)"""
+    depth = 1
+    for event, element in events:
+        if event == "start":
+            depth += 1
+        elif event == "end":
+            depth -= 1
+            if depth == 0:
+                break
+        else:
+            row = row_values(element, end_column)[start_column:end_column]
+            if any(value is not None for value in row):
+                yield row
 
 
 def sheet_names(filename_or_fobj):
@@ -46,19 +152,16 @@ def sheet_names(filename_or_fobj):
     source = Source.from_file(filename_or_fobj, plugin_name="ods")
     ods_file = zipfile.ZipFile(source.fobj)
     content_fobj = ods_file.open("content.xml")
-    xml = content_fobj.read()  # will return bytes
-    # TODO: read XML lazily?
+    # TODO: unescape values
+    result = [
+        element.get(TABLE_NAME)
+        for event, element in table_events(content_fobj)
+        if event == "start"
+    ]
     content_fobj.close()
     ods_file.close()
     source.fobj.close()
-
-    document = xml_from_string(xml)
-    namespaces = document.nsmap
-    spreadsheet = document.xpath("//office:spreadsheet", namespaces=namespaces)[0]
-    tables = xpath(spreadsheet, "//table:table", namespaces)
-    name_attribute = f"{{{namespaces['table']}}}name"
-    # TODO: unescape values
-    return [table.attrib[name_attribute] for table in tables]
+    return result
 
 
 def import_from_ods(
@@ -68,9 +171,16 @@ def import_from_ods(
     start_column=None,
     end_row=None,
     end_column=None,
+    sheet_name=None,
     *args,
     **kwargs,
 ):
+    """Return a rows.Table created from the sheet `index` (or `sheet_name`)
+
+    `content.xml` is parsed lazily (the file is closed after the last row is
+    read), so use `lazy=True` to import big spreadsheets with constant memory
+    usage.
+    """
     # TODO: unescape values
 
     source = Source.from_file(filename_or_fobj, plugin_name="ods")
@@ -82,73 +192,28 @@ def import_from_ods(
 
     ods_file = zipfile.ZipFile(source.fobj)
     content_fobj = ods_file.open("content.xml")
-    xml = content_fobj.read()  # will return bytes
-    # TODO: read XML lazily?
-    content_fobj.close()
-    ods_file.close()
 
-    document = xml_from_string(xml)
-    namespaces = document.nsmap
-    spreadsheet = document.xpath("//office:spreadsheet", namespaces=namespaces)[0]
-    tables = xpath(spreadsheet, "//table:table", namespaces)
-    table = tables[index]  # TODO: import spreadsheet by name
+    def close():
+        content_fobj.close()
+        ods_file.close()
+        if source.should_close:
+            source.fobj.close()
+
+    events = table_events(content_fobj)
     try:
-        table_name = attrib(table, namespaces["table"], "name")
-    except KeyError:
-        table_name = None
-
-    table_rows_obj = xpath(table, "//table:table-row", namespaces)
-    table_rows = []
-    for row_obj in table_rows_obj:
-        cells = list(reversed(xpath(row_obj, "//table:table-cell", namespaces)))
-        if len(cells) == 1 and not cells[0].getchildren():
-            continue  # Empty line(s), ignore
-        row = []
-        row_started = False
-        for cell in cells:
-            children = cell.getchildren()
-            if not children:
-                cell_value = None
-                # TODO: check repeat
-            else:
-                # TODO: evalute 'boolean' and 'time' types
-                value_type = attrib(cell, namespaces["office"], "value-type")
-                if value_type == "date":
-                    cell_value = attrib(cell, namespaces["office"], "date-value")
-                elif value_type == "float":
-                    cell_value = attrib(cell, namespaces["office"], "value")
-                elif value_type == "percentage":
-                    cell_value = attrib(cell, namespaces["office"], "value")
-                    cell_value = Decimal(cell_value)
-                    cell_value = "{:%}".format(cell_value)
-                elif value_type == "string":
-                    try:
-                        # get computed string (from formula, for example)
-                        cell_value = attrib(cell, namespaces["office"], "string-value")
-                    except KeyError:
-                        # computed string not present => get from <p>...</p>
-                        cell_value = children[0].text
-                else:  # value_type == some type we don't know
-                    cell_value = children[0].text
-
-            try:
-                repeat = attrib(cell, namespaces["table"], "number-columns-repeated")
-            except KeyError:
-                row.append(cell_value)
-                row_started = True
-            else:
-                cell_data = [cell_value for _ in range(int(repeat))]
-                if set(cell_data) != set([None]) or row_started:
-                    # This check will remove empty cells from the end
-                    row.extend(cell_data)
-                    row_started = True
-
-        row = list(reversed(row))[start_column:end_column]
-        if row and set(row) != set([None]):
-            table_rows.append(row)
-
-    table_rows = table_rows[start_row:end_row]
-    max_length = max(len(row) for row in table_rows)
-    full_rows = complete_with_None(table_rows, max_length)
+        table_name = find_table(events, index=index, sheet_name=sheet_name)
+    except Exception:
+        close()
+        raise
+
+    def read_rows():
+        try:
+            for row in table_rows(events, start_column, end_column):
+                yield row
+        finally:
+            close()
+
     meta = {"imported_from": "ods", "source": source, "name": table_name}
-    return create_table(full_rows, meta=meta, *args, **kwargs)
+    return create_table(
+        islice(read_rows(), start_row, end_row), meta=meta, *args, **kwargs
+    )
@@ -17,31 +17,62 @@
 
 from __future__ import unicode_literals
 
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from functools import lru_cache
 from io import BytesIO, StringIO
-from itertools import islice
+from itertools import chain, islice
 
 import six
-import unicodecsv
 
 from rows import fields
-from rows.fields import make_header
-from rows.plugins.utils import create_table, ipartition, serialize
+from rows.fields import get_items, make_header
+from rows.plugins.utils import (
+    _define_fields,
+    _fill_table,
+    create_table,
+    ipartition,
+    serialize,
+)
+from rows.table import ColumnarTable, Table
 from rows.utils import Source, detect_local_source, open_compressed
 
-sniffer = unicodecsv.Sniffer()
+if six.PY2:
+    # Python 2's `csv` does not support unicode
+    import unicodecsv as csv
+else:
+    import csv
+
+sniffer = csv.Sniffer()
 # Some CSV files have more than 128kB of data in a cell, so we force this value
 # to be greater (16MB).
 # TODO: check if it impacts in memory usage.
 # TODO: may add option to change it by passing a parameter to import/export.
-unicodecsv.field_size_limit(16777216)
+csv.field_size_limit(16777216)
+# Maximum number of rows serialized at once by `export_to_csv(buffer_bytes=...)`
+MAX_BUFFERED_ROWS = 10000
+# Attributes needed to recreate a dialect in another process (dialects
+# discovered by `csv.Sniffer` can't be pickled)
+DIALECT_ATTRIBUTES = (
+    "delimiter",
+    "doublequote",
+    "escapechar",
+    "lineterminator",
+    "quotechar",
+    "quoting",
+    "skipinitialspace",
+    "strict",
+)
 
 
 def fix_dialect(dialect):
     if not dialect.doublequote and dialect.escapechar is None:
         dialect.doublequote = True
 
-    if dialect.quoting == unicodecsv.QUOTE_MINIMAL and dialect.quotechar == "'":
+    if dialect.quoting == csv.QUOTE_MINIMAL and dialect.quotechar == "'":
         # Python csv's Sniffer seems to detect a wrong quotechar when
         # quoting is minimal
         dialect.quotechar = '"'
@@ -96,11 +127,11 @@ def fix_file(csv_reader, csv_writer, logger=None):
     }
 
 
-class excel_semicolon(unicodecsv.excel):
+class excel_semicolon(csv.excel):
     delimiter = ";"
 
 
-unicodecsv.register_dialect("excel-semicolon", excel_semicolon)
+csv.register_dialect("excel-semicolon", excel_semicolon)
 
 
 if six.PY2:
@@ -113,8 +144,8 @@ if six.PY2:
         try:
             dialect = sniffer.sniff(sample, delimiters=delimiters)
 
-        except unicodecsv.Error:  # Couldn't detect: fall back to 'excel'
-            dialect = unicodecsv.excel
+        except csv.Error:  # Couldn't detect: fall back to 'excel'
+            dialect = csv.excel
 
         fix_dialect(dialect)
         return dialect
@@ -149,13 +180,64 @@ elif six.PY3:
         try:
             dialect = sniffer.sniff(decoded, delimiters=delimiters)
 
-        except unicodecsv.Error:  # Couldn't detect: fall back to 'excel'
-            dialect = unicodecsv.excel
+        except csv.Error:  # Couldn't detect: fall back to 'excel'
+            dialect = csv.excel
 
         fix_dialect(dialect)
         return dialect
 
 
+if six.PY2:
+
+    def csv_reader(fobj, encoding, dialect=csv.excel, **fmtparams):
+        """Return a CSV reader for the binary file-like object `fobj`"""
+        return csv.reader(fobj, encoding=encoding, dialect=dialect, **fmtparams)
+
+    @contextmanager
+    def csv_writer(fobj, encoding, dialect=csv.excel, write_through=False, **fmtparams):
+        """Return a CSV writer for the binary file-like object `fobj`
+
+        Rows are always written directly to `fobj` (`write_through` is only
+        needed on Python 3).
+        """
+        yield csv.writer(fobj, encoding=encoding, dialect=dialect, **fmtparams)
+
+
+elif six.PY3:
+
+    def csv_reader(fobj, encoding, dialect=csv.excel, **fmtparams):
+        """Yield CSV rows from the binary file-like object `fobj`
+
+        Rows are parsed by the C `csv.reader` on top of an `io.TextIOWrapper`,
+        which is detached after reading (so `fobj` is not closed).
+        """
+        text_fobj = io.TextIOWrapper(fobj, encoding=encoding, newline="")
+        try:
+            for row in csv.reader(text_fobj, dialect=dialect, **fmtparams):
+                yield row
+        finally:
+            if not fobj.closed:
+                text_fobj.detach()
+
+    @contextmanager
+    def csv_writer(fobj, encoding, dialect=csv.excel, write_through=False, **fmtparams):
+        """Return a CSV writer for the binary file-like object `fobj`
+
+        Data is encoded by an `io.TextIOWrapper`, which is flushed and
+        detached when the context exits (so `fobj` is not closed). If
+        `write_through=True`, each row is written to `fobj` as soon as it's
+        encoded.
+        """
+        text_fobj = io.TextIOWrapper(
+            fobj, encoding=encoding, newline="", write_through=write_through
+        )
+        try:
+            yield csv.writer(text_fobj, dialect=dialect, **fmtparams)
+        finally:
+            text_fobj.flush()
+            text_fobj.detach()
+
+
 def read_sample(fobj, sample):
     """Read `sample` bytes from `fobj` and return the cursor to where it was."""
     cursor = fobj.tell()
@@ -164,11 +246,109 @@ def read_sample(fobj, sample):
     return data
 
 
+def _local_filename(fobj):
+    """Return the filename if `fobj` is a regular (uncompressed) local file"""
+    filename = getattr(fobj, "name", None)
+    if (
+        isinstance(fobj, (io.BufferedReader, io.FileIO))
+        and isinstance(filename, (six.binary_type, six.text_type))
+        and os.path.isfile(filename)
+    ):
+        return filename
+
+
+def _parallel_map(function, arguments, workers):
+    """Execute `function(*args)` for each args in `arguments` using processes
+
+    Results are yielded in the same order as `arguments`; at most `2 *
+    workers` tasks are submitted before their results are consumed.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for args in arguments:
+            pending.append(executor.submit(function, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _import_csv_range(filename, encoding, dialect, start, end, header, table_fields):
+    """Parse and deserialize the records in a byte range of a CSV file
+
+    Executed by the worker processes of `import_from_csv` - `dialect` is a
+    `dict` with `DIALECT_ATTRIBUTES`.
+    """
+    with open(filename, mode="rb") as fobj:
+        fobj.seek(start)
+        data = fobj.read(end - start)
+    reader = csv_reader(BytesIO(data), encoding=encoding, **dialect)
+    get_row = get_items(*map(header.index, table_fields))
+    deserialize_row = Table(fields=table_fields)._row_deserializer()
+    return [deserialize_row(get_row(row)) for row in reader]
+
+
+def _import_from_csv_parallel(
+    source,
+    filename,
+    inspector,
+    workers,
+    meta,
+    fields=None,
+    skip_header=True,
+    samples=None,
+    lazy=False,
+    columnar=False,
+    *args,
+    **kwargs
+):
+    if lazy and columnar:
+        raise ValueError("`lazy` and `columnar` cannot be used together")
+    encoding, dialect = inspector.encoding, inspector.dialect
+    if fields is None and samples is None:
+        samples = inspector._max_samples
+
+    # The header and the samples are read (in this process) only to define the
+    # fields - all the data rows are parsed again by the workers
+    start = data_start = source.fobj.tell()
+    if fields is None or skip_header:
+        record_ends = inspector._record_ends(start, chunk_size=0)
+        data_start = next(record_ends, os.path.getsize(filename))
+        record_ends.close()
+    reader = csv_reader(source.fobj, encoding=encoding, dialect=dialect)
+    _, header, table_fields = _define_fields(
+        reader,
+        fields=fields,
+        skip_header=skip_header,
+        samples=samples,
+        *args,
+        **kwargs
+    )
+
+    file_size = os.path.getsize(filename) - data_start
+    chunk_size = min(max(file_size // (workers * 4), 2 ** 20), 2 ** 26)
+    dialect_attributes = {
+        name: getattr(dialect, name)
+        for name in DIALECT_ATTRIBUTES
+        if hasattr(dialect, name)
+    }
+    arguments = (
+        (filename, encoding, dialect_attributes, start, end, header, table_fields)
+        for start, end in inspector.record_ranges(data_start, chunk_size)
+    )
+    table = (ColumnarTable if columnar else Table)(fields=table_fields, meta=meta)
+    table_rows = chain.from_iterable(
+        _parallel_map(_import_csv_range, arguments, workers)
+    )
+    return _fill_table(table, table_rows, lazy=lazy)
+
+
 def import_from_csv(
     filename_or_fobj,
     encoding="utf-8",
     dialect=None,
     sample_size=262144,
+    workers=None,
     *args,
     **kwargs
 ):
@@ -176,29 +356,91 @@ def import_from_csv(
 
     If a file-like object is provided it MUST be in binary mode, like in
     `open(filename, mode='rb')`.
+
+    If `workers` is greater than 1 and the file is a regular (uncompressed)
+    local file, it's split into byte ranges aligned to the records and each
+    range is parsed and deserialized in a separate process (the resulting rows
+    keep the original order). In this mode the types are detected using the
+    first `samples` rows (5000 if `samples` is not provided); compressed
+    files, file-like objects, `max_rows` and dialects with an `escapechar`
+    are not supported (the file is imported in the current process).
     """
     source = Source.from_file(
         filename_or_fobj, plugin_name="csv", mode="rb", encoding=encoding
     )
+    meta = {"imported_from": "csv", "source": source}
+
+    filename = _local_filename(source.fobj)
+    if (
+        workers is not None
+        and workers > 1
+        and filename is not None
+        and kwargs.get("max_rows") is None
+    ):
+        inspector = CsvInspector(
+            filename, encoding=encoding, dialect=dialect, chunk_size=sample_size
+        )
+        dialect = inspector.dialect
+        if inspector.can_split:
+            return _import_from_csv_parallel(
+                source, filename, inspector, workers, meta, *args, **kwargs
+            )
 
     if dialect is None:
         dialect = discover_dialect(
             sample=read_sample(source.fobj, sample_size), encoding=source.encoding
         )
 
-    reader = unicodecsv.reader(source.fobj, encoding=encoding, dialect=dialect)
+    reader = csv_reader(source.fobj, encoding=encoding, dialect=dialect)
 
-    meta = {"imported_from": "csv", "source": source}
     return create_table(reader, meta=meta, *args, **kwargs)
 
 
+def _write_buffered(
+    fobj, serialized, encoding, dialect, buffer_bytes, batch_size=100, callback=None
+):
+    """Write the `serialized` rows as CSV to `fobj` in chunks of `buffer_bytes`
+
+    Rows are encoded to an in-memory buffer (using `csv_writer`), which is
+    written to `fobj` when it reaches `buffer_bytes`. The number of rows
+    written to the buffer at once is adjusted based on the average row size.
+    `callback` is called with the total number of rows (excluding the header)
+    after each chunk is written.
+    """
+    buffer = BytesIO()
+    with csv_writer(buffer, encoding, dialect, write_through=True) as writer:
+        writer.writerow(next(serialized))  # First, write the header
+        total, flushed_size, finished = 0, 0, False
+        while not finished:
+            batch = list(islice(serialized, batch_size))
+            writer.writerows(batch)
+            total += len(batch)
+            finished = len(batch) < batch_size
+            size = buffer.tell()
+            if size >= buffer_bytes or (finished and size > 0):
+                fobj.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+                flushed_size += size
+                if callback is not None and total > 0:
+                    callback(total)
+            # Rows needed to fill the buffer, based on the average row size
+            # (the batch is limited to keep the memory usage low)
+            row_size = (flushed_size + buffer.tell()) / (total + 1.0)
+            batch_size = min(
+                max(int((buffer_bytes - buffer.tell()) / row_size) + 1, 1),
+                MAX_BUFFERED_ROWS,
+            )
+
+
 def export_to_csv(
     table,
     filename_or_fobj=None,
     encoding="utf-8",
-    dialect=unicodecsv.excel,
+    dialect=csv.excel,
     batch_size=100,
     callback=None,
+    buffer_bytes=None,
     *args,
     **kwargs
 ):
@@ -209,6 +451,10 @@ def export_to_csv(
     `open(filename, mode='wb')`.
     If not filename/fobj is provided, the function returns a string with CSV
     contents.
+    If `buffer_bytes` is provided, the CSV is built in an in-memory buffer and
+    written to the file in chunks of (approximately) this size - in this case
+    `callback` is called after each chunk is written (instead of after each
+    `batch_size` rows).
     """
     # TODO: will work only if table.fields is OrderedDict
     # TODO: should use fobj? What about creating a method like json.dumps?
@@ -226,23 +472,31 @@ def export_to_csv(
         should_close=should_close,
     )
 
-    # TODO: may use `io.BufferedWriter` instead of `ipartition` so user can
-    # choose the real size (in Bytes) when to flush to the file system, instead
-    # number of rows
-    writer = unicodecsv.writer(source.fobj, encoding=encoding, dialect=dialect)
-
-    if callback is None:
-        for batch in ipartition(serialize(table, *args, **kwargs), batch_size):
-            writer.writerows(batch)
+    serialized = serialize(table, *args, **kwargs)
+    if buffer_bytes is not None:
+        _write_buffered(
+            source.fobj,
+            serialized,
+            encoding=encoding,
+            dialect=dialect,
+            buffer_bytes=buffer_bytes,
+            batch_size=batch_size,
+            callback=callback,
+        )
 
     else:
-        serialized = serialize(table, *args, **kwargs)
-        writer.writerow(next(serialized))  # First, write the header
-        total = 0
-        for batch in ipartition(serialized, batch_size):
-            writer.writerows(batch)
-            total += len(batch)
-            callback(total)
+        with csv_writer(source.fobj, encoding=encoding, dialect=dialect) as writer:
+            if callback is None:
+                for batch in ipartition(serialized, batch_size):
+                    writer.writerows(batch)
+
+            else:
+                writer.writerow(next(serialized))  # First, write the header
+                total = 0
+                for batch in ipartition(serialized, batch_size):
+                    writer.writerows(batch)
+                    total += len(batch)
+                    callback(total)
 
     if return_data:
         source.fobj.seek(0)
@@ -265,7 +519,7 @@ class CsvInspector:
         self._field_names = None
         self._dialect = dialect
         if isinstance(dialect, six.text_type):
-            self._dialect = unicodecsv.get_dialect(dialect)
+            self._dialect = csv.get_dialect(dialect)
         self._schema = schema
         self._chunk_size = chunk_size
         self._sample_binary = self._sample_unicode = None
@@ -300,6 +554,72 @@ class CsvInspector:
             self._dialect = discover_dialect(sample.encode(self.encoding), encoding=self.encoding)
         return self._dialect
 
+    @property
+    def can_split(self):
+        """Return `True` if the file can be split by `record_ranges`
+
+        The quote character and line breaks must be single bytes (in the
+        file's encoding) and the dialect must not use an escape character
+        (escaped quotes can't be told apart by counting).
+        """
+        dialect = self.dialect
+        if dialect.escapechar is not None:
+            return False
+        chars = "\n" + (dialect.quotechar or "")
+        try:
+            return chars.encode(self.encoding) == chars.encode("ascii")
+        except (LookupError, UnicodeError):
+            return False
+
+    def _record_ends(self, start, chunk_size, block_size=1024 * 1024):
+        """Yield the positions where records end, at least `chunk_size` apart
+
+        Each position is just after a line break which is not inside a quoted
+        value (quotes are counted from `start`, which must be the beginning
+        of a record).
+        """
+        dialect = self.dialect
+        quote = None
+        if dialect.quoting != csv.QUOTE_NONE and dialect.quotechar:
+            quote = dialect.quotechar.encode(self.encoding)
+
+        in_quotes, target = False, start + chunk_size
+        with open(self.filename, mode="rb") as fobj:
+            fobj.seek(start)
+            position = start  # Position of `block[0]` in the file
+            for block in iter(lambda: fobj.read(block_size), b""):
+                counted = 0  # Quotes in `block[:counted]` were counted
+                while True:
+                    index = block.find(b"\n", max(target - position, counted))
+                    if index == -1:
+                        break
+                    if quote is not None:
+                        in_quotes ^= block.count(quote, counted, index) % 2 == 1
+                    counted = index + 1
+                    if not in_quotes:
+                        end = position + counted
+                        yield end
+                        target = end + chunk_size
+                if quote is not None:
+                    in_quotes ^= block.count(quote, counted) % 2 == 1
+                position += len(block)
+
+    def record_ranges(self, start=0, chunk_size=32 * 1024 * 1024):
+        """Split the file in `(start, end)` byte ranges aligned to records
+
+        Each range has at least `chunk_size` bytes (except for the last one)
+        and can be parsed independently, since it ends just after a line break
+        which is outside quotes. Only regular (uncompressed) files are
+        supported.
+        """
+        ranges, range_start = [], start
+        for end in self._record_ends(start, chunk_size):
+            ranges.append((range_start, end))
+            range_start = end
+        if range_start < os.path.getsize(self.filename):
+            ranges.append((range_start, os.path.getsize(self.filename)))
+        return ranges
+
     @property
     def field_names(self):
         if self._field_names is None:
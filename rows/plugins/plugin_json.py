@@ -17,65 +17,219 @@
 
 from __future__ import unicode_literals
 
+import codecs
 import json
+import re
 from io import BytesIO
+from itertools import chain, islice
 
 import six
 
 from rows import fields
-from rows.plugins.utils import create_table, prepare_to_export
+from rows.plugins.utils import create_table, ipartition, prepare_to_export
 from rows.utils import Source
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-def import_from_json(filename_or_fobj, encoding="utf-8", *args, **kwargs):
+JSON_BACKENDS = ("json", "ijson")
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+
+def _detect_encoding(data):
+    """Return the encoding of JSON `data` (UTF-8, UTF-16 or UTF-32)"""
+    if six.PY3:
+        return json.detect_encoding(data)
+    return "utf-8-sig"
+
+
+def _iterate_array(fobj, chunk_size=1024 * 1024):
+    """Yield the items of the JSON array in the file-like object `fobj`
+
+    The file is read (and decoded, if binary) in chunks of `chunk_size` and
+    each item is parsed by `json.JSONDecoder.raw_decode` as soon as it's
+    complete, so only one item (plus one chunk) is kept in memory.
+    """
+    raw_decode = json.JSONDecoder().raw_decode
+    data = fobj.read(max(chunk_size, 4))  # Enough to detect the encoding
+    if isinstance(data, six.binary_type):
+        decode = codecs.getincrementaldecoder(_detect_encoding(data))().decode
+    else:  # Text file-like object
+        decode = lambda data, final=False: data
+    buffer, finished = decode(data), not data
+
+    def read_more(buffer, position):
+        """Discard `buffer[:position]`, add a chunk and skip whitespace"""
+        data = fobj.read(chunk_size)
+        buffer = buffer[position:] + decode(data, final=not data)
+        return buffer, WHITESPACE.match(buffer).end(), not data
+
+    position = WHITESPACE.match(buffer).end()
+    while position == len(buffer) and not finished:
+        buffer, position, finished = read_more(buffer, position)
+    if buffer[position : position + 1] != "[":
+        raise ValueError("JSON data must be an array")
+    buffer, position, finished = read_more(buffer, position + 1)
+    while position == len(buffer) and not finished:
+        buffer, position, finished = read_more(buffer, position)
+    if buffer[position : position + 1] == "]":
+        return
+
+    while True:
+        try:
+            item, end = raw_decode(buffer, position)
+        except ValueError:
+            if finished:
+                raise
+            buffer, position, finished = read_more(buffer, position)
+            continue
+        # An item ending with the buffer could be incomplete (like a number)
+        # and its separator must be read before yielding it
+        match = SEPARATOR.match(buffer, end)
+        if match is None:
+            if WHITESPACE.match(buffer, end).end() < len(buffer) or finished:
+                raise ValueError("Expecting ',' delimiter at char {}".format(end))
+            buffer, position, finished = read_more(buffer, position)
+            continue
+
+        yield item
+        if match.group(1) == "]":
+            return
+        position = match.end()
+        if position > chunk_size:  # Discard parsed data from the buffer
+            buffer, position, finished = read_more(buffer, position)
+
+
+def _iterate_array_ijson(fobj):
+    if ijson is None:
+        raise ValueError("`ijson` must be installed to use `backend=\"ijson\"`")
+    return ijson.items(fobj, "item", use_float=True)
+
+
+def _check_record(record):
+    if not isinstance(record, dict):
+        raise ValueError("Invalid record (expected object): {}".format(repr(record)))
+    return record
+
+
+def _records_to_rows(records, kwargs):
+    """Return the field names and an iterator of rows from `records` (dicts)
+
+    The field names are taken from `fields` (if in `kwargs`) or are the keys
+    found in the first `samples` records (all records, if `samples` is
+    `None`) - in this case only these records are kept in memory.
+    """
+    records = (_check_record(record) for record in records)
+    if kwargs.get("fields") is not None:
+        field_names = list(kwargs["fields"].keys())
+    else:
+        sample_records = list(islice(records, kwargs.get("samples")))
+        field_names = []
+        for record in sample_records:
+            for key in record.keys():
+                if key not in field_names:
+                    field_names.append(key)
+        records = chain(sample_records, records)
+    return field_names, ([record.get(key) for key in field_names] for record in records)
+
+
+def import_from_json(
+    filename_or_fobj, encoding="utf-8", backend="json", *args, **kwargs
+):
     """Import a JSON file or file-like object into a `rows.Table`.
 
-    If a file-like object is provided it MUST be open in text (non-binary) mode
-    on Python 3 and could be open in both binary or text mode on Python 2.
+    If a file-like object is provided it should be open in binary mode (the
+    encoding is detected), but text mode is also supported. The data must be
+    an array of objects, which is parsed incrementally (one object at a
+    time) using `backend` (`"json"`, based on the standard library, or
+    `"ijson"`, which needs `ijson` installed). The field names are the keys
+    found in the first `samples` objects (or in all objects, if `samples` is
+    `None`), unless `fields` is provided - use with `lazy=True` to import big
+    files with constant memory usage.
     """
+    if backend not in JSON_BACKENDS:
+        raise ValueError("Unknown JSON backend: {}".format(repr(backend)))
 
     source = Source.from_file(
         filename_or_fobj, mode="rb", plugin_name="json", encoding=encoding
     )
 
-    # JSON should always use UTF-8, UTF-16 or UTF-32 encodings.
-    json_obj = json.load(source.fobj)
-    field_names = []
-    for row in json_obj:
-        for key in row.keys():
-            if key not in field_names:
-                field_names.append(key)
-    table_rows = [[item.get(key) for key in field_names] for item in json_obj]
+    # JSON should always use UTF-8, UTF-16 or UTF-32 encodings (detected).
+    if backend == "ijson":
+        records = _iterate_array_ijson(source.fobj)
+    else:
+        records = _iterate_array(source.fobj)
+    field_names, table_rows = _records_to_rows(records, kwargs)
 
     meta = {"imported_from": "json", "source": source}
-    return create_table([field_names] + table_rows, meta=meta, *args, **kwargs)
+    return create_table(
+        chain([field_names], table_rows), meta=meta, *args, **kwargs
+    )
+
 
+def _row_converter(field_types, *args, **kwargs):
+    """Return a function which converts a row's values to JSON values
 
-def _convert(value, field_type, *args, **kwargs):
-    if value is None or field_type in (
+    Values of the field types represented natively in JSON are passed directly
+    to the encoder; other values are serialized (converted to strings).
+    """
+    native_types = (
         fields.BinaryField,
         fields.BoolField,
         fields.FloatField,
         fields.IntegerField,
         fields.JSONField,
         fields.TextField,
-    ):
-        # If the field_type is one of those, the value can be passed directly
-        # to the JSON encoder
-        return value
-    else:
-        # The field type is not represented natively in JSON, then it needs to
-        # be serialized (converted to a string)
-        return field_type.serialize(value, *args, **kwargs)
+    )
+    converters = [
+        (index, field_type)
+        for index, field_type in enumerate(field_types)
+        if field_type not in native_types
+    ]
+    if not converters:
+        return lambda row: row
+
+    def convert_row(row):
+        row = list(row)
+        for index, field_type in converters:
+            if row[index] is not None:
+                row[index] = field_type.serialize(row[index], *args, **kwargs)
+        return row
+
+    return convert_row
+
+
+def _encode_batch(rows, indent):
+    """Encode `rows` (dicts) as the items of a JSON array, without brackets
+
+    The whole batch is encoded at once (by the C encoder, if there's no
+    `indent`) and batches joined by the array's item separator result in the
+    same data `json.dumps` would return for the whole array.
+    """
+    if indent is None:
+        return json.dumps(rows)[1:-1]
+    # The separators are the default ones on Python 3 (no trailing spaces)
+    return json.dumps(rows, indent=indent, separators=(",", ": "))[2:-2]
 
 
 def export_to_json(
-    table, filename_or_fobj=None, encoding="utf-8", indent=None, *args, **kwargs
+    table,
+    filename_or_fobj=None,
+    encoding="utf-8",
+    indent=None,
+    batch_size=1000,
+    *args,
+    **kwargs
 ):
     """Export a `rows.Table` to a JSON file or file-like object.
 
     If a file-like object is provided it MUST be open in binary mode (like in
-    `open('myfile.json', mode='wb')`).
+    `open('myfile.json', mode='wb')`). The array is encoded and written
+    `batch_size` rows at a time, so only one batch is kept in memory (the
+    output is the same as encoding the whole array at once).
     """
 
     return_data, should_close = False, None
@@ -95,30 +249,32 @@ def export_to_json(
     fields = table.fields
     prepared_table = prepare_to_export(table, *args, **kwargs)
     field_names = next(prepared_table)
-    data = [
-        {
-            field_name: _convert(value, fields[field_name], *args, **kwargs)
-            for field_name, value in zip(field_names, row)
-        }
-        for row in prepared_table
-    ]
-
-    json_data = json.dumps(data, indent=indent)
-    if type(json_data) is six.text_type:  # Python 3
-        json_data = json_data.encode(encoding)
-
-    if indent is not None:
-        # clean up empty spaces at the end of lines
-        json_data = b"\n".join(line.rstrip() for line in json_data.splitlines())
+    convert_row = _row_converter(
+        [fields[field_name] for field_name in field_names], *args, **kwargs
+    )
+    fobj = source.fobj
+    encode = codecs.getincrementalencoder(encoding)().encode
+    if indent is None:
+        start, separator, end = "[", ", ", "]"
+    else:
+        start, separator, end = "[\n", ",\n", "\n]"
+    empty = True
+    for batch in ipartition(prepared_table, batch_size):
+        data = _encode_batch(
+            [dict(zip(field_names, convert_row(row))) for row in batch], indent
+        )
+        fobj.write(encode(start if empty else separator) + encode(data))
+        empty = False
+    fobj.write(encode("[]" if empty else end))
 
     if return_data:
-        result = json_data
+        fobj.seek(0)
+        result = fobj.read()
     else:
-        result = source.fobj
-        source.fobj.write(json_data)
-        source.fobj.flush()
+        result = fobj
+        fobj.flush()
 
     if source.should_close:
-        source.fobj.close()
+        fobj.close()
 
     return result
@@ -0,0 +1,131 @@
+# coding: utf-8
+
+# Copyright 2014-2022 Álvaro Justen <https://github.com/turicas/rows/>
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+
+import json
+from io import BytesIO
+from itertools import chain
+
+import six
+
+from rows.plugins.plugin_json import _records_to_rows, _row_converter
+from rows.plugins.utils import create_table, ipartition, prepare_to_export
+from rows.utils import Source
+
+
+def _read_records(fobj, encoding):
+    """Yield the objects from a JSON Lines binary file-like object"""
+    for line_number, line in enumerate(fobj, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line.decode(encoding))
+        if not isinstance(record, dict):
+            raise ValueError(
+                "Line {} is not a JSON object: {}".format(line_number, repr(record))
+            )
+        yield record
+
+
+def import_from_jsonl(filename_or_fobj, encoding="utf-8", *args, **kwargs):
+    """Import a JSON Lines file (one object per line) into a `rows.Table`.
+
+    If a file-like object is provided it MUST be open in binary mode. The file
+    is read line by line (compressed files are supported): the field names are
+    the keys found in the first `samples` objects (or in all objects if
+    `samples` is `None`), unless `fields` is provided - keys which appear only
+    after the samples are ignored. Use `lazy=True` to import big files with
+    constant memory usage.
+    """
+
+    source = Source.from_file(
+        filename_or_fobj, mode="rb", plugin_name="jsonl", encoding=encoding
+    )
+    field_names, table_rows = _records_to_rows(
+        _read_records(source.fobj, encoding), kwargs
+    )
+
+    meta = {"imported_from": "jsonl", "source": source}
+    return create_table(
+        chain([field_names], table_rows), meta=meta, *args, **kwargs
+    )
+
+
+def export_to_jsonl(
+    table,
+    filename_or_fobj=None,
+    encoding="utf-8",
+    batch_size=100,
+    callback=None,
+    *args,
+    **kwargs
+):
+    """Export a `rows.Table` to a JSON Lines file (one object per line).
+
+    If a file-like object is provided it MUST be open in binary mode (like in
+    `open('myfile.jsonl', mode='wb')`). Rows are encoded and written
+    `batch_size` at a time (`callback` is called with the number of rows
+    written after each batch), so lazy tables are exported with constant
+    memory usage. If no filename/fobj is provided, the function returns the
+    JSON Lines contents (bytes).
+    """
+
+    return_data, should_close = False, None
+    if filename_or_fobj is None:
+        filename_or_fobj = BytesIO()
+        return_data = should_close = True
+
+    source = Source.from_file(
+        filename_or_fobj,
+        plugin_name="jsonl",
+        mode="wb",
+        encoding=encoding,
+        should_close=should_close,
+    )
+
+    # TODO: will work only if table.fields is OrderedDict
+    fields = table.fields
+    prepared_table = prepare_to_export(table, *args, **kwargs)
+    field_names = next(prepared_table)
+    convert_row = _row_converter(
+        [fields[field_name] for field_name in field_names], *args, **kwargs
+    )
+    total = 0
+    for batch in ipartition(prepared_table, batch_size):
+        lines = [
+            json.dumps(dict(zip(field_names, convert_row(row)))) for row in batch
+        ]
+        data = "\n".join(lines) + "\n"
+        if type(data) is six.text_type:  # Python 3
+            data = data.encode(encoding)
+        source.fobj.write(data)
+        total += len(batch)
+        if callback is not None:
+            callback(total)
+
+    if return_data:
+        source.fobj.seek(0)
+        result = source.fobj.read()
+    else:
+        result = source.fobj
+        source.fobj.flush()
+
+    if source.should_close:
+        source.fobj.close()
+
+    return result
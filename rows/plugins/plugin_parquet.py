@@ -19,9 +19,12 @@ from __future__ import unicode_literals
 
 import logging
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 from rows import fields
-from rows.plugins.utils import create_table
+from rows.fields import make_header
+from rows.plugins.utils import create_table, ipartition, prepare_to_export
 from rows.utils import Source
 
 
@@ -30,25 +33,108 @@ class NullHandler(logging.Handler):
         pass
 
 
-logging.getLogger("parquet").addHandler(NullHandler())
-import parquet  # NOQA
+try:
+    import pyarrow
+    import pyarrow.parquet as pyarrow_parquet
+except ImportError:
+    pyarrow = pyarrow_parquet = None
+    has_pyarrow = False
+else:
+    from rows.utils.arrow import arrow_converter, arrow_to_field_type, field_to_arrow
 
-PARQUET_TO_ROWS = {
-    parquet.parquet_thrift.Type.BOOLEAN: fields.BoolField,
-    parquet.parquet_thrift.Type.BYTE_ARRAY: fields.BinaryField,
-    parquet.parquet_thrift.Type.DOUBLE: fields.FloatField,
-    parquet.parquet_thrift.Type.FIXED_LEN_BYTE_ARRAY: fields.BinaryField,
-    parquet.parquet_thrift.Type.FLOAT: fields.FloatField,
-    parquet.parquet_thrift.Type.INT32: fields.IntegerField,
-    parquet.parquet_thrift.Type.INT64: fields.IntegerField,
-    parquet.parquet_thrift.Type.INT96: fields.IntegerField,
-}
+    has_pyarrow = True
 
+try:
+    logging.getLogger("parquet").addHandler(NullHandler())
+    import parquet
+except ImportError:
+    if not has_pyarrow:
+        raise
+    parquet = None
 
-def import_from_parquet(filename_or_fobj, *args, **kwargs):
-    """Import data from a Parquet file and return with rows.Table."""
-    source = Source.from_file(filename_or_fobj, plugin_name="parquet", mode="rb")
+PARQUET_BACKENDS = ("pyarrow", "parquet")
+DEFAULT_BACKEND = "pyarrow" if has_pyarrow else "parquet"
+DEFAULT_ROW_GROUP_SIZE = 100000
+
+if parquet is not None:
+    PARQUET_TO_ROWS = {
+        parquet.parquet_thrift.Type.BOOLEAN: fields.BoolField,
+        parquet.parquet_thrift.Type.BYTE_ARRAY: fields.BinaryField,
+        parquet.parquet_thrift.Type.DOUBLE: fields.FloatField,
+        parquet.parquet_thrift.Type.FIXED_LEN_BYTE_ARRAY: fields.BinaryField,
+        parquet.parquet_thrift.Type.FLOAT: fields.FloatField,
+        parquet.parquet_thrift.Type.INT32: fields.IntegerField,
+        parquet.parquet_thrift.Type.INT64: fields.IntegerField,
+        parquet.parquet_thrift.Type.INT96: fields.IntegerField,
+    }
+
+
+def _record_batch_rows(batch):
+    """Yield the rows (lists) of an Arrow `RecordBatch` or `Table`"""
+    for row in zip(*[column.to_pylist() for column in batch.columns]):
+        yield list(row)
+
+
+def _iterate_parquet_rows(parquet_file, columns, batch_size, workers):
+    """Yield the rows of `parquet_file` (only `columns`), row group by row group
+
+    If `workers` is greater than 1, up to `workers` row groups are decoded at
+    the same time in threads (Arrow releases the GIL while decoding) and
+    their rows are yielded in the file order.
+    """
+    if workers is None or workers <= 1:
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield from _record_batch_rows(batch)
+        return
+
+    def read_row_group(index):
+        return parquet_file.read_row_group(index, columns=columns, use_threads=False)
+
+    row_groups = range(parquet_file.metadata.num_row_groups)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for indexes in ipartition(row_groups, workers):
+            for table in list(executor.map(read_row_group, indexes)):
+                for batch in table.to_batches(max_chunksize=batch_size):
+                    yield from _record_batch_rows(batch)
 
+
+def _import_pyarrow(source, batch_size, workers, kwargs):
+    parquet_file = pyarrow_parquet.ParquetFile(source.fobj)
+    schema = parquet_file.schema_arrow
+    names = list(schema.names)
+    header = make_header(names)
+    types = OrderedDict(
+        (field_name, arrow_to_field_type(schema.field(name).type))
+        for field_name, name in zip(header, names)
+    )
+
+    # Read only the needed columns (the data is not changed if `fields` is set)
+    columns = None
+    import_fields = kwargs.get("import_fields")
+    if import_fields is not None and kwargs.get("fields") is None:
+        import_fields = set(make_header(import_fields))
+        invalid = import_fields - set(header)
+        if invalid:
+            field_names = ", ".join('"{}"'.format(field) for field in invalid)
+            raise ValueError("Invalid field names: {}".format(field_names))
+        columns = [
+            name for field_name, name in zip(header, names) if field_name in import_fields
+        ]
+        types = OrderedDict(
+            (field_name, types[field_name])
+            for field_name in header
+            if field_name in import_fields
+        )
+
+    # The types are already known, so they're not detected
+    if kwargs.get("fields") is None:
+        types.update(kwargs.pop("force_types", None) or {})
+        kwargs["fields"] = types
+    table_rows = _iterate_parquet_rows(parquet_file, columns, batch_size, workers)
+    return chain([list(types.keys())], table_rows)
+
+
+def _import_parquet(source, kwargs):
     # TODO: should look into `schema.converted_type` also
     types = OrderedDict(
         [
@@ -58,9 +144,148 @@ def import_from_parquet(filename_or_fobj, *args, **kwargs):
         ]
     )
     header = list(types.keys())
-    table_rows = list(parquet.reader(source.fobj))  # TODO: be lazy
+    table_rows = list(parquet.reader(source.fobj))
+    kwargs["force_types"] = types
+    return [header] + table_rows
+
+
+def import_from_parquet(
+    filename_or_fobj,
+    backend=DEFAULT_BACKEND,
+    batch_size=10000,
+    workers=None,
+    *args,
+    **kwargs
+):
+    """Import data from a Parquet file and return with rows.Table.
+
+    `backend` can be `"pyarrow"` (default, if installed) or `"parquet"` (the
+    pure-Python `parquet` library, which reads all the data at once). Using
+    `pyarrow`:
+    - the field types come from the file's schema (they are not detected);
+    - only the columns in `import_fields` are read;
+    - the row groups are read lazily (`batch_size` rows at a time), or up to
+      `workers` row groups are decoded in parallel threads.
+    """
+    if backend not in PARQUET_BACKENDS:
+        raise ValueError("Unknown Parquet backend: {}".format(repr(backend)))
+    elif backend == "pyarrow" and not has_pyarrow:
+        raise ValueError("`pyarrow` must be installed to use `backend=\"pyarrow\"`")
+    elif backend == "parquet" and parquet is None:
+        raise ValueError("`parquet` must be installed to use `backend=\"parquet\"`")
+
+    source = Source.from_file(filename_or_fobj, plugin_name="parquet", mode="rb")
+    if backend == "pyarrow":
+        data = _import_pyarrow(source, batch_size, workers, kwargs)
+    else:
+        data = _import_parquet(source, kwargs)
 
     meta = {"imported_from": "parquet", "source": source}
-    return create_table(
-        [header] + table_rows, meta=meta, force_types=types, *args, **kwargs
+    return create_table(data, meta=meta, *args, **kwargs)
+
+
+def _arrow_types(table, field_names, *args, **kwargs):
+    """Return the Arrow types used to export the `field_names` of `table`
+
+    The scale of decimal columns is defined by all their values, so the table
+    is read once before exporting - except for lazy tables (which can be read
+    only once), where decimals are stored as strings.
+    """
+    field_types = [table.fields[field_name] for field_name in field_names]
+    decimal_indexes = [
+        index
+        for index, field_type in enumerate(field_types)
+        if field_type in (fields.DecimalField, fields.PercentField)
+    ]
+    values = {}
+    if decimal_indexes and not table._is_lazy():
+        values = {index: [] for index in decimal_indexes}
+        rows = prepare_to_export(table, *args, **kwargs)
+        next(rows)  # Skip header
+        for row in rows:
+            for index in decimal_indexes:
+                values[index].append(row[index])
+    return [
+        field_to_arrow(field_type, values.get(index))[0]
+        for index, field_type in enumerate(field_types)
+    ]
+
+
+def export_to_parquet(
+    table,
+    filename_or_fobj=None,
+    row_group_size=DEFAULT_ROW_GROUP_SIZE,
+    compression="snappy",
+    schema=None,
+    *args,
+    **kwargs
+):
+    """Export a `rows.Table` to a Parquet file (requires `pyarrow`).
+
+    The rows are written `row_group_size` at a time (each batch is a row
+    group), compressed using `compression` (like `"snappy"`, `"gzip"`,
+    `"zstd"` or `None`). Decimal columns use the scale of all their values
+    (non-finite values are stored as nulls); lazy tables can't be read twice,
+    so their decimals are stored as strings, unless `schema` (a
+    `pyarrow.Schema` with the types to use for each exported field) is
+    provided. If no filename/fobj is provided, the function returns the file
+    contents (bytes).
+    """
+    if not has_pyarrow:
+        raise ValueError("`pyarrow` must be installed to export to Parquet")
+
+    return_data, should_close = False, None
+    if filename_or_fobj is None:
+        filename_or_fobj = pyarrow.BufferOutputStream()
+        return_data, should_close = True, False
+
+    source = Source.from_file(
+        filename_or_fobj,
+        plugin_name="parquet",
+        mode="wb",
+        should_close=should_close,
+    )
+
+    prepared_table = prepare_to_export(table, *args, **kwargs)
+    field_names = next(prepared_table)
+    if schema is not None:
+        schema = pyarrow.schema(
+            [schema.field(field_name) for field_name in field_names],
+            metadata=schema.metadata,
+        )
+    else:
+        arrow_types = _arrow_types(table, field_names, *args, **kwargs)
+        schema = pyarrow.schema(list(zip(field_names, arrow_types)))
+    converters = [
+        arrow_converter(table.fields[field_name], arrow_type)
+        for field_name, arrow_type in zip(field_names, schema.types)
+    ]
+    writer = pyarrow_parquet.ParquetWriter(
+        source.fobj, schema, compression=compression
     )
+    for batch in ipartition(prepared_table, row_group_size):
+        arrays = [
+            pyarrow.array(
+                column
+                if convert is None
+                else [convert(value) if value is not None else None for value in column],
+                type=arrow_type,
+            )
+            for column, convert, arrow_type in zip(zip(*batch), converters, schema.types)
+        ]
+        writer.write_table(
+            pyarrow.Table.from_arrays(arrays, schema=schema),
+            row_group_size=row_group_size,
+        )
+    writer.close()
+
+    if return_data:
+        result = source.fobj.getvalue().to_pybytes()
+    else:
+        result = source.fobj
+        source.fobj.flush()
+
+    if source.should_close:
+        source.fobj.close()
+
+    return result
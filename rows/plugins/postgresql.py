@@ -17,19 +17,37 @@
 
 from __future__ import unicode_literals
 
+import binascii
 import csv
+import datetime
+import hashlib
 import io
 import itertools
+import json
+import os
+import queue
 import string
+import struct
 import subprocess
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 import six
+from psycopg2 import BINARY, DatabaseError
 from psycopg2 import connect as pgconnect
+from psycopg2.extensions import encodings, new_type, register_type
 
 import rows.fields as fields
-from rows.plugins.plugin_csv import CsvInspector
-from rows.plugins.utils import create_table, ipartition, prepare_to_export
+from rows.plugins.plugin_csv import CsvInspector, _local_filename
+from rows.plugins.utils import (
+    create_table,
+    ipartition,
+    prepare_indexes,
+    prepare_to_export,
+)
 from rows.utils import Source, detect_local_source, execute_command, open_compressed
 
 POSTGRESQL_TYPES = {
@@ -57,6 +75,9 @@ SQL_CREATE_TABLE = (
 )
 SQL_SELECT_ALL = 'SELECT * FROM "{table_name}"'
 SQL_INSERT = 'INSERT INTO "{table_name}" ({field_names}) ' "VALUES ({placeholders})"
+SQL_CREATE_INDEX = (
+    'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({field_names})'
+)
 DEFAULT_TYPE = "BYTEA"
 
 
@@ -83,23 +104,22 @@ def get_psql_command(
     return ["psql", "--no-psqlrc", "-c", command, database_uri]
 
 
-def get_psql_copy_command(
+def get_copy_sql(
     table_name_or_query,
     header,
     encoding="utf-8",
-    user=None,
-    password=None,
-    host=None,
-    port=None,
-    database_name=None,
-    database_uri=None,
     is_query=False,
     dialect=csv.excel,
     direction="FROM",
     has_header=True,
     output_format="CSV",
     force_null=True,
+    meta_command=False,
 ):
+    r"""Return a `COPY ... FROM STDIN`/`COPY ... TO STDOUT` SQL statement
+
+    If `meta_command=True`, return psql's `\copy` meta-command instead.
+    """
     # TODO: implement WHERE (copy FROM)
     output_format = str(output_format or "").strip().upper()
     direction = direction.upper()
@@ -128,8 +148,12 @@ def get_psql_copy_command(
     inside_with.append("FORMAT {output_format}")
     if has_header and output_format != "BINARY":
         inside_with.append("HEADER")
-    copy = r"\copy {source} {header}{direction} STDIN WITH (" + ", ".join(inside_with) + ");"
-    copy_command = copy.format(
+    if meta_command:
+        # psql uses its own stdin/stdout for both `STDIN` and `STDOUT`
+        copy = r"\copy {source} {header}{direction} STDIN WITH (" + ", ".join(inside_with) + ");"
+    else:
+        copy = "COPY {source} {header}{direction} {stream} WITH (" + ", ".join(inside_with) + ")"
+    return copy.format(
         delimiter=dialect.delimiter.replace("'", "''"),
         direction=direction,
         encoding=encoding,
@@ -137,6 +161,38 @@ def get_psql_copy_command(
         output_format=output_format,
         quote=dialect.quotechar.replace("'", "''"),
         source=source,
+        stream="STDIN" if direction == "FROM" else "STDOUT",
+    )
+
+
+def get_psql_copy_command(
+    table_name_or_query,
+    header,
+    encoding="utf-8",
+    user=None,
+    password=None,
+    host=None,
+    port=None,
+    database_name=None,
+    database_uri=None,
+    is_query=False,
+    dialect=csv.excel,
+    direction="FROM",
+    has_header=True,
+    output_format="CSV",
+    force_null=True,
+):
+    copy_command = get_copy_sql(
+        table_name_or_query,
+        header,
+        encoding=encoding,
+        is_query=is_query,
+        dialect=dialect,
+        direction=direction,
+        has_header=has_header,
+        output_format=output_format,
+        force_null=force_null,
+        meta_command=True,
     )
 
     return get_psql_command(
@@ -170,36 +226,224 @@ def pg_create_table_sql(schema, table_name, unlogged=False, access_method=None):
     )
 
 
+def pg_index_name(table_name, field_names, max_size=63):
+    """Return the name of the index on `field_names` of `table_name`
+
+    PostgreSQL truncates identifiers to `max_size` bytes, so long names are
+    truncated here and end with a hash of the full name (indexes on
+    different fields never get the same name).
+    """
+    index_name = "idx_{}_{}".format(table_name, "_".join(field_names))
+    encoded = index_name.encode("utf-8")
+    if len(encoded) <= max_size:
+        return index_name
+    suffix = "_" + hashlib.sha1(encoded).hexdigest()[:8]
+    prefix = encoded[: max_size - len(suffix)].decode("utf-8", "ignore")
+    return prefix + suffix
+
+
+def pg_create_indexes_sql(table_name, indexes):
+    """Return the SQL statements to create B-tree `indexes` and analyze table
+
+    `indexes` must be a list of field name lists (see `prepare_indexes`).
+    """
+    if not indexes:
+        return []
+    result = []
+    for field_names in indexes:
+        result.append(
+            SQL_CREATE_INDEX.format(
+                index_name=pg_index_name(table_name, field_names),
+                table_name=table_name,
+                field_names=", ".join('"{}"'.format(name) for name in field_names),
+            )
+        )
+    result.append('ANALYZE "{}"'.format(table_name))
+    return result
+
+
 def pg_execute_psql(database_uri, sql):
     return execute_command(get_psql_command(sql, database_uri=database_uri))
 
 
-def _python_to_postgresql(field_types):
-    def convert_value(field_type, value):
-        if field_type in (
-            fields.BinaryField,
-            fields.BoolField,
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+PGCOPY_TRAILER = struct.pack("!h", -1)
+PG_EPOCH_DATE = datetime.date(2000, 1, 1)
+PG_EPOCH_DATETIME = datetime.datetime(2000, 1, 1)
+_NULL_VALUE = struct.pack("!i", -1)
+_NUMERIC_SPECIAL = {"n": 0xC000, "N": 0xC000, "F": 0xD000}
+
+
+def _pack_numeric(value):
+    """Encode a `decimal.Decimal` in PostgreSQL's binary `NUMERIC` format"""
+    sign, digits, exponent = value.as_tuple()
+    if exponent in _NUMERIC_SPECIAL:  # NaN or Infinity
+        special = _NUMERIC_SPECIAL[exponent]
+        if exponent == "F" and sign:
+            special = 0xF000
+        return struct.pack("!ihhHh", 8, 0, 0, special, 0)
+
+    digits = "".join(map(str, digits))
+    if exponent > 0:
+        digits, exponent = digits + "0" * exponent, 0
+    scale = -exponent
+    digits = digits.rjust(scale, "0")
+    integer_part, fractional_part = digits[: len(digits) - scale], digits[len(digits) - scale :]
+    integer_part = integer_part.rjust(-(-len(integer_part) // 4) * 4, "0")
+    fractional_part = fractional_part.ljust(-(-len(fractional_part) // 4) * 4, "0")
+    groups = integer_part + fractional_part
+    groups = [int(groups[index : index + 4]) for index in range(0, len(groups), 4)]
+    weight = len(integer_part) // 4 - 1
+    while groups and groups[0] == 0:
+        del groups[0]
+        weight -= 1
+    while groups and groups[-1] == 0:
+        del groups[-1]
+    if not groups:
+        weight, sign = 0, 0
+    size = len(groups)
+    return struct.pack(
+        "!ihhHh{}H".format(size),
+        8 + 2 * size,
+        size,
+        weight,
+        0x4000 if sign else 0,
+        scale,
+        *groups
+    )
+
+
+# OIDs of the `POSTGRESQL_TYPES` (binary `COPY` data is only accepted if it's
+# in the exact format of the column type)
+BINARY_COPY_TYPE_OIDS = {
+    fields.BinaryField: 17,  # BYTEA
+    fields.BoolField: 16,  # BOOLEAN
+    fields.DateField: 1082,  # DATE
+    fields.DatetimeField: 1114,  # TIMESTAMP WITHOUT TIME ZONE
+    fields.DecimalField: 1700,  # NUMERIC
+    fields.FloatField: 700,  # REAL
+    fields.IntegerField: 20,  # BIGINT
+    fields.JSONField: 3802,  # JSONB
+    fields.PercentField: 700,  # REAL
+    fields.TextField: 25,  # TEXT
+    fields.UUIDField: 2950,  # UUID
+}
+
+
+def _binary_copy_encoders(encoding="utf-8"):
+    """Return a `dict` with a binary `COPY` encoder for each field type
+
+    Each encoder returns the value's size (`int32`) followed by its data, as
+    expected by `COPY ... WITH (FORMAT BINARY)` for the column types defined
+    in `POSTGRESQL_TYPES`.
+    """
+    pack_int64 = struct.Struct("!iq").pack
+    pack_int32 = struct.Struct("!ii").pack
+    pack_float32 = struct.Struct("!if").pack
+    pack_size = struct.Struct("!i").pack
+    utc = datetime.timezone.utc
+    true, false = pack_size(1) + b"\x01", pack_size(1) + b"\x00"
+
+    def pack_datetime(value):
+        if value.tzinfo is not None:
+            value = value.astimezone(utc).replace(tzinfo=None)
+        delta = value - PG_EPOCH_DATETIME
+        return pack_int64(
+            8, (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+        )
+
+    def pack_text(value):
+        data = value.encode(encoding)
+        return pack_size(len(data)) + data
+
+    def pack_json(value):
+        data = b"\x01" + json.dumps(value).encode(encoding)
+        return pack_size(len(data)) + data
+
+    def pack_binary(value):
+        return pack_size(len(value)) + value
+
+    return {
+        fields.BinaryField: pack_binary,
+        fields.BoolField: lambda value: true if value else false,
+        fields.DateField: lambda value: pack_int32(
+            4, (value - PG_EPOCH_DATE).days
+        ),
+        fields.DatetimeField: pack_datetime,
+        fields.DecimalField: _pack_numeric,
+        fields.FloatField: lambda value: pack_float32(4, value),
+        fields.IntegerField: lambda value: pack_int64(8, value),
+        fields.JSONField: pack_json,
+        fields.PercentField: lambda value: pack_float32(4, value),
+        fields.TextField: pack_text,
+        fields.UUIDField: lambda value: pack_size(16) + value.bytes,
+    }
+
+
+def _copy_binary_row_encoder(field_types, encoding="utf-8"):
+    """Return a function which encodes a row for `COPY` in binary format"""
+    encoders = _binary_copy_encoders(encoding)
+    encoders = [encoders[field_type] for field_type in field_types]
+    row_header = struct.pack("!h", len(field_types))
+
+    def encode_row(row):
+        return row_header + b"".join(
+            [
+                _NULL_VALUE if value is None else encode(value)
+                for encode, value in zip(encoders, row)
+            ]
+        )
+
+    return encode_row
+
+
+_COPY_TEXT_ESCAPE = str.maketrans(
+    {"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+)
+
+
+def _copy_text_row_encoder(field_types, encoding="utf-8"):
+    """Return a function which encodes a row for `COPY` in text format"""
+
+    def to_text(field_type):
+        if field_type is fields.BoolField:
+            return lambda value: "t" if value else "f"
+        elif field_type is fields.BinaryField:
+            return lambda value: "\\x" + binascii.hexlify(value).decode("ascii")
+        elif field_type is fields.DatetimeField:
+            return lambda value: value.isoformat(" ")
+        elif field_type is fields.JSONField:
+            return json.dumps
+        elif field_type in (
             fields.DateField,
-            fields.DatetimeField,
             fields.DecimalField,
             fields.FloatField,
             fields.IntegerField,
             fields.PercentField,
-            fields.TextField,
-            fields.JSONField,
+            fields.UUIDField,
         ):
-            return value
-
+            return str
+        elif field_type is fields.TextField:
+            return lambda value: value
         else:  # don't know this field
-            return field_type.serialize(value)
-
-    def convert_row(row):
-        return [
-            convert_value(field_type, value)
-            for field_type, value in zip(field_types, row)
-        ]
+            return field_type.serialize
+
+    converters = [to_text(field_type) for field_type in field_types]
+
+    def encode_row(row):
+        return (
+            "\t".join(
+                [
+                    "\\N"
+                    if value is None
+                    else convert(value).translate(_COPY_TEXT_ESCAPE)
+                    for convert, value in zip(converters, row)
+                ]
+            )
+            + "\n"
+        ).encode(encoding)
 
-    return convert_row
+    return encode_row
 
 
 def get_source(connection_or_uri):
@@ -245,15 +489,54 @@ def _valid_table_name(name):
         return True
 
 
+def _cast_bytea(value, cursor):
+    value = BINARY(value, cursor)
+    return bytes(value) if value is not None else None
+
+
+# `BYTEA` values are returned as `bytes` (instead of `memoryview`)
+BYTEA_TO_BYTES = new_type(BINARY.values, "BYTEA_TO_BYTES", _cast_bytea)
+
+
+def _close_cursor(cursor, connection, close_connection):
+    """Close `cursor`, ending its transaction (and close the connection)"""
+    cursor.close()
+    if not connection.closed:
+        connection.commit()  # WHY?
+        if close_connection:
+            connection.close()
+
+
+def _iterate_cursor(table_rows, cursor, connection, close_connection):
+    """Yield all `table_rows`, then close `cursor` (and the connection)"""
+    try:
+        for row in table_rows:
+            yield row
+    finally:
+        _close_cursor(cursor, connection, close_connection)
+
+
 def import_from_postgresql(
     connection_or_uri,
     table_name="table1",
     query=None,
     query_args=None,
     close_connection=None,
+    itersize=10000,
     *args,
     **kwargs,
 ):
+    """Import data from a PostgreSQL table or query
+
+    Rows are fetched from a server-side (named) cursor, `itersize` rows at a
+    time - use `lazy=True` and `samples` so they're fed lazily into
+    `create_table` and the memory usage does not depend on the result size.
+    The cursor (and the connection, if `close_connection`) is closed after all
+    rows are fetched; with `lazy=True`, only after the last row is read from
+    the returned table (the transaction, which locks the table, stays open
+    until then). If `itersize` is `None`, a client-side cursor is used
+    (needed for queries which can't be used in `DECLARE CURSOR`).
+    """
 
     if query is None:
         if not _valid_table_name(table_name):
@@ -267,17 +550,50 @@ def import_from_postgresql(
     source = get_source(connection_or_uri)
     connection = source.fobj
 
-    cursor = connection.cursor()
+    if itersize is None:
+        cursor = connection.cursor()
+    else:
+        # Named cursors can only be used outside transactions if `withhold`
+        cursor = connection.cursor(
+            name="rows_{}".format(uuid.uuid4().hex),
+            withhold=connection.autocommit,
+        )
+        cursor.itersize = itersize
+    register_type(BYTEA_TO_BYTES, cursor)
     cursor.execute(query, query_args)
-    table_rows = list(cursor.fetchall())  # TODO: make it lazy
+    table_rows = iter(cursor)
+    # A server-side cursor only has `description` after the first fetch
+    first_row = next(table_rows, None)
     header = [six.text_type(info[0]) for info in cursor.description]
-    cursor.close()
-    connection.commit()  # WHY?
+    if first_row is not None:
+        table_rows = itertools.chain([first_row], table_rows)
+    if close_connection is None:
+        close_connection = source.should_close
 
     meta = {"imported_from": "postgresql", "source": source}
-    if close_connection or (close_connection is None and source.should_close):
-        connection.close()
-    return create_table([header] + table_rows, meta=meta, *args, **kwargs)
+    if not kwargs.get("lazy", False):
+        # End the transaction (which locks the table) before `create_table`
+        try:
+            table_rows = list(table_rows)
+        finally:
+            _close_cursor(cursor, connection, close_connection)
+        return create_table(
+            itertools.chain([header], table_rows), meta=meta, *args, **kwargs
+        )
+
+    try:
+        return create_table(
+            itertools.chain(
+                [header],
+                _iterate_cursor(table_rows, cursor, connection, close_connection),
+            ),
+            meta=meta,
+            *args,
+            **kwargs,
+        )
+    except Exception:  # The rows may never be read
+        _close_cursor(cursor, connection, close_connection)
+        raise
 
 
 def export_to_postgresql(
@@ -287,9 +603,16 @@ def export_to_postgresql(
     table_name_format="table{index}",
     batch_size=100,
     close_connection=None,
+    indexes=None,
     *args,
     **kwargs,
 ):
+    """Export a `rows.Table` to a PostgreSQL table using `COPY`
+
+    `indexes` (a list of field names or lists of field names, for composite
+    indexes) are created after all rows are copied, then the table is
+    analyzed.
+    """
     # TODO: should add transaction support?
 
     if table_name is not None and not _valid_table_name(table_name):
@@ -311,17 +634,44 @@ def export_to_postgresql(
     prepared_table = prepare_to_export(table, *args, **kwargs)
     field_names = next(prepared_table)
     field_types = list(map(table.fields.get, field_names))
+    indexes = prepare_indexes(indexes, field_names)
     # TODO: add option to table access method (columnar, for example)
     cursor.execute(pg_create_table_sql(table.fields, table_name))
 
-    insert_sql = SQL_INSERT.format(
-        table_name=table_name,
-        field_names=", ".join(field_names),
-        placeholders=", ".join("%s" for _ in field_names),
+    # Rows are streamed using `COPY FROM STDIN` (`batch_size` rows are sent
+    # at a time) in binary format if all field types can be encoded in the
+    # format of the table's columns (which may already exist with other
+    # types), otherwise in text format.
+    cursor.execute(SQL_SELECT_ALL.format(table_name=table_name) + " LIMIT 0")
+    column_types = {six.text_type(info[0]): info[1] for info in cursor.description}
+    encoding = encodings.get(connection.encoding, "utf-8")
+    binary = all(
+        field_type in BINARY_COPY_TYPE_OIDS
+        and column_types.get(field_name) == BINARY_COPY_TYPE_OIDS[field_type]
+        for field_name, field_type in zip(field_names, field_types)
     )
-    _convert_row = _python_to_postgresql(field_types)
-    for batch in ipartition(prepared_table, batch_size):
-        cursor.executemany(insert_sql, map(_convert_row, batch))
+    if binary:
+        encode_row = _copy_binary_row_encoder(field_types, encoding)
+    else:
+        encode_row = _copy_text_row_encoder(field_types, encoding)
+
+    def chunks():
+        if binary:
+            yield PGCOPY_HEADER
+        for batch in ipartition(prepared_table, batch_size):
+            yield b"".join(map(encode_row, batch))
+        if binary:
+            yield PGCOPY_TRAILER
+
+    copy_sql = get_copy_sql(
+        '"{}"'.format(table_name),
+        header=field_names,
+        output_format="BINARY" if binary else "TEXT",
+        has_header=False,
+    )
+    cursor.copy_expert(copy_sql, _ChunkReader(chunks()))
+    for sql in pg_create_indexes_sql(table_name, indexes):
+        cursor.execute(sql)
 
     connection.commit()
     cursor.close()
@@ -330,21 +680,130 @@ def export_to_postgresql(
     return connection, table_name
 
 
+COPY_BACKENDS = ("psql", "psycopg2")
+
+
+@contextmanager
+def pg_connection(database_uri, connection=None):
+    """Yield `connection` (if provided) or a new connection to `database_uri`
+
+    The transaction is committed at the end (or rolled back if an exception is
+    raised) and the connection is closed only if it was created here, so
+    existing (like pooled) connections can be reused.
+    """
+    if connection is None:
+        conn = pgconnect(database_uri)
+    else:
+        conn = connection
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    else:
+        conn.commit()
+    finally:
+        if connection is None:
+            conn.close()
+
+
+class _ChunkReader:
+    """File-like object which `read`s from an iterator of `bytes` chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def read(self, size=-1):
+        return next(self._chunks, b"")
+
+
+class _RangeReader:
+    """File-like object which reads at most `size` bytes from `fobj`"""
+
+    def __init__(self, fobj, size):
+        self._fobj = fobj
+        self._remaining = size
+
+    def read(self, size=-1):
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fobj.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._fobj.close()
+
+
+class _ChunkWriter:
+    """File-like object which groups written data into chunks of `chunk_size`
+
+    `function` is called with each chunk - call `flush` after the last write.
+    """
+
+    def __init__(self, function, chunk_size):
+        self._function = function
+        self._chunk_size = chunk_size
+        self._buffer, self._size = [], 0
+
+    def write(self, data):
+        self._buffer.append(data)
+        self._size += len(data)
+        if self._size >= self._chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self._buffer:
+            data = b"".join(self._buffer)
+            self._buffer, self._size = [], 0
+            self._function(data)
+
+
+def _copy_rowcount(cursor):
+    """Return the number of rows copied by `cursor.copy_expert` (or `None`)"""
+    return cursor.rowcount if cursor.rowcount >= 0 else None
+
+
+def _check_backend(backend):
+    if backend not in COPY_BACKENDS:
+        raise ValueError(
+            "`backend` must be one of: {}".format(", ".join(COPY_BACKENDS))
+        )
+
+
 class PostgresCopy:
     """Import data from CSV into PostgreSQL using the fastest method
 
-    Required: psql command
+    Two backends are available:
+    - `"psql"` (default): pipe data to `psql`'s `\\copy` (requires the `psql`
+      command);
+    - `"psycopg2"`: run `COPY` in-process with `cursor.copy_expert` - if
+      `connection` is provided it's used (and not closed), so many small
+      imports can share the same (pooled) connection.
     """
 
     # TODO: implement export
-    # TODO: add option to run parallel COPY processes
     # TODO: add logging to the process
     # TODO: detect when error ocurred and interrupt the process immediatly
 
-    def __init__(self, database_uri, chunk_size=8388608, max_samples=10000):
+    def __init__(
+        self,
+        database_uri,
+        chunk_size=8388608,
+        max_samples=10000,
+        backend="psql",
+        connection=None,
+    ):
+        if connection is not None and backend == "psql":
+            backend = "psycopg2"
+        _check_backend(backend)
         self.database_uri = database_uri
         self.chunk_size = chunk_size
         self.max_samples = max_samples
+        self.backend = backend
+        self.connection = connection
 
     def _convert_encoding(self, encoding):
         pg_encoding = encoding
@@ -353,6 +812,52 @@ class PostgresCopy:
             pg_encoding = "SQL_ASCII"
         return pg_encoding
 
+    def _execute(self, sql):
+        if self.backend == "psql":
+            pg_execute_psql(self.database_uri, sql)
+        else:
+            with pg_connection(self.database_uri, self.connection) as connection:
+                cursor = connection.cursor()
+                cursor.execute(sql)
+                cursor.close()
+
+    def _read_chunks(self, fobj, skip_rows, callback, progress):
+        """Yield data from `fobj` to be imported (chunks without `\\x00`)
+
+        `progress` (a `dict`) is updated with `bytes_read` and `bytes_written`
+        and `callback(bytes_read_now, total_bytes_read)` is called after each
+        chunk is consumed.
+        """
+        data = fobj.read(self.chunk_size)
+        if skip_rows > 0:
+            temp_fobj = io.BytesIO(data)
+            for _ in range(skip_rows):
+                next(temp_fobj)  # Read next line
+                # TODO: we're reading the next LINE instead of next ROW
+                # because it's easier, but not 100% correct (will work for
+                # most cases). It'd be complicated to have the exact byte
+                # where each row finishes to skip.
+            skipped_bytes = temp_fobj.tell()
+            data = data[skipped_bytes:]  # Consume bytes read by `for`
+            # `bytes_read` must be incremented and `callback` must be called, even if these bytes were not written,
+            # to ensure it correctly reflects to total read bytes. Ultimately, `bytes_read` must match the file
+            # size.
+            progress["bytes_read"] += skipped_bytes
+            if callback:
+                callback(skipped_bytes, progress["bytes_read"])
+        while data != b"":
+            # If `data` contains `\x00`, then the amount of bytes written
+            # will be different from `len(data)`. Since the progress bar
+            # reports the uncompressed size of the file we must report
+            # progress based on original data read, not on data written.
+            chunk = data.replace(b"\x00", b"")
+            yield chunk
+            progress["bytes_written"] += len(chunk)
+            progress["bytes_read"] += len(data)
+            if callback:
+                callback(len(data), progress["bytes_read"])
+            data = fobj.read(self.chunk_size)
+
     def _import(
         self,
         fobj,
@@ -364,9 +869,7 @@ class PostgresCopy:
         skip_rows=0,
         callback=None,
     ):
-        # Prepare the `psql` command to be executed based on collected metadata
-        command = get_psql_copy_command(
-            database_uri=self.database_uri,
+        copy_params = dict(
             dialect=dialect,
             direction="FROM",
             encoding=self._convert_encoding(encoding),
@@ -375,6 +878,41 @@ class PostgresCopy:
             is_query=False,
             has_header=has_header,
         )
+        if self.backend == "psql":
+            return self._import_psql(fobj, copy_params, skip_rows, callback)
+        else:
+            return self._import_psycopg2(fobj, copy_params, skip_rows, callback)
+
+    def _import_psycopg2(self, fobj, copy_params, skip_rows=0, callback=None):
+        progress = {"bytes_read": 0, "bytes_written": 0}
+        chunks = self._read_chunks(fobj, skip_rows, callback, progress)
+        try:
+            with pg_connection(self.database_uri, self.connection) as connection:
+                cursor = connection.cursor()
+                try:
+                    cursor.copy_expert(
+                        get_copy_sql(**copy_params),
+                        _ChunkReader(chunks),
+                        size=self.chunk_size,
+                    )
+                    rows_imported = _copy_rowcount(cursor)
+                finally:
+                    cursor.close()
+        except DatabaseError as exception:
+            raise RuntimeError(str(exception)) from exception
+        finally:
+            fobj.close()
+
+        return {
+            "bytes_read": progress["bytes_read"],
+            "bytes_written": progress["bytes_written"],
+            "rows_imported": rows_imported,
+        }
+
+    def _import_psql(self, fobj, copy_params, skip_rows=0, callback=None):
+        # Prepare the `psql` command to be executed based on collected metadata
+        command = get_psql_copy_command(database_uri=self.database_uri, **copy_params)
+        progress = {"bytes_read": 0, "bytes_written": 0}
         rows_imported, error = 0, None
         try:
             # TODO: use env instead of passing full database URI to
@@ -388,34 +926,8 @@ class PostgresCopy:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
             )
-            data = fobj.read(self.chunk_size)
-            total_read, total_written = 0, 0
-            if skip_rows > 0:
-                temp_fobj = io.BytesIO(data)
-                for _ in range(skip_rows):
-                    next(temp_fobj)  # Read next line
-                    # TODO: we're reading the next LINE instead of next ROW
-                    # because it's easier, but not 100% correct (will work for
-                    # most cases). It'd be complicated to have the exact byte
-                    # where each row finishes to skip.
-                skipped_bytes = temp_fobj.tell()
-                data = data[skipped_bytes:]  # Consume bytes read by `for`
-                # `total_read` must be incremented and `callback` must be called, even if these bytes were not written,
-                # to ensure it correctly reflects to total read bytes. Ultimately, `total_read` must match the file
-                # size.
-                total_read += skipped_bytes
-                if callback:
-                    callback(skipped_bytes, total_read)
-            while data != b"":
-                # If `data` contains `\x00`, then the amount of bytes written
-                # will be different from `len(data)`. Since the progress bar
-                # reports the uncompressed size of the file we must report
-                # progress based on original data read, not on data written.
-                total_written += process.stdin.write(data.replace(b"\x00", b""))
-                total_read += len(data)
-                if callback:
-                    callback(len(data), total_read)
-                data = fobj.read(self.chunk_size)
+            for chunk in self._read_chunks(fobj, skip_rows, callback, progress):
+                process.stdin.write(chunk)
             stdout, stderr = process.communicate()
             if stderr != b"":
                 for line in stderr.splitlines():
@@ -442,11 +954,82 @@ class PostgresCopy:
         else:
             fobj.close()
             return {
-                "bytes_read": total_read,
-                "bytes_written": total_written,
+                "bytes_read": progress["bytes_read"],
+                "bytes_written": progress["bytes_written"],
                 "rows_imported": rows_imported,
             }
 
+    def _import_parallel(
+        self,
+        filename,
+        inspector,
+        jobs,
+        encoding,
+        dialect,
+        field_names,
+        table_name,
+        has_header=True,
+        skip_rows=0,
+        callback=None,
+    ):
+        """Run `jobs` concurrent `COPY`s, each one with a part of the file
+
+        The file is split in byte ranges aligned to the records (after
+        skipping `skip_rows` lines and the header). Each range is imported in
+        its own session/transaction, so if one of them fails the rows
+        imported by the others are kept.
+        """
+        with open(filename, mode="rb") as fobj:
+            for _ in range(skip_rows):
+                fobj.readline()  # Lines, not rows (same as `_read_chunks`)
+            data_start = fobj.tell()
+        file_size = os.path.getsize(filename)
+        if has_header:
+            record_ends = inspector._record_ends(data_start, chunk_size=0)
+            data_start = next(record_ends, file_size)
+            record_ends.close()
+        ranges = inspector.record_ranges(
+            data_start, chunk_size=max((file_size - data_start) // jobs, 1)
+        )
+
+        lock = threading.Lock()
+        progress = {"total_read": 0}
+
+        def update_progress(bytes_read, total_read=None):
+            with lock:
+                progress["total_read"] += bytes_read
+                if callback:
+                    callback(bytes_read, progress["total_read"])
+
+        if data_start > 0:
+            update_progress(data_start)
+
+        def import_range(start, end):
+            fobj = open(filename, mode="rb")
+            fobj.seek(start)
+            return self._import(
+                fobj=_RangeReader(fobj, end - start),
+                encoding=encoding,
+                dialect=dialect,
+                field_names=field_names,
+                table_name=table_name,
+                has_header=False,
+                callback=update_progress,
+            )
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(import_range, *args) for args in ranges]
+            results = [future.result() for future in futures]
+
+        rows_imported = [result["rows_imported"] for result in results]
+        return {
+            "bytes_read": data_start + sum(result["bytes_read"] for result in results),
+            "bytes_written": sum(result["bytes_written"] for result in results),
+            "rows_imported": (
+                None if None in rows_imported else sum(rows_imported)
+            ),
+        }
+
     def import_from_filename(
         self,
         filename,
@@ -460,13 +1043,23 @@ class PostgresCopy:
         unlogged=False,
         access_method=None,
         callback=None,
+        jobs=1,
+        indexes=None,
     ):
+        """Import a CSV file (compressed or not) into `table_name`
+
+        If `jobs > 1` and the file is an uncompressed regular file it's split
+        in `jobs` parts, which are imported concurrently (one `COPY` session
+        for each part). `indexes` are created after the import (see
+        `pg_create_indexes_sql`).
+        """
         inspector = CsvInspector(filename, chunk_size=self.chunk_size, max_samples=self.max_samples, encoding=encoding, dialect=dialect)
         encoding = encoding or inspector.encoding
         dialect = dialect or inspector.dialect
         schema = schema or inspector.schema
         if isinstance(dialect, six.text_type):
             dialect = csv.get_dialect(dialect)
+        indexes = prepare_indexes(indexes, list(schema.keys()))
 
         if not has_header:
             field_names = list(schema.keys())
@@ -494,19 +1087,37 @@ class PostgresCopy:
             # TODO: we may check if the server has support to the selected
             # access method with the following query:
             # `SELECT EXISTS(SELECT 1 FROM pg_catalog.pg_am WHERE amname = %s)`
-            pg_execute_psql(self.database_uri, create_table_sql)
+            self._execute(create_table_sql)
 
         fobj = open_compressed(filename, mode="rb")
-        return self._import(
-            fobj=fobj,
-            encoding=encoding,
-            dialect=dialect,
-            field_names=field_names,
-            table_name=table_name,
-            has_header=has_header,
-            skip_rows=skip_rows,
-            callback=callback,
-        )
+        if jobs > 1 and _local_filename(fobj) and inspector.can_split:
+            fobj.close()
+            result = self._import_parallel(
+                filename=str(filename),
+                inspector=inspector,
+                jobs=jobs,
+                encoding=encoding,
+                dialect=dialect,
+                field_names=field_names,
+                table_name=table_name,
+                has_header=has_header,
+                skip_rows=skip_rows,
+                callback=callback,
+            )
+        else:
+            result = self._import(
+                fobj=fobj,
+                encoding=encoding,
+                dialect=dialect,
+                field_names=field_names,
+                table_name=table_name,
+                has_header=has_header,
+                skip_rows=skip_rows,
+                callback=callback,
+            )
+        for sql in pg_create_indexes_sql(table_name, indexes):
+            self._execute(sql)
+        return result
 
     def import_from_fobj(
         self,
@@ -521,18 +1132,19 @@ class PostgresCopy:
         unlogged=False,
         access_method=None,
         callback=None,
+        indexes=None,
     ):
         if isinstance(dialect, six.text_type):
             dialect = csv.get_dialect(dialect)
         # TODO: add `else` to check if `dialect` is instace of correct class
+        indexes = prepare_indexes(indexes, list(schema.keys()))
 
         # TODO: check if access_method exists in pg_am
 
         if create_table:
             # If we need to create the table, it creates based on schema, not
             # on CSV directly (field order will be schema's field order).
-            pg_execute_psql(
-                self.database_uri,
+            self._execute(
                 pg_create_table_sql(
                     schema, table_name, unlogged=unlogged, access_method=access_method
                 ),
@@ -543,7 +1155,7 @@ class PostgresCopy:
 
         # TODO: check if the file is open in binary mode
 
-        return self._import(
+        result = self._import(
             fobj=fobj,
             encoding=encoding,
             dialect=dialect,
@@ -553,6 +1165,9 @@ class PostgresCopy:
             skip_rows=skip_rows,
             callback=callback,
         )
+        for sql in pg_create_indexes_sql(table_name, indexes):
+            self._execute(sql)
+        return result
 
 
 def pgimport(
@@ -570,11 +1185,27 @@ def pgimport(
     unlogged=False,
     access_method=None,
     callback=None,
+    backend="psql",
+    connection=None,
+    jobs=1,
+    indexes=None,
 ):
     """Import data from CSV into PostgreSQL using the fastest method
 
-    Required: `psql` command installed.
+    Required: `psql` command installed (if `backend="psql"`). With
+    `backend="psycopg2"` the data is sent in-process using `COPY FROM STDIN`
+    (and `connection`, if provided, is reused instead of creating a new one).
+
+    If `jobs > 1` and `filename_or_fobj` is an uncompressed file, it's split
+    on record boundaries and imported by `jobs` concurrent `COPY` sessions
+    (`callback` receives the progress of all of them).
+
+    `indexes` (a list of field names or lists of field names, for composite
+    indexes) are created after the data is imported, then the table is
+    analyzed.
     """
+    if jobs > 1 and connection is not None:
+        raise ValueError("`connection` cannot be used with `jobs` > 1")
 
     # TODO: add warning if table already exists and create_table=True
     if isinstance(dialect, six.text_type):
@@ -584,6 +1215,8 @@ def pgimport(
         database_uri=database_uri,
         chunk_size=chunk_size,
         max_samples=max_samples,
+        backend=backend,
+        connection=connection,
     )
 
     if isinstance(filename_or_fobj, (six.binary_type, six.text_type, Path)):
@@ -599,6 +1232,8 @@ def pgimport(
             unlogged=unlogged,
             access_method=access_method,
             callback=callback,
+            jobs=jobs,
+            indexes=indexes,
         )
     else:
         # File-object, so some fields are required
@@ -618,6 +1253,7 @@ def pgimport(
             unlogged=unlogged,
             access_method=access_method,
             callback=callback,
+            indexes=indexes,
         )
 
 
@@ -630,20 +1266,25 @@ def pgexport(
     callback=None,
     is_query=False,
     chunk_size=8388608,
+    backend="psql",
+    connection=None,
 ):
     """Export data from PostgreSQL into a CSV file using the fastest method
 
-    Required: psql command
+    Required: psql command (if `backend="psql"`). With `backend="psycopg2"`
+    the data is received in-process using `COPY TO STDOUT` (and `connection`,
+    if provided, is reused instead of creating a new one).
     """
     # TODO: integrate with PostgresCopy
 
     # TODO: add logging to the process
     if isinstance(dialect, six.text_type):
         dialect = csv.get_dialect(dialect)
+    if connection is not None and backend == "psql":
+        backend = "psycopg2"
+    _check_backend(backend)
 
-    # Prepare the `psql` command to be executed to export data
-    command = get_psql_copy_command(
-        database_uri=database_uri,
+    copy_params = dict(
         direction="TO",
         encoding=encoding,
         header=None,  # Needed when direction = 'TO'
@@ -652,6 +1293,34 @@ def pgexport(
         dialect=dialect,
     )
     fobj = open_compressed(filename, mode="wb")
+    if backend == "psycopg2":
+        progress = {"total_written": 0}
+
+        def write_chunk(data):
+            written = fobj.write(data.replace(b"\x00", b""))
+            progress["total_written"] += written
+            if callback:
+                callback(written, progress["total_written"])
+
+        writer = _ChunkWriter(write_chunk, chunk_size)
+        try:
+            with pg_connection(database_uri, connection) as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.copy_expert(
+                        get_copy_sql(**copy_params), writer, size=chunk_size
+                    )
+                finally:
+                    cursor.close()
+            writer.flush()
+        except DatabaseError as exception:
+            raise RuntimeError(str(exception)) from exception
+        finally:
+            fobj.close()
+        return {"bytes_written": progress["total_written"]}
+
+    # Prepare the `psql` command to be executed to export data
+    command = get_psql_copy_command(database_uri=database_uri, **copy_params)
     try:
         process = subprocess.Popen(
             command,
@@ -715,41 +1384,182 @@ def get_create_table_from_query(database_uri, table_name_or_query, table_name):
     return f"""CREATE TABLE IF NOT EXISTS "{table_name}" ({", ".join(column_types)})"""
 
 
-def pg2pg(
-    database_uri_from,
-    database_uri_to,
-    table_name_from,
+def _pg2pg_copy(
+    connection_from,
+    connection_to,
+    output_sql,
     table_name_to,
+    copy_params,
+    binary=False,
     chunk_size=8388608,
     callback=None,
-    dialect=csv.excel,
-    encoding="utf-8",
-    create_table=True,
-    binary=False,
 ):
-    r"""Export data from one PostgreSQL instance to another using psql's \copy
+    """Copy the result of `output_sql` into `table_name_to` (both in-process)
 
-    Required: psql command
+    `COPY TO STDOUT` runs in a thread (using `connection_from`) and puts its
+    chunks in a bounded queue, which is consumed by `COPY FROM STDIN` (using
+    `connection_to`) in the current thread. The transactions are not
+    committed.
     """
+    chunks = queue.Queue(maxsize=4)
+    stop, finished, errors = threading.Event(), object(), []
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            else:
+                return
+        raise RuntimeError("COPY interrupted")
+
+    def export_data():
+        cursor = connection_from.cursor()
+        writer = _ChunkWriter(put, chunk_size)
+        try:
+            cursor.copy_expert(
+                get_copy_sql(
+                    output_sql,
+                    header=None,  # Needed when direction = 'TO'
+                    direction="TO",
+                    is_query=True,
+                    **copy_params,
+                ),
+                writer,
+                size=chunk_size,
+            )
+            writer.flush()
+        except Exception as exception:
+            errors.append(exception)
+        finally:
+            cursor.close()
+            try:
+                put(finished)
+            except RuntimeError:
+                pass
+
+    progress = {"total_written": 0}
+
+    def read_chunks(first):
+        chunk = first
+        while chunk is not finished:
+            progress["total_written"] += len(chunk)
+            if callback:
+                callback(len(chunk), progress["total_written"])
+            yield chunk
+            chunk = chunks.get()
 
-    # TODO: if table already exists, check whether the types are the same from
-    # expected query result
-
-    if create_table:
-        query = get_create_table_from_query(database_uri_from, table_name_from, table_name_to)
-        conn = pgconnect(database_uri_to)
-        cursor = conn.cursor()
-        cursor.execute(query)
+    thread = threading.Thread(target=export_data, daemon=True)
+    thread.start()
+    rows_imported = 0
+    try:
+        first = chunks.get()
+        if first is not finished:
+            if not binary:
+                field_names = next(
+                    csv.reader(
+                        io.TextIOWrapper(io.BytesIO(first), encoding=copy_params["encoding"]),
+                        dialect=copy_params["dialect"],
+                    )
+                )
+            else:
+                field_names = None
+            cursor = connection_to.cursor()
+            try:
+                cursor.copy_expert(
+                    get_copy_sql(
+                        table_name_to,
+                        header=field_names,
+                        direction="FROM",
+                        is_query=False,
+                        has_header=True,
+                        **copy_params,
+                    ),
+                    _ChunkReader(read_chunks(first)),
+                    size=chunk_size,
+                )
+                rows_imported = _copy_rowcount(cursor)
+            finally:
+                cursor.close()
+    except DatabaseError as exception:
+        raise RuntimeError(str(exception)) from exception
+    finally:
+        stop.set()
+        thread.join()
+    if errors:
+        raise RuntimeError(str(errors[0])) from errors[0]
+    return {"bytes_written": progress["total_written"], "rows_imported": rows_imported}
+
+
+def get_partition_conditions(database_uri, table_name, partitions, key=None):
+    """Return `WHERE` conditions which split `table_name` in `partitions`
+
+    If `key` is `None`, the table is split in ranges of pages (using `ctid`,
+    which is efficient on PostgreSQL 14+); otherwise `key` must be an integer
+    column and the table is split in ranges of its values (rows with `NULL`
+    keys are put in the first partition). Rows inserted after the split are
+    included in the last partition.
+    """
+    if partitions < 1:
+        raise ValueError("`partitions` must be greater than 0")
+    if partitions == 1:
+        return ["TRUE"]
+
+    with pg_connection(database_uri) as connection:
+        cursor = connection.cursor()
+        if key is None:
+            cursor.execute(
+                "SELECT (pg_relation_size(%s::regclass) / "
+                "current_setting('block_size')::int)::bigint",
+                ('"{}"'.format(table_name),),
+            )
+            start, stop = 0, cursor.fetchone()[0]
+        else:
+            cursor.execute(
+                'SELECT MIN("{key}"), MAX("{key}") FROM "{table_name}"'.format(
+                    key=key, table_name=table_name
+                )
+            )
+            start, stop = cursor.fetchone()
         cursor.close()
-        conn.commit()
-        conn.close()
 
-    # Prepare the `psql` command to be executed to export data
-    output_sql = table_name_from if " " in table_name_from else f'''SELECT * FROM "{table_name_from}"'''
-    if not binary:
-        copy_params = {"encoding": encoding, "dialect": dialect}
+    if key is None:
+        column, value_format = "ctid", "'({},0)'::tid"
     else:
-        copy_params = {"output_format": "binary"}
+        if start is None:  # Empty table (or only NULLs)
+            return ["TRUE"]
+        elif not isinstance(start, six.integer_types):
+            raise ValueError("`key` must be an integer column")
+        column, value_format = '"{}"'.format(key), "{}"
+        stop += 1
+    step = max(-(-(stop - start) // partitions), 1)
+    bounds = [value_format.format(start + index * step) for index in range(1, partitions)]
+    conditions = ["{} < {}".format(column, bounds[0])]
+    if key is not None:
+        conditions[0] = "({} OR {} IS NULL)".format(conditions[0], column)
+    for lower, upper in zip(bounds, bounds[1:]):
+        conditions.append(
+            "{column} >= {lower} AND {column} < {upper}".format(
+                column=column, lower=lower, upper=upper
+            )
+        )
+    conditions.append("{} >= {}".format(column, bounds[-1]))
+    return conditions
+
+
+def _pg2pg_psql(
+    database_uri_from,
+    database_uri_to,
+    output_sql,
+    table_name_to,
+    copy_params,
+    binary=False,
+    chunk_size=8388608,
+    callback=None,
+):
+    """Copy the result of `output_sql` into `table_name_to` using two `psql`"""
+    encoding, dialect = copy_params.get("encoding"), copy_params.get("dialect")
     command_output = get_psql_copy_command(
         database_uri=database_uri_from,
         direction="TO",
@@ -822,6 +1632,123 @@ def pg2pg(
     else:
         return {"bytes_written": total_written, "rows_imported": rows_imported}
 
+
+def pg2pg(
+    database_uri_from,
+    database_uri_to,
+    table_name_from,
+    table_name_to,
+    chunk_size=8388608,
+    callback=None,
+    dialect=csv.excel,
+    encoding="utf-8",
+    create_table=True,
+    binary=False,
+    backend="psql",
+    connection_from=None,
+    connection_to=None,
+    jobs=1,
+    partition_by=None,
+):
+    r"""Export data from one PostgreSQL instance to another using psql's \copy
+
+    Required: psql command (if `backend="psql"`). With `backend="psycopg2"`
+    both `COPY` commands run in-process (`COPY TO STDOUT` in a thread, feeding
+    `COPY FROM STDIN` through a bounded queue); `connection_from` and
+    `connection_to`, if provided, are reused instead of creating new ones.
+
+    If `jobs > 1`, `table_name_from` (must be a table) is split in `jobs`
+    partitions (see `get_partition_conditions`, by `ctid` or by the integer
+    column `partition_by`) which are copied concurrently - each one in its own
+    transaction. `callback` receives the progress of all of them and the
+    result has the stats of each partition in `"partitions"`.
+    """
+
+    # TODO: if table already exists, check whether the types are the same from
+    # expected query result
+    if (connection_from is not None or connection_to is not None) and backend == "psql":
+        backend = "psycopg2"
+    _check_backend(backend)
+    if jobs > 1:
+        if " " in table_name_from:
+            raise ValueError("`jobs` > 1 can only be used to copy tables (not queries)")
+        elif connection_from is not None or connection_to is not None:
+            raise ValueError("`connection_from`/`connection_to` cannot be used with `jobs` > 1")
+
+    if create_table:
+        query = get_create_table_from_query(database_uri_from, table_name_from, table_name_to)
+        with pg_connection(database_uri_to, connection_to) as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            cursor.close()
+
+    # Prepare the `psql` command to be executed to export data
+    output_sql = table_name_from if " " in table_name_from else f'''SELECT * FROM "{table_name_from}"'''
+    if not binary:
+        copy_params = {"encoding": encoding, "dialect": dialect}
+    else:
+        copy_params = {"output_format": "binary"}
+
+    def copy(output_sql, callback, connection_from=None, connection_to=None):
+        if backend == "psql":
+            return _pg2pg_psql(
+                database_uri_from,
+                database_uri_to,
+                output_sql,
+                table_name_to,
+                copy_params,
+                binary=binary,
+                chunk_size=chunk_size,
+                callback=callback,
+            )
+        with pg_connection(database_uri_from, connection_from) as conn_from, \
+                pg_connection(database_uri_to, connection_to) as conn_to:
+            return _pg2pg_copy(
+                conn_from,
+                conn_to,
+                output_sql,
+                table_name_to,
+                copy_params,
+                binary=binary,
+                chunk_size=chunk_size,
+                callback=callback,
+            )
+
+    if jobs <= 1:
+        return copy(output_sql, callback, connection_from, connection_to)
+
+    conditions = get_partition_conditions(
+        database_uri_from, table_name_from, jobs, key=partition_by
+    )
+    lock = threading.Lock()
+    progress = {"total_written": 0}
+
+    def update_progress(written, total_written=None):
+        with lock:
+            progress["total_written"] += written
+            if callback:
+                callback(written, progress["total_written"])
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(
+                copy, "{} WHERE {}".format(output_sql, condition), update_progress
+            )
+            for condition in conditions
+        ]
+        results = [future.result() for future in futures]
+
+    rows_imported = [result["rows_imported"] for result in results]
+    return {
+        "bytes_written": sum(result["bytes_written"] for result in results),
+        "rows_imported": None if None in rows_imported else sum(rows_imported),
+        "partitions": [
+            dict(result, condition=condition)
+            for condition, result in zip(conditions, results)
+        ],
+    }
+
+
 # TODO: run `psql` with --filename=tempfile instead of -c (prevent other users
 # seeing the query). only current user must be able to read the temp file
 # TODO: run `psql` with env vars to pass connection info:
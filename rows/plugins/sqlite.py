@@ -20,19 +20,30 @@ from __future__ import unicode_literals
 import datetime
 import sqlite3
 import string
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
 import six
 
 import rows.fields as fields
-from rows.fields import make_unique_name
-from rows.plugins.utils import create_table, ipartition, prepare_to_export
+from rows.fields import make_header, make_unique_name
+from rows.plugins.utils import (
+    create_table,
+    ipartition,
+    prepare_indexes,
+    prepare_to_export,
+)
 from rows.utils import Source
 
 SQL_TABLE_NAMES = 'SELECT name FROM sqlite_master WHERE type="table"'
 SQL_CREATE_TABLE = 'CREATE TABLE IF NOT EXISTS "{table_name}" ({field_types})'
 SQL_SELECT_ALL = 'SELECT * FROM "{table_name}"'
 SQL_INSERT = 'INSERT INTO "{table_name}" ({field_names}) VALUES ({placeholders})'
+SQL_CREATE_INDEX = (
+    'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({field_names})'
+)
 SQLITE_TYPES = {
     fields.BinaryField: "BLOB",
     fields.BoolField: "INTEGER",
@@ -45,17 +56,41 @@ SQLITE_TYPES = {
     fields.TextField: "TEXT",
 }
 DEFAULT_TYPE = "BLOB"
+# Settings used while loading data with `bulk=True` (restored afterwards)
+BULK_PRAGMAS = (
+    ("journal_mode", "MEMORY"),
+    ("synchronous", "OFF"),
+    ("cache_size", -262144),  # 256MiB
+    ("temp_store", "MEMORY"),
+)
+BULK_BATCH_SIZE = 10000
+# Field types for the declared column types, following SQLite's type affinity
+# rules (<https://www.sqlite.org/datatype3.html#determination_of_column_affinity>)
+# - columns with `NUMERIC` affinity (like `DATE` or `DECIMAL`) are not mapped
+# and `BLOB` columns (which may store any type of value) are detected.
+SQLITE_AFFINITY_TYPES = (
+    ("INT", fields.IntegerField),
+    ("CHAR", fields.TextField),
+    ("CLOB", fields.TextField),
+    ("TEXT", fields.TextField),
+    ("BLOB", None),
+    ("REAL", fields.FloatField),
+    ("FLOA", fields.FloatField),
+    ("DOUB", fields.FloatField),
+)
 
 
 def _python_to_sqlite(field_types):
+    native_types = (
+        fields.BinaryField,
+        fields.BoolField,
+        fields.FloatField,
+        fields.IntegerField,
+        fields.TextField,
+    )
+
     def convert_value(field_type, value):
-        if field_type in (
-            fields.BinaryField,
-            fields.BoolField,
-            fields.FloatField,
-            fields.IntegerField,
-            fields.TextField,
-        ):
+        if field_type in native_types:
             return value
 
         elif field_type in (fields.DateField, fields.DatetimeField):
@@ -74,11 +109,21 @@ def _python_to_sqlite(field_types):
         else:  # don't know this field
             return field_type.serialize(value)
 
+    # Values of native types are passed as is, so only the other ones are
+    # converted (if there's no other type, rows are not copied)
+    converters = [
+        (index, partial(convert_value, field_type))
+        for index, field_type in enumerate(field_types)
+        if field_type not in native_types
+    ]
+    if not converters:
+        return lambda row: row
+
     def convert_row(row):
-        return [
-            convert_value(field_type, value)
-            for field_type, value in zip(field_types, row)
-        ]
+        row = list(row)
+        for index, convert in converters:
+            row[index] = convert(row[index])
+        return row
 
     return convert_row
 
@@ -132,15 +177,72 @@ def _valid_table_name(name):
         return True
 
 
+def create_indexes(cursor, table_name, indexes):
+    """Create B-tree `indexes` (see `prepare_indexes`) and `ANALYZE` the table"""
+    for field_names in indexes:
+        cursor.execute(
+            SQL_CREATE_INDEX.format(
+                index_name="idx_{}_{}".format(table_name, "_".join(field_names)),
+                table_name=table_name,
+                field_names=", ".join('"{}"'.format(name) for name in field_names),
+            )
+        )
+    if indexes:
+        cursor.execute('ANALYZE "{}"'.format(table_name))
+
+
+def _declared_field_types(connection, table_name):
+    """Return the field types for the declared column types of `table_name`
+
+    Only columns whose declared type maps to a field type (see
+    `SQLITE_AFFINITY_TYPES`) are returned.
+    """
+    cursor = connection.cursor()
+    columns = list(cursor.execute('PRAGMA table_info("{}")'.format(table_name)))
+    cursor.close()
+    field_names = make_header([column[1] for column in columns])
+    result = {}
+    for field_name, column in zip(field_names, columns):
+        declared_type = (column[2] or "").upper()
+        for name, field_type in SQLITE_AFFINITY_TYPES:
+            if name in declared_type:
+                if field_type is not None:
+                    result[field_name] = field_type
+                break
+    return result
+
+
+def _iterate_cursor(cursor, batch_size):
+    """Yield all rows from `cursor` (`batch_size` at a time), then close it"""
+    try:
+        table_rows = cursor.fetchmany(batch_size)
+        while table_rows:
+            for row in table_rows:
+                yield row
+            table_rows = cursor.fetchmany(batch_size)
+    finally:
+        cursor.close()
+
+
 def import_from_sqlite(
     filename_or_connection,
     table_name="table1",
     query=None,
     query_args=None,
+    batch_size=1000,
+    declared_types=False,
     *args,
     **kwargs
 ):
-    """Return a rows.Table with data from SQLite database."""
+    """Return a rows.Table with data from SQLite database.
+
+    Rows are fetched from the cursor `batch_size` at a time and fed lazily
+    into `create_table` (use `lazy=True` and `samples` to import big tables
+    with constant memory usage). If `declared_types=True` (only when importing
+    a table), the field types are defined by the columns' declared types
+    instead of being detected (see `SQLITE_AFFINITY_TYPES` - note that dates
+    exported by `rows` are stored as `TEXT`); `force_types` takes precedence.
+    """
     source = get_source(filename_or_connection)
     connection = source.fobj
     cursor = connection.cursor()
@@ -150,17 +252,52 @@ def import_from_sqlite(
             raise ValueError("Invalid table name: {}".format(table_name))
 
         query = SQL_SELECT_ALL.format(table_name=table_name)
+        if declared_types:
+            force_types = _declared_field_types(connection, table_name)
+            force_types.update(kwargs.get("force_types") or {})
+            kwargs["force_types"] = force_types
 
     if query_args is None:
         query_args = tuple()
 
-    table_rows = list(cursor.execute(query, query_args))  # TODO: may be lazy
+    cursor.execute(query, query_args)
     header = [six.text_type(info[0]) for info in cursor.description]
-    cursor.close()
     # TODO: should close connection also?
 
     meta = {"imported_from": "sqlite", "source": source}
-    return create_table([header] + table_rows, meta=meta, *args, **kwargs)
+    return create_table(
+        chain([header], _iterate_cursor(cursor, batch_size)),
+        meta=meta,
+        *args,
+        **kwargs
+    )
+
+
+@contextmanager
+def bulk_load(connection):
+    """Set `BULK_PRAGMAS` in `connection` and run the block in one transaction
+
+    The transaction is committed (or rolled back, if an exception is raised)
+    and the previous pragma values are restored at the end.
+    """
+    connection.commit()  # `journal_mode` can't be changed inside transactions
+    cursor = connection.cursor()
+    previous = []
+    for name, value in BULK_PRAGMAS:
+        previous.append((name, cursor.execute("PRAGMA {}".format(name)).fetchone()[0]))
+        cursor.execute("PRAGMA {} = {}".format(name, value))
+    cursor.execute("BEGIN")
+    try:
+        yield connection
+    except Exception:
+        connection.rollback()
+        raise
+    else:
+        connection.commit()
+    finally:
+        for name, value in previous:
+            cursor.execute("PRAGMA {} = {}".format(name, value))
+        cursor.close()
 
 
 def export_to_sqlite(
@@ -168,12 +305,26 @@ def export_to_sqlite(
     filename_or_connection,
     table_name=None,
     table_name_format="table{index}",
-    batch_size=100,
+    batch_size=None,
     callback=None,
+    bulk=False,
+    indexes=None,
     *args,
     **kwargs
 ):
-    # TODO: should add transaction support?
+    """Export a `rows.Table` to a SQLite table (created if it does not exist)
+
+    If `bulk=True`, the data is loaded in one transaction, with larger batches
+    (`BULK_BATCH_SIZE` rows, if `batch_size` is not provided) and settings
+    optimized for loading (`BULK_PRAGMAS`: in-memory journal and no `fsync`
+    while loading - the previous settings are restored afterwards).
+
+    `indexes` (a list of field names or lists of field names, for composite
+    indexes) are created after all rows are inserted, then the table is
+    analyzed (`ANALYZE`).
+    """
+    if batch_size is None:
+        batch_size = BULK_BATCH_SIZE if bulk else 100
     prepared_table = prepare_to_export(table, *args, **kwargs)
     source = get_source(filename_or_connection)
     connection = source.fobj
@@ -193,6 +344,7 @@ def export_to_sqlite(
 
     field_names = next(prepared_table)
     field_types = list(map(table.fields.get, field_names))
+    indexes = prepare_indexes(indexes, field_names)
     columns = [
         "{} {}".format(field_name, SQLITE_TYPES.get(field_type, DEFAULT_TYPE))
         for field_name, field_type in zip(field_names, field_types)
@@ -208,17 +360,25 @@ def export_to_sqlite(
     )
     _convert_row = _python_to_sqlite(field_types)
 
-    if callback is None:
-        for batch in ipartition(prepared_table, batch_size):
-            cursor.executemany(insert_sql, map(_convert_row, batch))
-
+    def insert_rows():
+        if callback is None:
+            for batch in ipartition(prepared_table, batch_size):
+                cursor.executemany(insert_sql, map(_convert_row, batch))
+
+        else:
+            total_written = 0
+            for batch in ipartition(prepared_table, batch_size):
+                cursor.executemany(insert_sql, map(_convert_row, batch))
+                written = len(batch)
+                total_written += written
+                callback(written, total_written)
+
+    if bulk:
+        with bulk_load(connection):
+            insert_rows()
+            create_indexes(cursor, table_name, indexes)
     else:
-        total_written = 0
-        for batch in ipartition(prepared_table, batch_size):
-            cursor.executemany(insert_sql, map(_convert_row, batch))
-            written = len(batch)
-            total_written += written
-            callback(written, total_written)
-
-    connection.commit()
+        insert_rows()
+        create_indexes(cursor, table_name, indexes)
+        connection.commit()
     return connection
@@ -0,0 +1,256 @@
+# coding: utf-8
+
+# Copyright 2014-2022 Álvaro Justen <https://github.com/turicas/rows/>
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""SQLite virtual tables backed by CSV files (requires `apsw`)
+
+CSV files are exposed to SQLite without loading them: each query scans the
+file, parsing it with `rows.plugins.plugin_csv.csv_reader` and deserializing
+only the columns used by the query (using the schema detected by
+`CsvInspector`). When SQLite passes a `LIMIT` to the virtual table the scan
+stops as soon as the needed rows are read.
+
+Note that every scan reads the whole file, so joins between virtual tables
+may read the inner table once per row of the outer one.
+"""
+
+from __future__ import unicode_literals
+
+import os
+from itertools import chain
+
+import apsw
+import six
+
+from rows.fields import make_deserializer
+from rows.plugins.plugin_csv import CsvInspector, csv_reader
+from rows.plugins.sqlite import DEFAULT_TYPE, SQLITE_TYPES, _python_to_sqlite
+from rows.plugins.utils import create_table
+from rows.utils import open_compressed
+
+MODULE_NAME = "rows_csv"
+SQL_CREATE_VIRTUAL_TABLE = 'CREATE VIRTUAL TABLE "{table_name}" USING {module_name}'
+# Bits of `idxNum` telling `CsvCursor.Filter` which arguments it receives
+INDEX_LIMIT = 1
+INDEX_OFFSET = 2
+
+
+class CsvModule(object):
+    """apsw virtual table module for the CSV files added by `add_table`"""
+
+    def __init__(self):
+        self.tables = {}
+
+    def add_table(self, table_name, inspector):
+        self.tables[table_name] = inspector
+
+    def Create(self, connection, module_name, database_name, table_name, *args):
+        try:
+            inspector = self.tables[table_name]
+        except KeyError:
+            raise ValueError("Unknown CSV table: {}".format(table_name))
+        table = CsvTable(inspector)
+        return table.create_sql(table_name), table
+
+    Connect = Create
+
+
+class CsvTable(object):
+    def __init__(self, inspector):
+        self.inspector = inspector
+        self.field_types = list(inspector.schema.values())
+
+    def create_sql(self, table_name):
+        columns = ", ".join(
+            '"{}" {}'.format(field_name, SQLITE_TYPES.get(field_type, DEFAULT_TYPE))
+            for field_name, field_type in self.inspector.schema.items()
+        )
+        return 'CREATE TABLE "{}" ({})'.format(table_name, columns)
+
+    def BestIndexObject(self, index_info):
+        """Use `LIMIT`/`OFFSET`, if available (the scan order is not changed)
+
+        SQLite only offers these constraints when all the other ones can be
+        handled by the virtual table, so they're offered only for queries
+        which don't filter this table. They are not omitted (SQLite still
+        applies them to the rows returned).
+        """
+        limit_index = offset_index = None
+        for index in range(index_info.nConstraint):
+            if not index_info.get_aConstraint_usable(index):
+                continue
+            operation = index_info.get_aConstraint_op(index)
+            if operation == apsw.SQLITE_INDEX_CONSTRAINT_LIMIT:
+                limit_index = index
+            elif operation == apsw.SQLITE_INDEX_CONSTRAINT_OFFSET:
+                offset_index = index
+
+        index_number = 0
+        if limit_index is not None:
+            index_number |= INDEX_LIMIT
+            index_info.set_aConstraintUsage_argvIndex(limit_index, 1)
+            if offset_index is not None:
+                index_number |= INDEX_OFFSET
+                index_info.set_aConstraintUsage_argvIndex(offset_index, 2)
+        index_info.idxNum = index_number
+        index_info.estimatedCost = float(max(os.path.getsize(self.inspector.filename), 1))
+        return True
+
+    def Open(self):
+        return CsvCursor(self)
+
+    def Disconnect(self):
+        pass
+
+    Destroy = Disconnect
+
+
+class CsvCursor(object):
+    """Scan a CSV file, deserializing values only when SQLite asks for them"""
+
+    def __init__(self, table):
+        self.table = table
+        self.fobj = self.reader = self.row = None
+        self.rowid = 0
+        self.stop_at = None
+        self.converters = {}
+
+    def _converter(self, column):
+        """Return a function to convert the CSV value of `column` to SQLite"""
+        field_type = self.table.field_types[column]
+        deserialize = make_deserializer(field_type)
+        to_sqlite = _python_to_sqlite([field_type])
+        converter = lambda value: to_sqlite([deserialize(value)])[0]
+        self.converters[column] = converter
+        return converter
+
+    def Filter(self, index_number, index_name, arguments):
+        self.Close()
+        inspector = self.table.inspector
+        self.stop_at = None
+        if index_number & INDEX_LIMIT and arguments[0] >= 0:
+            self.stop_at = arguments[0]
+            if index_number & INDEX_OFFSET and arguments[1] > 0:
+                self.stop_at += arguments[1]
+        self.fobj = open_compressed(inspector.filename, mode="rb")
+        self.reader = csv_reader(self.fobj, inspector.encoding, inspector.dialect)
+        next(self.reader, None)  # Skip header
+        self.rowid = 0
+        self.Next()
+
+    def Eof(self):
+        return self.row is None
+
+    def Rowid(self):
+        return self.rowid
+
+    def Column(self, column):
+        if column == -1:
+            return self.rowid
+        try:
+            value = self.row[column]
+        except IndexError:  # Row with less columns than the header
+            return None
+        converter = self.converters.get(column) or self._converter(column)
+        return converter(value)
+
+    def Next(self):
+        if self.stop_at is not None and self.rowid >= self.stop_at:
+            self.row = None
+            return
+        self.row = next(self.reader, None)
+        self.rowid += 1
+
+    def Close(self):
+        if self.fobj is not None:
+            self.reader.close()
+            self.fobj.close()
+            self.fobj = self.reader = self.row = None
+
+
+def create_connection(filenames, encoding=None, samples=5000, connection=None):
+    """Return an apsw connection with a virtual table for each CSV file
+
+    Tables are named `table1`, `table2` etc., in the order of `filenames`.
+    `encoding` (detected if `None`) is used for all files and `samples` is the
+    maximum number of rows used to detect each file's schema.
+    """
+    if connection is None:
+        connection = apsw.Connection(":memory:")
+    module = CsvModule()
+    connection.createmodule(MODULE_NAME, module, use_bestindex_object=True)
+    cursor = connection.cursor()
+    for index, filename in enumerate(filenames, start=1):
+        table_name = "table{}".format(index)
+        module.add_table(
+            table_name,
+            CsvInspector(filename, encoding=encoding, max_samples=samples),
+        )
+        cursor.execute(
+            SQL_CREATE_VIRTUAL_TABLE.format(
+                table_name=table_name, module_name=MODULE_NAME
+            )
+        )
+    return connection
+
+
+def _close(connection, cursor):
+    """Close `cursor` and `connection` (and the CSV files opened by cursors)"""
+    cursor.close()
+    connection.close()
+
+
+def _fetch_rows(connection, cursor):
+    """Yield the rows from `cursor`, then close it and `connection`"""
+    try:
+        for row in cursor:
+            yield row
+    finally:
+        _close(connection, cursor)
+
+
+def query_csv(query, filenames, encoding=None, samples=5000, *args, **kwargs):
+    """Run `query` on CSV files (without loading them) and return a rows.Table
+
+    Files are available as `table1`, `table2` etc. (see `create_connection`).
+    The result is fetched from the cursor while the table is created (use
+    `lazy=True` to iterate over it with constant memory usage); the
+    connection is closed after the last row is fetched.
+    """
+    connection = create_connection(filenames, encoding=encoding, samples=samples)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query)
+        try:
+            header = [six.text_type(info[0]) for info in cursor.getdescription()]
+        except apsw.ExecutionCompleteError:  # Query has no result rows
+            header = []
+    except Exception:
+        _close(connection, cursor)
+        raise
+
+    meta = {"imported_from": "sqlite_vtable", "filenames": list(filenames)}
+    try:
+        return create_table(
+            chain([header], _fetch_rows(connection, cursor)),
+            meta=meta,
+            samples=samples,
+            *args,
+            **kwargs
+        )
+    except Exception:  # The rows may not have been fetched
+        _close(connection, cursor)
+        raise
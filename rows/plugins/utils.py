@@ -27,7 +27,7 @@ import six
 # 'slug' and 'make_unique_name' are required here to maintain backwards compatibility
 from rows.fields import get_items  # NOQA
 from rows.fields import TextField, detect_types, make_header
-from rows.table import FlexibleTable, Table
+from rows.table import ColumnarTable, FlexibleTable, Table
 
 if six.PY2:
     from collections import Iterator
@@ -63,6 +63,8 @@ def create_table(
     samples=None,
     force_types=None,
     max_rows=None,
+    lazy=False,
+    columnar=False,
     *args,
     **kwargs
 ):
@@ -75,6 +77,56 @@ def create_table(
     - `import_fields` can be used either if `fields` is set or not, the
       resulting fields will seek its order
     - `fields` must always be in the same order as the data
+    - if `lazy=True` the rows won't be stored in memory: the returned table
+      wraps the data iterator and can be consumed only once (like when
+      exporting it). Use it with `samples` or `fields`, so only the first rows
+      are read to detect the field types.
+    - if `columnar=True` the returned table will be a `rows.ColumnarTable`
+      (data stored by column, in typed containers)
+    """
+
+    if lazy and columnar:
+        raise ValueError("`lazy` and `columnar` cannot be used together")
+    table_rows, header, fields = _define_fields(
+        data,
+        fields=fields,
+        skip_header=skip_header,
+        import_fields=import_fields,
+        samples=samples,
+        force_types=force_types,
+        max_rows=max_rows,
+        *args,
+        **kwargs
+    )
+
+    get_row = get_items(*map(header.index, fields))
+    table = (ColumnarTable if columnar else Table)(fields=fields, meta=meta)
+    if max_rows is not None and max_rows > 0:
+        table_rows = islice(table_rows, max_rows)
+    # The deserializer is created once, so values are converted directly
+    # (without creating a `dict` for each row)
+    deserialize_row = table._row_deserializer()
+    table_rows = (deserialize_row(get_row(row)) for row in table_rows)
+    return _fill_table(table, table_rows, lazy=lazy)
+
+
+def _define_fields(
+    data,
+    fields=None,
+    skip_header=True,
+    import_fields=None,
+    samples=None,
+    force_types=None,
+    max_rows=None,
+    *args,
+    **kwargs
+):
+    """Read the header (and samples, if needed) from `data` and define fields
+
+    Return `(table_rows, header, fields)`, where `table_rows` is an iterator
+    of the remaining rows, `header` has the names of all columns in `data`
+    (same order) and `fields` is an `OrderedDict` with only the fields to be
+    imported (in `import_fields` order).
     """
 
     table_rows = iter(data)
@@ -154,27 +206,43 @@ def create_table(
     fields = OrderedDict(
         [(field_name, fields[field_name]) for field_name in import_fields]
     )
+    return table_rows, header, fields
 
-    get_row = get_items(*map(header.index, import_fields))
-    table = Table(fields=fields, meta=meta)
-    if max_rows is not None and max_rows > 0:
-        table_rows = islice(table_rows, max_rows)
-    table.extend(dict(zip(import_fields, get_row(row))) for row in table_rows)
+
+def _fill_table(table, table_rows, lazy=False):
+    """Put `table_rows` (already deserialized) into `table` and close its source"""
 
     source = table.meta.get("source", None)
+    if lazy:
+        # The source can only be closed after the last row is consumed
+        table._rows = _lazy_rows(table_rows, source)
+    else:
+        table._extend_rows(table_rows)
+        _close_source(source)
+
+    return table
+
+
+def _close_source(source):
     if source is not None:
         if source.should_close:
             source.fobj.close()
         if source.should_delete and Path(source.uri).exists():
             unlink(source.uri)
 
-    return table
+
+def _lazy_rows(data, source):
+    try:
+        for row in data:
+            yield row
+    finally:
+        _close_source(source)
 
 
 def prepare_to_export(table, export_fields=None, *args, **kwargs):
     # TODO: optimize for more used cases (export_fields=None)
     table_type = type(table)
-    if table_type not in (FlexibleTable, Table):
+    if table_type not in (ColumnarTable, FlexibleTable, Table):
         raise ValueError("Table type not recognized")
 
     if export_fields is None:
@@ -196,11 +264,38 @@ def prepare_to_export(table, export_fields=None, *args, **kwargs):
         field_indexes = list(map(table_field_names.index, export_fields))
         for row in table._rows:
             yield [row[field_index] for field_index in field_indexes]
+    elif table_type is ColumnarTable:
+        columns = [
+            table._columns[table_field_names.index(field_name)]
+            for field_name in export_fields
+        ]
+        for row in zip(*columns):
+            yield list(row)
     elif table_type is FlexibleTable:
         for row in table._rows:
             yield [row[field_name] for field_name in export_fields]
 
 
+def prepare_indexes(indexes, field_names):
+    """Return a list with the (slugged) field names of each index
+
+    Each item in `indexes` is a field name (or a comma-separated list of field
+    names) or a list of field names (for composite indexes). All the fields
+    must be in `field_names`.
+    """
+    result = []
+    for index in indexes or []:
+        if isinstance(index, (six.binary_type, six.text_type)):
+            index = index.split(",")
+        index = make_header([field_name.strip() for field_name in index])
+        diff = set(index) - set(field_names)
+        if diff:
+            names = ", ".join('"{}"'.format(field) for field in sorted(diff))
+            raise ValueError("Invalid field names: {}".format(names))
+        result.append(index)
+    return result
+
+
 def serialize(table, *args, **kwargs):
     prepared_table = prepare_to_export(table, *args, **kwargs)
 
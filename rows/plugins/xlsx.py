@@ -22,10 +22,11 @@ from io import BytesIO, UnsupportedOperation
 from numbers import Number
 
 from openpyxl import Workbook, load_workbook
-from openpyxl.cell.read_only import EmptyCell
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.cell.read_only import EmptyCell, ReadOnlyCell
 
 from rows import fields
-from rows.plugins.utils import create_table, prepare_to_export
+from rows.plugins.utils import create_table, make_header, prepare_to_export
 from rows.utils import Source
 
 
@@ -55,6 +56,132 @@ def _cell_to_python(cell):
         return value
 
 
+def _cell_converter(number_format):
+    """Return a function to convert cells with `number_format` (non-empty)
+
+    The result is the same as `_cell_to_python`, but the number format is
+    checked only once.
+    """
+    if number_format.lower() == "yyyy-mm-dd":
+        convert = lambda value: str(value).split(" 00:00:00")[0]
+    elif number_format.lower() == "yyyy-mm-dd hh:mm:ss":
+        convert = lambda value: str(value).split(".")[0]
+    elif number_format.endswith("%"):
+        convert = lambda value: (
+            "{:%}".format(Decimal(str(value)))
+            if isinstance(value, Number)
+            else ("" if value is None else value)
+        )
+    else:
+        convert = lambda value: "" if value is None else value
+
+    def convert_cell(cell):
+        value = cell.value
+        if cell.data_type == "f" and value == "=TRUE()":
+            return True
+        elif cell.data_type == "f" and value == "=FALSE()":
+            return False
+        return convert(value)
+
+    return convert_cell
+
+
+def _row_converter(column_count):
+    """Return a function to convert a row of cells to Python objects
+
+    Cell converters are cached per column and cell style (or number format,
+    if the workbook is not read-only), so cells with the same style are not
+    inspected again.
+    """
+    caches = [{} for _ in range(column_count)]
+
+    def convert_row(cells):
+        if len(cells) > len(caches):  # Rows may have different sizes
+            caches.extend({} for _ in range(len(cells) - len(caches)))
+        row = []
+        for cell, cache in zip(cells, caches):
+            if type(cell) is EmptyCell:
+                row.append(None)
+                continue
+            key = cell._style_id if type(cell) is ReadOnlyCell else cell.number_format
+            convert = cache.get(key)
+            if convert is None:
+                convert = cache[key] = _cell_converter(cell.number_format)
+            row.append(convert(cell))
+        return row
+
+    return convert_row
+
+
+def _iterate_sheet(
+    sheet, start_row, end_row, start_column, end_column, fobj, kwargs
+):
+    """Yield the non-empty rows of `sheet` (lists of Python objects)
+
+    The workbook and `fobj` are closed after the last row is read. The first
+    non-empty row is the header. If `import_fields` is set (and
+    `fields` isn't), only the cells of the selected columns are converted
+    (rows are still skipped only when all their cells are empty) - the header
+    yielded has only the selected fields.
+    """
+    is_empty = lambda row: all(value is None for value in row)
+    min_row = start_row + 1 if start_row is not None else None
+    max_row = end_row + 1 if end_row is not None else None
+    min_col = start_column + 1 if start_column is not None else None
+    max_col = end_column + 1 if end_column is not None else None
+    try:
+        header = header_row_number = None
+        for row_number, row in enumerate(
+            sheet.iter_rows(
+                min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col
+            ),
+            start=min_row or 1,
+        ):
+            header = _row_converter(len(row))(row)
+            if not is_empty(header):
+                header_row_number = row_number
+                break
+        if header_row_number is None:
+            return
+
+        indexes = None
+        import_fields = kwargs.get("import_fields")
+        if import_fields is not None and kwargs.get("fields") is None:
+            field_names = make_header(header)
+            import_fields = set(make_header(import_fields))
+            invalid = import_fields - set(field_names)
+            if invalid:
+                field_names = ", ".join('"{}"'.format(field) for field in invalid)
+                raise ValueError("Invalid field names: {}".format(field_names))
+            indexes = [
+                index
+                for index, field_name in enumerate(field_names)
+                if field_name in import_fields
+            ]
+            header = [field_names[index] for index in indexes]
+        yield header
+
+        convert_row = None
+        for row in sheet.iter_rows(
+            min_row=header_row_number + 1,
+            max_row=max_row,
+            min_col=min_col,
+            max_col=max_col,
+        ):
+            if indexes is not None:
+                if all(type(cell) is EmptyCell for cell in row):
+                    continue
+                row = [row[index] for index in indexes]
+            if convert_row is None:
+                convert_row = _row_converter(len(row))
+            row = convert_row(row)
+            if indexes is not None or not is_empty(row):
+                yield row
+    finally:
+        sheet.parent.close()
+        fobj.close()
+
+
 def sheet_names(filename_or_fobj, workbook_kwargs=None):
     # TODO: setup/teardown must be methods of a class so we can reuse them
     workbook_kwargs = workbook_kwargs or {}
@@ -81,7 +208,10 @@ def import_from_xlsx(
 ):
     """Return a rows.Table created from imported XLSX file.
 
-    workbook_kwargs will be passed to openpyxl.load_workbook
+    workbook_kwargs will be passed to openpyxl.load_workbook. The rows are
+    read lazily (use `lazy=True` to import big sheets with constant memory
+    usage) and, if `import_fields` is set, only the selected columns are
+    converted.
     """
 
     workbook_kwargs = workbook_kwargs or {}
@@ -106,22 +236,11 @@ def import_from_xlsx(
     end_row = end_row if end_row is not None else max_row
     start_column = start_column if start_column is not None else min_column
     end_column = end_column if end_column is not None else max_column
-    table_rows = []
-    is_empty = lambda row: all(cell is None for cell in row)
-    selected_rows = sheet.iter_rows(
-        min_row=start_row + 1 if start_row is not None else None,
-        max_row=end_row + 1 if end_row is not None else None,
-        min_col=start_column + 1 if start_column is not None else None,
-        max_col=end_column + 1 if end_column is not None else None,
-    )
-    for row in selected_rows:
-        row = [_cell_to_python(cell) for cell in row]
-        if not is_empty(row):
-            table_rows.append(row)
-
-    source = Source.from_file(filename_or_fobj, plugin_name="xlsx")
-    source.fobj.close()
     # TODO: pass a parameter to Source.from_file so it won't open the file
+    source = Source.from_file(filename_or_fobj, plugin_name="xlsx")
+    table_rows = _iterate_sheet(
+        sheet, start_row, end_row, start_column, end_column, source.fobj, kwargs
+    )
     metadata = {"imported_from": "xlsx", "source": source, "name": sheet_name}
     return create_table(table_rows, meta=metadata, *args, **kwargs)
 
@@ -162,6 +281,47 @@ def _python_to_cell(field_types):
     return convert_row
 
 
+def _write_only_row_converter(sheet, field_types):
+    """Return a function to convert a row into values for `sheet.append`
+
+    Values which need a number format are wrapped in cells and all cells of a
+    column share the same style (created once), so no style lookup is done
+    per cell.
+    """
+    serializers, styles = [], []
+    for index, field_type in enumerate(field_types):
+        if field_type not in (
+            fields.BoolField,
+            fields.DateField,
+            fields.DatetimeField,
+            fields.DecimalField,
+            fields.FloatField,
+            fields.IntegerField,
+            fields.PercentField,
+            fields.TextField,
+        ):
+            # BinaryField, JSONField or unknown
+            serializers.append((index, field_type.serialize))
+        number_format = FORMATTING_STYLES.get(field_type, None)
+        if number_format is not None:
+            cell = WriteOnlyCell(sheet)
+            cell.number_format = number_format
+            styles.append((index, cell._style))
+
+    def convert_row(row):
+        row = list(row)
+        for index, serialize in serializers:
+            row[index] = serialize(row[index])
+        for index, style in styles:
+            if row[index] is not None:
+                row[index] = Cell(
+                    sheet, row=1, column=1, value=row[index], style_array=style
+                )
+        return row
+
+    return convert_row
+
+
 def define_sheet_name(existing_names):
     for counter in range(1, 1024 * 1024):
         new_name = f"Sheet{counter}"
@@ -189,7 +349,12 @@ def is_existing_spreadsheet(source):
 
 
 def export_to_xlsx(table, filename_or_fobj=None, sheet_name=None, *args, **kwargs):
-    """Export the rows.Table to XLSX file and return the saved file."""
+    """Export the rows.Table to XLSX file and return the saved file.
+
+    If the file is an existing spreadsheet, a new sheet is added to it.
+    Otherwise a write-only workbook is used: rows are streamed to the sheet
+    (memory usage doesn't grow with the number of cells).
+    """
 
     return_result = False
     if filename_or_fobj is None:
@@ -197,33 +362,37 @@ def export_to_xlsx(table, filename_or_fobj=None, sheet_name=None, *args, **kwarg
         return_result = True
     source = Source.from_file(filename_or_fobj, mode="a+b", plugin_name="xlsx")
 
+    prepared_table = prepare_to_export(table, *args, **kwargs)
+    field_names = next(prepared_table)
+    field_types = list(map(table.fields.get, field_names))
+
     if is_existing_spreadsheet(source):
         workbook = load_workbook(filename_or_fobj)
         if sheet_name is None:
             sheet_name = define_sheet_name(workbook.sheetnames)
         sheet = workbook.create_sheet(title=sheet_name)
-    else:
-        sheet_name = sheet_name or "Sheet1"
-        workbook = Workbook()
-        sheet = workbook.active
-        sheet.title = sheet_name
 
-    prepared_table = prepare_to_export(table, *args, **kwargs)
+        # Write header
+        for col_index, field_name in enumerate(field_names):
+            cell = sheet.cell(row=1, column=col_index + 1)
+            cell.value = field_name
 
-    # Write header
-    field_names = next(prepared_table)
-    for col_index, field_name in enumerate(field_names):
-        cell = sheet.cell(row=1, column=col_index + 1)
-        cell.value = field_name
-
-    # Write sheet rows
-    _convert_row = _python_to_cell(list(map(table.fields.get, field_names)))
-    for row_index, row in enumerate(prepared_table, start=1):
-        for col_index, (value, number_format) in enumerate(_convert_row(row)):
-            cell = sheet.cell(row=row_index + 1, column=col_index + 1)
-            cell.value = value
-            if number_format is not None:
-                cell.number_format = number_format
+        # Write sheet rows
+        _convert_row = _python_to_cell(field_types)
+        for row_index, row in enumerate(prepared_table, start=1):
+            for col_index, (value, number_format) in enumerate(_convert_row(row)):
+                cell = sheet.cell(row=row_index + 1, column=col_index + 1)
+                cell.value = value
+                if number_format is not None:
+                    cell.number_format = number_format
+
+    else:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=sheet_name or "Sheet1")
+        sheet.append(list(field_names))
+        _convert_row = _write_only_row_converter(sheet, field_types)
+        for row in prepared_table:
+            sheet.append(_convert_row(row))
 
     source.fobj.seek(0)
     if source.uri is not None:
@@ -17,17 +17,20 @@
 
 from __future__ import unicode_literals
 
+import binascii
 import os
+from array import array
 from collections import OrderedDict, namedtuple
+from itertools import chain
 from operator import itemgetter
 from pathlib import Path
 
 import six
 
 if six.PY2:
-    from collections import MutableSequence, Sized
+    from collections import MutableSequence, Sequence, Sized
 elif six.PY3:
-    from collections.abc import MutableSequence, Sized
+    from collections.abc import MutableSequence, Sequence, Sized
 
 
 class Table(MutableSequence):
@@ -47,6 +50,7 @@ class Table(MutableSequence):
         # TODO: should be able to customize row return type (namedtuple, dict
         #       etc.)
         self.Row = namedtuple("Row", self.field_names)
+        self._deserializer = self._deserializer_row = None
         self._rows = []
         self.meta = dict(meta) if meta is not None else {}
 
@@ -135,8 +139,12 @@ class Table(MutableSequence):
 
         return "table1"
 
+    def _is_lazy(self):
+        """Return `True` if rows are an iterator (`create_table(lazy=True)`)"""
+        return not isinstance(self._rows, Sized)
+
     def __repr__(self):
-        length = len(self._rows) if isinstance(self._rows, Sized) else "?"
+        length = "?" if self._is_lazy() else len(self._rows)
 
         imported = ""
         if "imported_from" in self.meta:
@@ -146,12 +154,36 @@ class Table(MutableSequence):
             imported, len(self.fields), length
         )
 
+    def _row_deserializer(self):
+        """Return a function which converts a sequence of values (in the same
+        order as `fields`) into a row
+
+        The function is created once per schema: `self.Row` is recreated
+        every time the fields change, so it's used to invalidate the cache.
+        """
+        if self._deserializer_row is not self.Row:
+            from rows.fields import make_deserializer
+
+            deserializers = tuple(map(make_deserializer, self.field_types))
+
+            def deserialize_row(values):
+                return [
+                    convert(value) for convert, value in zip(deserializers, values)
+                ]
+
+            self._deserializer, self._deserializer_row = deserialize_row, self.Row
+        return self._deserializer
+
     def _make_row(self, row):
         # TODO: should be able to customize row type (namedtuple, dict etc.)
-        return [
-            field_type.deserialize(row.get(field_name, None))
-            for field_name, field_type in self.fields.items()
-        ]
+        get = row.get
+        values = [get(field_name, None) for field_name in self.fields]
+        return self._row_deserializer()(values)
+
+    def _extend_rows(self, rows):
+        """Add already deserialized rows (lists in the same order as `fields`)"""
+
+        self._rows.extend(rows)
 
     def append(self, row):
         """Add a row to the table. Should be a dict"""
@@ -161,6 +193,13 @@ class Table(MutableSequence):
     def __len__(self):
         return len(self._rows)
 
+    def __iter__(self):
+        # Iterate directly over `_rows` so lazy tables (where `_rows` is an
+        # iterator) also work
+        Row = self.Row
+        for row in self._rows:
+            yield Row(*row)
+
     def __getitem__(self, key):
         key_type = type(key)
         if key_type == int:
@@ -249,6 +288,102 @@ class Table(MutableSequence):
             table._rows = self._rows + other._rows
             return table
 
+    def _row_values(self):
+        """Iterate over rows as lists of values (in the same order as `fields`)"""
+        return iter(self._rows)
+
+    def _check_not_lazy(self):
+        if self._is_lazy():
+            raise ValueError(
+                "Columns can't be created from lazy tables (rows can be read "
+                "only once) - import with `columnar=True` instead"
+            )
+
+    def _column(self, field_name):
+        """Return a column container (see `make_column`) with a field's values"""
+        field_index = self.field_names.index(field_name)
+        values = [row[field_index] for row in self._row_values()]
+        try:
+            return make_column(self.fields[field_name], values)
+        except OverflowError:  # Value doesn't fit the typed container
+            return Column(values)
+
+    def columns(self):
+        """Return an `OrderedDict` with the column container of each field
+
+        Values are stored in typed containers (see `make_column`), filled in
+        one pass over the rows. Raises `ValueError` for lazy tables.
+        """
+        self._check_not_lazy()
+        table = ColumnarTable(fields=self.fields)
+        table._rows = self._row_values()
+        return table.columns()
+
+    def to_numpy(self, field_name):
+        """Return a `numpy` array with the values of `field_name`
+
+        The dtype is defined by the field type (integers, floats, booleans,
+        dates and datetimes are typed; other values are Python objects) and
+        null values are masked (`numpy.ma.MaskedArray`). Requires `numpy`;
+        raises `ValueError` for lazy tables.
+        """
+        from rows.utils.arrow import column_to_numpy
+
+        if field_name not in self.fields:
+            raise KeyError(field_name)
+        self._check_not_lazy()
+        # Columns of a `ColumnarTable` are copied, so the table can still grow
+        return column_to_numpy(
+            self.fields[field_name],
+            self._column(field_name),
+            copy=isinstance(self, ColumnarTable),
+        )
+
+    def to_arrow(self):
+        """Return a `pyarrow.Table` with this table's data (requires `pyarrow`)
+
+        Integer, float, boolean and text columns are converted using their
+        typed buffers (see `columns`) - no Python object is created per value
+        for a `ColumnarTable` - and null values are stored in the validity
+        bitmaps. Raises `ValueError` for lazy tables.
+        """
+        from rows.utils.arrow import _require, column_to_arrow, pyarrow
+
+        _require(pyarrow, "pyarrow")
+        # Columns of a `ColumnarTable` are copied, so the table can still grow
+        copy = isinstance(self, ColumnarTable)
+        columns = self.columns()
+        return pyarrow.table(
+            [
+                column_to_arrow(self.fields[field_name], column, copy=copy)
+                for field_name, column in columns.items()
+            ],
+            names=list(columns.keys()),
+        )
+
+    @classmethod
+    def from_arrow(cls, arrow_table, meta=None):
+        """Return a `rows.ColumnarTable` with the data from a `pyarrow.Table`
+
+        The field types are defined by the Arrow types (no detection is
+        needed) and integer, float, boolean and text columns are copied from
+        the Arrow buffers, without creating a Python object per value.
+        """
+        from rows.utils.arrow import arrow_to_field_type, column_from_arrow
+
+        table = ColumnarTable(
+            fields=[
+                (field.name, arrow_to_field_type(field.type))
+                for field in arrow_table.schema
+            ],
+            meta=meta,
+        )
+        table._columns = [
+            column_from_arrow(field_type, arrow_table.column(index))
+            for index, field_type in enumerate(table.field_types)
+        ]
+        return table
+
     def order_by(self, key):
         # TODO: implement locale
         # TODO: implement for more than one key
@@ -271,6 +406,16 @@ class FlexibleTable(Table):
             fields = {}
         super(FlexibleTable, self).__init__(fields, meta)
 
+    def __iter__(self):
+        for row in self._rows:
+            yield self.Row(**row)
+
+    def _row_values(self):
+        # Rows created before a field was added don't have its key
+        field_names = self.field_names
+        for row in self._rows:
+            yield [row.get(field_name, None) for field_name in field_names]
+
     def __getitem__(self, key):
         if isinstance(key, int):
             return self.Row(**self._rows[key])
@@ -305,3 +450,456 @@ class FlexibleTable(Table):
         """Add a row to the table. Should be a dict"""
 
         self._rows.append(self._make_row(row))
+
+
+class ValidityBitmap(object):
+    """Bitmap which stores if each value in a column is not null
+
+    Bit `i` is set if the value at index `i` is not null. Bits are stored in
+    least-significant bit order (the same layout used by Apache Arrow).
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        return bool(self.data[index >> 3] & (1 << (index & 7)))
+
+    def __setitem__(self, index, valid):
+        if valid:
+            self.data[index >> 3] |= 1 << (index & 7)
+        else:
+            self.data[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def append(self, valid):
+        index = self._length
+        if index & 7 == 0:
+            self.data.append(0)
+        if valid:
+            self.data[index >> 3] |= 1 << (index & 7)
+        self._length += 1
+
+    def _to_int(self):
+        # Same as `int.from_bytes(self.data, "little")` (not available on
+        # Python 2)
+        data = bytes(bytearray(reversed(self.data)))
+        return int(binascii.hexlify(data), 16) if data else 0
+
+    def _from_int(self, value, length):
+        self._length = length
+        size = (length + 7) // 8
+        hex_value = "{:x}".format(value).zfill(size * 2)
+        self.data = bytearray(reversed(bytearray(binascii.unhexlify(hex_value))))
+
+    def insert(self, index, valid):
+        value = self._to_int()
+        low, high = value & ((1 << index) - 1), value >> index
+        value = low | (int(bool(valid)) << index) | (high << (index + 1))
+        self._from_int(value, self._length + 1)
+
+    def __delitem__(self, index):
+        value = self._to_int()
+        low, high = value & ((1 << index) - 1), value >> (index + 1)
+        self._from_int(low | (high << index), self._length - 1)
+
+    @property
+    def null_count(self):
+        return self._length - bin(self._to_int()).count("1")
+
+
+class Column(MutableSequence):
+    """Column of values stored in a Python list (used for any field type)
+
+    Subclasses store the values in typed containers and must implement `_get`,
+    `_set`, `_insert`, `_delete` and `append`.
+    """
+
+    def __init__(self, values=()):
+        self.data = []
+        for value in values:
+            self.append(value)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return "<rows.{} {} values>".format(type(self).__name__, len(self))
+
+    def _index(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("Column index out of range")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+        return self._get(self._index(index))
+
+    def __setitem__(self, index, value):
+        self._set(self._index(index), value)
+
+    def __delitem__(self, index):
+        self._delete(self._index(index))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._get(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, (Column, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def insert(self, index, value):
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        self._insert(min(index, length), value)
+
+    def take(self, indexes):
+        """Return a new column with the values in the `indexes` positions"""
+        column = type(self)()
+        for index in indexes:
+            column.append(self._get(index))
+        return column
+
+    def _get(self, index):
+        return self.data[index]
+
+    def _set(self, index, value):
+        self.data[index] = value
+
+    def _insert(self, index, value):
+        self.data.insert(index, value)
+
+    def _delete(self, index):
+        del self.data[index]
+
+    def append(self, value):
+        self.data.append(value)
+
+
+class ArrayColumn(Column):
+    """Column of numbers stored in an `array.array` plus a validity bitmap
+
+    Null values are stored as `null_value` in `data` and unset in `validity`.
+    """
+
+    typecode = None
+    null_value = 0
+
+    def __init__(self, values=()):
+        self.data = array(self.typecode)
+        self.validity = ValidityBitmap()
+        for value in values:
+            self.append(value)
+
+    @property
+    def values(self):
+        """Zero-copy view of the underlying buffer (nulls as `null_value`)"""
+        return memoryview(self.data)
+
+    @property
+    def null_count(self):
+        return self.validity.null_count
+
+    def __iter__(self):
+        if self.validity.null_count == 0:
+            return iter(self.data)
+        validity = map(self.validity.__getitem__, range(len(self)))
+        return (
+            value if valid else None for value, valid in zip(self.data, validity)
+        )
+
+    def _get(self, index):
+        return self.data[index] if self.validity[index] else None
+
+    def _set(self, index, value):
+        self.data[index] = self.null_value if value is None else value
+        self.validity[index] = value is not None
+
+    def _insert(self, index, value):
+        self.data.insert(index, self.null_value if value is None else value)
+        self.validity.insert(index, value is not None)
+
+    def _delete(self, index):
+        del self.data[index]
+        del self.validity[index]
+
+    def append(self, value):
+        self.data.append(self.null_value if value is None else value)
+        self.validity.append(value is not None)
+
+
+class IntegerColumn(ArrayColumn):
+    typecode = "q"
+
+
+class FloatColumn(ArrayColumn):
+    typecode = "d"
+    null_value = 0.0
+
+
+class BoolColumn(ArrayColumn):
+    typecode = "b"
+
+    def __iter__(self):
+        values = super(BoolColumn, self).__iter__()
+        return (None if value is None else bool(value) for value in values)
+
+    def _get(self, index):
+        return bool(self.data[index]) if self.validity[index] else None
+
+
+class TextColumn(Column):
+    """Column of strings stored as UTF-8 bytes in a single buffer
+
+    The value at index `i` is `data[offsets[i]:offsets[i + 1]]`.
+    """
+
+    def __init__(self, values=()):
+        self.data = bytearray()
+        self.offsets = array("q", [0])
+        self.validity = ValidityBitmap()
+        for value in values:
+            self.append(value)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def null_count(self):
+        return self.validity.null_count
+
+    def _encode(self, value):
+        return b"" if value is None else value.encode("utf-8", "surrogatepass")
+
+    def _shift_offsets(self, start, difference):
+        if difference:
+            offsets = self.offsets
+            for index in range(start, len(offsets)):
+                offsets[index] += difference
+
+    def _get(self, index):
+        if not self.validity[index]:
+            return None
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:end].decode("utf-8", "surrogatepass")
+
+    def _set(self, index, value):
+        encoded = self._encode(value)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        self.data[start:end] = encoded
+        self._shift_offsets(index + 1, len(encoded) - (end - start))
+        self.validity[index] = value is not None
+
+    def _insert(self, index, value):
+        encoded = self._encode(value)
+        start = self.offsets[index]
+        self.data[start:start] = encoded
+        self.offsets.insert(index + 1, start)
+        self._shift_offsets(index + 1, len(encoded))
+        self.validity.insert(index, value is not None)
+
+    def _delete(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        del self.data[start:end]
+        del self.offsets[index + 1]
+        self._shift_offsets(index + 1, start - end)
+        del self.validity[index]
+
+    def append(self, value):
+        self.data += self._encode(value)
+        self.offsets.append(len(self.data))
+        self.validity.append(value is not None)
+
+
+def make_column(field_type, values=()):
+    """Create the column container to store values of `field_type`"""
+    from rows import fields
+
+    column_class = {
+        fields.BoolField: BoolColumn,
+        fields.FloatField: FloatColumn,
+        fields.IntegerField: IntegerColumn,
+        fields.TextField: TextColumn,
+    }.get(field_type, Column)
+    return column_class(values)
+
+
+class _ColumnarRows(Sequence):
+    """Row-oriented (read-only) view of a `ColumnarTable`"""
+
+    def __init__(self, table):
+        self._columns = table._columns
+
+    def __len__(self):
+        return len(self._columns[0]) if self._columns else 0
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[index] for index in range(*key.indices(len(self)))]
+        return [column[key] for column in self._columns]
+
+    def __iter__(self):
+        return map(list, zip(*self._columns))
+
+
+class ColumnarTable(Table):
+    """`rows.Table` which stores each field in a typed column container
+
+    Integer, float and boolean columns are stored in `array.array` objects
+    (plus a validity bitmap) and text columns in a single UTF-8 buffer, so
+    memory usage is closer to the raw data size. Column access
+    (`table["field_name"]`) returns the column container itself (no copy).
+    """
+
+    @property
+    def _rows(self):
+        return _ColumnarRows(self)
+
+    @_rows.setter
+    def _rows(self, data):
+        self._columns = [make_column(field_type) for field_type in self.field_types]
+        for row in data:
+            self._append_values(row)
+
+    def _append_values(self, values):
+        for index, value in enumerate(values):
+            self._update_column(index, "append", value)
+
+    def _update_column(self, index, method, *args):
+        """Call `method` of a column, converting it to a generic `Column` if
+        a value doesn't fit its typed container"""
+        try:
+            getattr(self._columns[index], method)(*args)
+        except OverflowError:  # Value doesn't fit the typed container
+            self._columns[index] = Column(self._columns[index])
+            getattr(self._columns[index], method)(*args)
+
+    def __len__(self):
+        return len(self._columns[0]) if self._columns else 0
+
+    def __iter__(self):
+        Row = self.Row
+        for values in zip(*self._columns):
+            yield Row(*values)
+
+    def _extend_rows(self, rows):
+        for values in rows:
+            self._append_values(values)
+
+    def _column(self, field_name):
+        return self._columns[self.field_names.index(field_name)]
+
+    def columns(self):
+        """Return an `OrderedDict` with the column container of each field
+
+        The containers are the ones storing the table data (no copy).
+        """
+        return OrderedDict(zip(self.field_names, self._columns))
+
+    def append(self, row):
+        """Add a row to the table. Should be a dict"""
+
+        self._append_values(self._make_row(row))
+
+    def insert(self, index, row):
+        for column_index, value in enumerate(self._make_row(row)):
+            self._update_column(column_index, "insert", index, value)
+
+    def __getitem__(self, key):
+        key_type = type(key)
+        if key_type == int:
+            return self.Row(*[column[key] for column in self._columns])
+        elif key_type == slice:
+            return ColumnarTable.copy(self, self._rows[key])
+        elif key_type is six.text_type:
+            try:
+                field_index = self.field_names.index(key)
+            except ValueError:
+                raise KeyError(key)
+
+            return self._columns[field_index]
+        else:
+            raise ValueError("Unsupported key type: {}".format(type(key).__name__))
+
+    def __setitem__(self, key, value):
+        key_type = type(key)
+        if key_type == int:
+            for column_index, column_value in enumerate(self._make_row(value)):
+                self._update_column(column_index, "__setitem__", key, column_value)
+        elif key_type is six.text_type:
+            from rows import fields
+
+            values = list(value)  # I'm not lazy, sorry
+            if len(values) != len(self):
+                raise ValueError(
+                    "Values length ({}) should be the same as "
+                    "Table length ({})".format(len(values), len(self))
+                )
+
+            field_name = fields.slug(key)
+            field_type = fields.detect_types(
+                [field_name], [[value] for value in values]
+            )[field_name]
+            column = make_column(
+                field_type, [field_type.deserialize(value) for value in values]
+            )
+            if field_name not in self.field_names:
+                self._columns.append(column)
+            else:
+                self._columns[self.field_names.index(field_name)] = column
+            self.fields[field_name] = field_type
+            self.Row = namedtuple("Row", self.field_names)
+        else:
+            raise ValueError("Unsupported key type: {}".format(type(key).__name__))
+
+    def __delitem__(self, key):
+        key_type = type(key)
+        if key_type == int:
+            for column in self._columns:
+                del column[key]
+        elif key_type is six.text_type:
+            try:
+                field_index = self.field_names.index(key)
+            except ValueError:
+                raise KeyError(key)
+
+            del self.fields[key]
+            del self._columns[field_index]
+            self.Row = namedtuple("Row", self.field_names)
+        else:
+            raise ValueError("Unsupported key type: {}".format(type(key).__name__))
+
+    def __add__(self, other):
+        if other == 0:
+            return self
+
+        if not isinstance(self, type(other)) or self.fields != other.fields:
+            raise ValueError("Tables have incompatible fields")
+        else:
+            table = ColumnarTable(fields=self.fields)
+            table._rows = chain(self._rows, other._rows)
+            return table
+
+    def order_by(self, key):
+        reverse = False
+        if key.startswith("-"):
+            key = key[1:]
+            reverse = True
+
+        field_names = self.field_names
+        if key not in field_names:
+            raise ValueError('Field "{}" does not exist'.format(key))
+
+        key_column = self._columns[field_names.index(key)]
+        indexes = sorted(range(len(self)), key=key_column.__getitem__, reverse=reverse)
+        self._columns = [column.take(indexes) for column in self._columns]
@@ -86,6 +86,8 @@ TEXT_PLAIN = {
     "text": "text/txt",
     "csv": "text/csv",
     "json": "application/json",
+    "jsonl": "application/x-ndjson",
+    "ndjson": "application/x-ndjson",
 }
 OCTET_STREAM = {
     "microsoft ooxml": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -97,6 +99,8 @@ FILE_EXTENSIONS = {
     "htm": "text/html",
     "html": "text/html",
     "json": "application/json",
+    "jsonl": "application/x-ndjson",
+    "ndjson": "application/x-ndjson",
     "ods": "application/vnd.oasis.opendocument.spreadsheet",
     "parquet": "application/parquet",
     "sqlite": "application/x-sqlite3",
@@ -109,6 +113,7 @@ FILE_EXTENSIONS = {
 }
 MIME_TYPE_TO_PLUGIN_NAME = {
     "application/json": "json",
+    "application/x-ndjson": "jsonl",
     "application/parquet": "parquet",
     "application/vnd.ms-excel": "xls",
     "application/vnd.oasis.opendocument.spreadsheet": "ods",
@@ -686,8 +691,14 @@ def csv_to_sqlite(
     chunk_size=8388608,
     table_name="table1",
     schema=None,
+    bulk=False,
+    indexes=None,
 ):
-    "Export a CSV file to SQLite, based on field type detection from samples"
+    """Export a CSV file to SQLite, based on field type detection from samples
+
+    If `bulk=True`, the data is loaded in bulk-load mode and `indexes` are
+    created after the load (see `rows.plugins.sqlite.export_to_sqlite`).
+    """
     from itertools import islice
 
     from rows.plugins.plugin_csv import CsvInspector
@@ -730,6 +741,8 @@ def csv_to_sqlite(
         table_name=table_name,
         batch_size=batch_size,
         callback=callback,
+        bulk=bulk,
+        indexes=indexes,
     )
     fobj.close()
     return result
@@ -0,0 +1,303 @@
+# coding: utf-8
+
+# Copyright 2014-2022 Álvaro Justen <https://github.com/turicas/rows/>
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Conversion between `rows` columns/field types and Apache Arrow/NumPy
+
+Integer, float, boolean and text columns (see `rows.table.make_column`) are
+converted using their buffers directly (without creating a Python object per
+value); other columns are converted value by value.
+"""
+
+from __future__ import unicode_literals
+
+from array import array
+
+from rows import fields
+from rows.table import (
+    BoolColumn,
+    Column,
+    FloatColumn,
+    IntegerColumn,
+    TextColumn,
+    ValidityBitmap,
+)
+
+try:
+    import pyarrow
+    import pyarrow.compute
+except ImportError:
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _require(module, name):
+    if module is None:
+        raise ValueError("`{}` must be installed to use this feature".format(name))
+
+
+def arrow_to_field_type(arrow_type):
+    """Return the `rows.fields` type for values of the Arrow type `arrow_type`
+
+    Nested types (lists, structs and maps) are imported as `JSONField` and
+    types with no equivalent (like time of day) as `TextField`.
+    """
+    types = pyarrow.types
+    if types.is_dictionary(arrow_type):
+        return arrow_to_field_type(arrow_type.value_type)
+    elif types.is_boolean(arrow_type):
+        return fields.BoolField
+    elif types.is_integer(arrow_type):
+        return fields.IntegerField
+    elif types.is_floating(arrow_type):
+        return fields.FloatField
+    elif types.is_decimal(arrow_type):
+        return fields.DecimalField
+    elif types.is_date(arrow_type):
+        return fields.DateField
+    elif types.is_timestamp(arrow_type):
+        return fields.DatetimeField
+    elif types.is_string(arrow_type) or types.is_large_string(arrow_type):
+        return fields.TextField
+    elif (
+        types.is_binary(arrow_type)
+        or types.is_large_binary(arrow_type)
+        or types.is_fixed_size_binary(arrow_type)
+    ):
+        return fields.BinaryField
+    elif types.is_nested(arrow_type):
+        return fields.JSONField
+    return fields.TextField
+
+
+def _decimal_type(values):
+    """Return an Arrow decimal type able to store all `values` (`Decimal`s)
+
+    Non-finite values (stored as nulls) are ignored; if the values need more
+    than 38 digits, a string type is returned instead.
+    """
+    integer_digits = scale = 0
+    for value in values:
+        if value is None or not value.is_finite():
+            continue
+        _, digits, exponent = value.as_tuple()
+        integer_digits = max(integer_digits, len(digits) + exponent)
+        scale = max(scale, -exponent)
+    if integer_digits + scale > 38:
+        return pyarrow.string()
+    return pyarrow.decimal128(38, scale)
+
+
+def _finite_or_none(value):
+    return value if value.is_finite() else None
+
+
+def arrow_converter(field_type, arrow_type):
+    """Return a function to convert `field_type` values to `arrow_type`
+
+    (or `None` if the values can be used directly). Non-finite decimals are
+    converted to `None` and values stored as strings are serialized.
+    """
+    types = pyarrow.types
+    if types.is_decimal(arrow_type) and field_type in (
+        fields.DecimalField,
+        fields.PercentField,
+    ):
+        return _finite_or_none
+    elif field_type is not fields.TextField and (
+        types.is_string(arrow_type) or types.is_large_string(arrow_type)
+    ):
+        return field_type.serialize
+    return None
+
+
+def field_to_arrow(field_type, values=None):
+    """Return the Arrow type and a converter for `field_type` values
+
+    `values` (all the values of the column) are used to define the scale of
+    decimal types - if they're not available (`None`), decimals are stored as
+    strings. Field types with no equivalent Arrow type are serialized (stored
+    as strings) by the converter (`None` if values can be used directly).
+    """
+    simple_types = {
+        fields.BinaryField: pyarrow.binary(),
+        fields.BoolField: pyarrow.bool_(),
+        fields.DateField: pyarrow.date32(),
+        fields.DatetimeField: pyarrow.timestamp("us"),
+        fields.FloatField: pyarrow.float64(),
+        fields.IntegerField: pyarrow.int64(),
+        fields.TextField: pyarrow.string(),
+    }
+    if field_type in simple_types:
+        arrow_type = simple_types[field_type]
+    elif field_type in (fields.DecimalField, fields.PercentField) and values is not None:
+        arrow_type = _decimal_type(values)
+    else:
+        arrow_type = pyarrow.string()
+    return arrow_type, arrow_converter(field_type, arrow_type)
+
+
+def _buffer(data, copy):
+    return pyarrow.py_buffer(bytes(data) if copy else data)
+
+
+def _validity_buffer(column, copy):
+    if column.null_count == 0:
+        return None
+    return _buffer(column.validity.data, copy)
+
+
+def column_to_arrow(field_type, column, copy=True):
+    """Return an Arrow array with the values of a `rows` column
+
+    If `copy=False`, integer, float and text arrays share the memory of the
+    column (which can't be resized while the array exists); otherwise the
+    buffers are copied (one copy per buffer, not per value).
+    """
+    _require(pyarrow, "pyarrow")
+    length = len(column)
+    if type(column) in (IntegerColumn, FloatColumn, BoolColumn):
+        arrow_type = {
+            IntegerColumn: pyarrow.int64(),
+            FloatColumn: pyarrow.float64(),
+            BoolColumn: pyarrow.int8(),
+        }[type(column)]
+        result = pyarrow.Array.from_buffers(
+            arrow_type,
+            length,
+            [_validity_buffer(column, copy), _buffer(column.data, copy)],
+            null_count=column.null_count,
+        )
+        if type(column) is BoolColumn:  # Arrow stores booleans as bits
+            result = result.cast(pyarrow.bool_())
+        return result
+
+    elif type(column) is TextColumn:
+        return pyarrow.Array.from_buffers(
+            pyarrow.large_string(),
+            length,
+            [
+                _validity_buffer(column, copy),
+                _buffer(column.offsets, copy),
+                _buffer(column.data, copy),
+            ],
+            null_count=column.null_count,
+        )
+
+    values = list(column)
+    arrow_type, convert = field_to_arrow(field_type, values)
+    if convert is not None:
+        values = [convert(value) if value is not None else None for value in values]
+    return pyarrow.array(values, type=arrow_type)
+
+
+def _validity_from_arrow(arrow_array):
+    validity = ValidityBitmap()
+    valid = pyarrow.compute.is_valid(arrow_array)  # Always starts at bit 0
+    data = valid.buffers()[1]
+    validity.data = bytearray(data.to_pybytes()[: (len(valid) + 7) // 8] if data else b"")
+    validity._length = len(valid)
+    return validity
+
+
+def _buffer_values(arrow_array, typecode, item_size, extra=0):
+    """Return an `array.array` with the values of a primitive Arrow array
+
+    (or with the offsets of a string array, which has `extra=1` item)
+    """
+    start = arrow_array.offset * item_size
+    end = start + (len(arrow_array) + extra) * item_size
+    values = array(typecode)
+    values.frombytes(arrow_array.buffers()[1].to_pybytes()[start:end])
+    return values
+
+
+def column_from_arrow(field_type, arrow_array):
+    """Return a `rows` column with the values of an Arrow (chunked) array"""
+    _require(pyarrow, "pyarrow")
+    if isinstance(arrow_array, pyarrow.ChunkedArray):
+        arrow_array = arrow_array.combine_chunks()
+    if pyarrow.types.is_dictionary(arrow_array.type):
+        arrow_array = arrow_array.dictionary_decode()
+
+    column_class, arrow_type, typecode, item_size = {
+        fields.BoolField: (BoolColumn, pyarrow.int8(), "b", 1),
+        fields.FloatField: (FloatColumn, pyarrow.float64(), "d", 8),
+        fields.IntegerField: (IntegerColumn, pyarrow.int64(), "q", 8),
+        fields.TextField: (TextColumn, pyarrow.large_string(), None, None),
+    }.get(field_type, (None, None, None, None))
+
+    if column_class is None or not (
+        arrow_type.equals(arrow_array.type)
+        or arrow_to_field_type(arrow_array.type) is field_type
+    ):
+        return Column(arrow_array.to_pylist())
+
+    column = column_class()
+    column.validity = _validity_from_arrow(arrow_array)
+    arrow_array = arrow_array.cast(arrow_type)
+    if column_class is TextColumn:
+        offsets = _buffer_values(arrow_array, "q", 8, extra=1)
+        if not offsets:  # Empty arrays may have no offsets buffer
+            offsets = array("q", [0])
+        # Offsets are relative to the beginning of the data buffer
+        start, end = offsets[0], offsets[-1]
+        if start:
+            offsets = array("q", [offset - start for offset in offsets])
+        column.offsets = offsets
+        data = arrow_array.buffers()[2]
+        column.data = bytearray(data.to_pybytes()[start:end] if data else b"")
+    else:
+        null_value = column_class.null_value
+        column.data = _buffer_values(
+            pyarrow.compute.fill_null(arrow_array, null_value), typecode, item_size
+        )
+    return column
+
+
+def column_to_numpy(field_type, column, copy=True):
+    """Return a NumPy array with the values of a `rows` column
+
+    If `copy=False`, integer, float and boolean arrays share the memory of the
+    column (which can't be resized while the array exists); otherwise the
+    buffer is copied. Columns with null values return a `numpy.ma.MaskedArray`
+    (except for dates and datetimes, which use `NaT`).
+    """
+    _require(numpy, "numpy")
+    if type(column) in (IntegerColumn, FloatColumn, BoolColumn):
+        dtype = {IntegerColumn: "int64", FloatColumn: "float64", BoolColumn: "bool"}
+        values = numpy.frombuffer(column.data, dtype=dtype[type(column)])
+        if copy:
+            values = values.copy()
+        if column.null_count == 0:
+            return values
+        validity = numpy.unpackbits(
+            numpy.frombuffer(column.validity.data, dtype="uint8"), bitorder="little"
+        )[: len(column)]
+        return numpy.ma.MaskedArray(values, mask=validity == 0)
+
+    elif field_type is fields.DateField:
+        return numpy.array(list(column), dtype="datetime64[D]")
+    elif field_type is fields.DatetimeField:
+        return numpy.array(list(column), dtype="datetime64[us]")
+
+    values = numpy.empty(len(column), dtype=object)
+    values[:] = list(column)
+    return values
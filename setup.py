@@ -29,16 +29,20 @@ with open(version_filename, mode="r", encoding="utf-8") as fobj:
 
 utils_requirements = ["requests", "requests-cache", "tqdm"]
 EXTRA_REQUIREMENTS = {
+    "arrow": ["numpy", "pyarrow"],
     "cli": ["click"] + utils_requirements,
-    "csv": ["unicodecsv"],
+    "csv": ['unicodecsv; python_version < "3"'],
     "detect": ["file-magic"],
     "html": ["lxml"],  # apt: libxslt-dev libxml2-dev
+    "json": ["ijson>=3.1"],
     "ods": ["lxml"],
-    "parquet": ["parquet"],
+    "parquet": ["pyarrow"],
+    "parquet-legacy": ["parquet"],
     "pdf": ["cached-property", "pymupdf>=1.16.8"],
     "pdf-pdfminer.six": ["cached-property", "pdfminer.six"],
     "pdf-pymupdf": ["cached-property", "pymupdf"],
     "postgresql": ["psycopg2-binary"],
+    "sqlite-vtable": ["apsw>=3.41.0.0"],
     "utils": utils_requirements,
     "xls": ["xlrd", "xlwt"],
     "xlsx": ["defusedxml>=0.6.0", "openpyxl"],
@@ -17,9 +17,100 @@
 
 from __future__ import unicode_literals
 
+import locale
+import os
+import tempfile
 import unittest
 
+from click.testing import CliRunner
+
+import rows
+import rows.cli as cli
+
+
+def locale_available(name):
+    current = locale.setlocale(locale.LC_ALL)
+    try:
+        locale.setlocale(locale.LC_ALL, name)
+    except locale.Error:
+        return False
+    else:
+        return True
+    finally:
+        locale.setlocale(locale.LC_ALL, current)
+
 
 class CliTestCase(unittest.TestCase):
     # TODO: test everything
-    pass
+
+    def test_query_csv_sources(self):
+        temp_dir = tempfile.mkdtemp()
+        filename_1 = os.path.join(temp_dir, "data1.csv")
+        filename_2 = os.path.join(temp_dir, "data2.csv")
+        output = os.path.join(temp_dir, "output.csv")
+        with open(filename_1, mode="w") as fobj:
+            fobj.write("id,name\n1,a\n2,b\n3,c\n")
+        with open(filename_2, mode="w") as fobj:
+            fobj.write("id,value\n1,1.5\n3,3.5\n")
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli.cli,
+            [
+                "query",
+                "--quiet",
+                "--output={}".format(output),
+                "SELECT table1.id, name, value FROM table1, table2 "
+                "WHERE table1.id = table2.id",
+                filename_1,
+                filename_2,
+            ],
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        table = rows.import_from_csv(output)
+        self.assertEqual(
+            [(row.id, row.name, row.value) for row in table],
+            [(1, "a", 1.5), (3, "c", 3.5)],
+        )
+
+    @unittest.skipIf(not locale_available("pt_BR.UTF-8"), "pt_BR locale not available")
+    def test_convert_lazy_input_locale(self):
+        temp_dir = tempfile.mkdtemp()
+        filename = os.path.join(temp_dir, "data.csv")
+        output = os.path.join(temp_dir, "output.csv")
+        with open(filename, mode="w") as fobj:
+            fobj.write('id,value\n1,"1.234,5"\n2,"2,25"\n')
+
+        result = CliRunner().invoke(
+            cli.cli,
+            [
+                "convert",
+                "--quiet",
+                "--lazy",
+                "--input-locale=pt_BR.UTF-8",
+                filename,
+                output,
+            ],
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        table = rows.import_from_csv(output)
+        self.assertEqual([row.value for row in table], [1234.5, 2.25])
+
+    def test_convert_lazy_output_locale(self):
+        temp_dir = tempfile.mkdtemp()
+        filename = os.path.join(temp_dir, "data.csv")
+        with open(filename, mode="w") as fobj:
+            fobj.write("id\n1\n")
+
+        result = CliRunner().invoke(
+            cli.cli,
+            [
+                "convert",
+                "--lazy",
+                "--output-locale=pt_BR.UTF-8",
+                filename,
+                os.path.join(temp_dir, "output.csv"),
+            ],
+        )
+        self.assertEqual(result.exit_code, 21)
+        self.assertIn("`--output-locale`", result.output)
@@ -517,6 +517,42 @@ class FieldUtilsTestCase(unittest.TestCase):
         }
         self.assertDictEqual(result, expected)
 
+    def test_detect_types_prescreens(self):
+        values = [
+            "1", " -2 ", "+3", "1_000", "1__0", "\u0661\u0662", "1.5", ".5", "1.",
+            "1e5", "1E-3", "inf", "-Infinity", "NaN", "sNaN", "10%", "abc%",
+            "2019-01-02", "2019-1-2", "2019-01- 2", "2019-13-01", "2019-01-02\n",
+            "2019-01-02 10:11:12", "2019-01-02T10:11:12", "true", "YES", "tru",
+            "[1, 2]", ' {"a": 1}', '"x"', "null1", "abc", "1,5", "_-7", "0x10",
+        ]
+        for field_type, prescreen in fields.TYPE_PRESCREENS.items():
+            for value in values:
+                try:
+                    field_type.deserialize(value)
+                except ValueError:
+                    continue
+                self.assertTrue(prescreen(value), (field_type, value))
+
+    def test_detect_types_checks_distinct_values_once(self):
+        calls = []
+
+        class CountingField(fields.IntegerField):
+            @classmethod
+            def deserialize(cls, value, *args, **kwargs):
+                calls.append(value)
+                return super(CountingField, cls).deserialize(value)
+
+        result = fields.detect_types(
+            ["a", "b"],
+            [["1", "x"], ["2", "y"], ["1", "x"], ["2", "z"]],
+            field_types=[CountingField, fields.TextField],
+        )
+        self.assertDictEqual(
+            dict(result), {"a": CountingField, "b": fields.TextField}
+        )
+        # Column "b" stops being checked after "x" (only TextField is left)
+        self.assertEqual(calls, ["1", "x", "2"])
+
 
 class FieldsFunctionsTestCase(unittest.TestCase):
     def test_is_null(self):
@@ -548,3 +584,31 @@ class FieldsFunctionsTestCase(unittest.TestCase):
         func = fields.get_items(0, 2, 3)
         self.assertEqual(func("a b c d e f".split()), ("a", "c", "d"))
         self.assertEqual(func("a b c".split()), ("a", "c", None))
+
+    def test_make_deserializer(self):
+        values = {
+            fields.BoolField: [True, False, "true", "False", "no", "yes", None, ""],
+            fields.DateField: [
+                datetime.date(2019, 1, 2),
+                "2019-01-02",
+                "2019-1-2",
+                None,
+                "",
+            ],
+            fields.DecimalField: [Decimal("1.5"), 2, "3.25", "-", None, ""],
+            fields.FloatField: [1.5, 2, "3.25", "4", None, ""],
+            fields.IntegerField: [1, "2", "03", 4.0, None, ""],
+            fields.TextField: ["abc", 123, None, ""],
+        }
+        for field_type, field_values in values.items():
+            deserialize = fields.make_deserializer(field_type)
+            for value in field_values:
+                self.assertEqual(
+                    deserialize(value), field_type.deserialize(value)
+                )
+
+        # Not natively supported: uses the field's own `deserialize`
+        self.assertEqual(
+            fields.make_deserializer(fields.EmailField),
+            fields.EmailField.deserialize,
+        )
@@ -289,6 +289,22 @@ class PluginCsvTestCase(utils.RowsTestMixIn, unittest.TestCase):
         table = rows.import_from_csv(temp.name)
         self.assert_table_equal(table, utils.table)
 
+    def test_csv_fobj_is_not_closed(self):
+        fobj = BytesIO()
+        result = rows.export_to_csv(utils.table, fobj)
+        self.assertIs(result, fobj)
+        self.assertFalse(fobj.closed)
+
+        fobj.seek(0)
+        table = rows.import_from_csv(fobj)
+        self.assert_table_equal(table, utils.table)
+        self.assertFalse(fobj.closed)
+
+        fobj.seek(0)
+        table = rows.import_from_csv(fobj, lazy=True, samples=2)
+        self.assertEqual(len(list(table)), len(utils.table))
+        self.assertFalse(fobj.closed)
+
     def test_issue_168(self):
         temp = tempfile.NamedTemporaryFile(delete=False)
         filename = "{}.{}".format(temp.name, self.file_extension)
@@ -351,6 +367,26 @@ class PluginCsvTestCase(utils.RowsTestMixIn, unittest.TestCase):
         self.assertEqual(myfunc.call_count, 4)
         self.assertEqual([x[0][0] for x in myfunc.call_args_list], [3, 6, 9, 10])
 
+    def test_export_to_csv_buffer_bytes(self):
+        table = rows.import_from_dicts(
+            [{"id": number, "name": "row {}".format(number)} for number in range(1000)]
+        )
+        expected = rows.export_to_csv(table)
+
+        fobj = mock.Mock(wraps=BytesIO())
+        myfunc = mock.Mock()
+        rows.export_to_csv(table, fobj, buffer_bytes=4096, callback=myfunc)
+        self.assertEqual(fobj.getvalue(), expected)
+        # ~12kB of data: few writes, all of them (except the last) >= 4kB
+        written = [call[0][0] for call in fobj.write.call_args_list]
+        self.assertIn(len(written), (3, 4))
+        self.assertTrue(all(len(data) >= 4096 for data in written[:-1]))
+        self.assertEqual(myfunc.call_count, len(written))
+        self.assertEqual(myfunc.call_args_list[-1][0][0], 1000)
+
+        result = rows.export_to_csv(table, buffer_bytes=1)
+        self.assertEqual(result, expected)
+
     def test_import_field_limit(self):
         temp = tempfile.NamedTemporaryFile(delete=False)
         filename = "{}.{}".format(temp.name, self.file_extension)
@@ -362,3 +398,60 @@ class PluginCsvTestCase(utils.RowsTestMixIn, unittest.TestCase):
         # The following line must not raise the exception:
         # `_csv.Error: field larger than field limit (131072)`
         rows.import_from_csv(filename)
+
+    def _make_multiline_csv(self):
+        temp = tempfile.NamedTemporaryFile(delete=False)
+        filename = "{}.{}".format(temp.name, self.file_extension)
+        self.files_to_delete.append(filename)
+        values = ["a", 'multi\nline "quoted"', "x,y", "", "\r\nb"]
+        table = rows.import_from_dicts(
+            [
+                {"id": index, "text": values[index % len(values)], "n": index / 2}
+                for index in range(500)
+            ]
+        )
+        rows.export_to_csv(table, filename)
+        return filename
+
+    def test_csv_inspector_record_ranges(self):
+        filename = self._make_multiline_csv()
+        inspector = rows.plugins.plugin_csv.CsvInspector(filename)
+        ranges = inspector.record_ranges(start=0, chunk_size=1000)
+        self.assertGreater(len(ranges), 5)
+        with open(filename, mode="rb") as fobj:
+            data = fobj.read()
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        expected = list(csv.reader(data.decode("utf-8").splitlines(True)))
+        result = []
+        for index, (start, end) in enumerate(ranges):
+            if index > 0:
+                self.assertEqual(start, ranges[index - 1][1])
+            chunk = data[start:end].decode("utf-8")
+            result.extend(csv.reader(chunk.splitlines(True)))
+        self.assertEqual(result, expected)
+
+    def test_import_from_csv_workers(self):
+        filename = self._make_multiline_csv()
+        expected = rows.import_from_csv(filename)
+        for lazy in (False, True):
+            result = rows.import_from_csv(filename, workers=2, lazy=lazy)
+            self.assertEqual(result.fields, expected.fields)
+            self.assertEqual(list(result), list(expected))
+
+        result = rows.import_from_csv(
+            filename, workers=2, import_fields=["n", "id"], columnar=True
+        )
+        self.assertEqual(list(result.fields.keys()), ["n", "id"])
+        self.assertEqual(
+            [list(row) for row in result], [[row.n, row.id] for row in expected]
+        )
+
+    @mock.patch("rows.plugins.plugin_csv._import_from_csv_parallel")
+    def test_import_from_csv_workers_fallback(self, mocked_parallel):
+        # File-like objects (and compressed files) are imported serially
+        with open(self.filename, mode="rb") as fobj:
+            data = fobj.read()
+        table = rows.import_from_csv(BytesIO(data), workers=2)
+        self.assertFalse(mocked_parallel.called)
+        self.assert_table_equal(table, rows.import_from_csv(self.filename))
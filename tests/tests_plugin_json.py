@@ -204,3 +204,67 @@ class PluginJsonTestCase(utils.RowsTestMixIn, unittest.TestCase):
         self.assertEqual(table[1].f2, 3)
         self.assertEqual(table[2].f1, 4)
         self.assertEqual(table[2].f2, 5)
+
+    def test_field_names_from_samples(self):
+        data = [{"f1": 1}, {"f1": 2, "f2": 3}, {"f1": 4, "f3": 5}]
+        json_obj = io.BytesIO(json.dumps(data).encode("utf-8"))
+        table = rows.import_from_json(json_obj, samples=2)
+        self.assertEqual(table.field_names, ["f1", "f2"])
+        self.assertEqual([(row.f1, row.f2) for row in table], [(1, None), (2, 3), (4, None)])
+
+    def test_import_from_json_is_incremental(self):
+        data = [{"f1": index, "f2": "x" * index} for index in range(100)]
+        json_obj = io.BytesIO(json.dumps(data, indent=2).encode("utf-16"))
+        records = rows.plugins.plugin_json._iterate_array(json_obj, chunk_size=16)
+        self.assertEqual(next(records), data[0])
+        self.assertLess(json_obj.tell(), 100)  # Only the beginning was read
+        self.assertEqual(list(records), data[1:])
+
+    @unittest.skipIf(rows.plugins.plugin_json.ijson is None, "ijson is not installed")
+    def test_import_from_json_ijson_backend(self):
+        table = rows.import_from_json(self.filename, backend="ijson")
+        expected = rows.import_from_json(self.filename)
+        self.assertEqual(table.fields, expected.fields)
+        self.assertEqual(list(table), list(expected))
+
+    def test_import_from_json_invalid_data(self):
+        for value in (b"", b'{"f1": 1}', b'[{"f1": 1} {"f1": 2}]', b'[{"f1": 1},'):
+            with self.assertRaises(ValueError):
+                rows.import_from_json(io.BytesIO(value))
+        with self.assertRaises(ValueError):
+            rows.import_from_json(io.BytesIO(b"[]"), backend="invalid")
+
+    def test_import_from_json_non_object_record(self):
+        data = b'[{"f1": 1}, 2]'
+        for kwargs in (
+            {},
+            {"samples": 1},
+            {"fields": OrderedDict([("f1", rows.fields.IntegerField)])},
+        ):
+            with self.assertRaises(ValueError):
+                rows.import_from_json(io.BytesIO(data), **kwargs)
+
+    def test_export_to_json_batches(self):
+        expected = [
+            json.dumps(
+                json.loads(rows.export_to_json(utils.table).decode("utf-8")),
+                indent=indent,
+            ).encode("utf-8")
+            for indent in (None, 2)
+        ]
+        for batch_size in (1, 2, 1000):
+            for indent, data in zip((None, 2), expected):
+                result = rows.export_to_json(
+                    utils.table, indent=indent, batch_size=batch_size
+                )
+                self.assertEqual(result, data)
+
+        empty_table = rows.Table(fields=utils.table.fields)
+        self.assertEqual(rows.export_to_json(empty_table), b"[]")
+        self.assertEqual(rows.export_to_json(empty_table, indent=2), b"[]")
+
+    def test_export_to_json_writes_in_batches(self):
+        fobj = mock.Mock()
+        rows.export_to_json(utils.table, fobj, batch_size=2)
+        # One write per batch plus the end of the array
+        self.assertEqual(fobj.write.call_count, len(utils.table) // 2 + 2)
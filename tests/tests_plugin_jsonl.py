@@ -0,0 +1,145 @@
+# coding: utf-8
+
+# Copyright 2014-2022 Álvaro Justen <https://github.com/turicas/rows/>
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+
+#    You should have received a copy of the GNU Lesser General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+
+import gzip
+import json
+import tempfile
+import unittest
+from io import BytesIO
+
+import mock
+
+import rows
+import tests.utils as utils
+from rows.utils import Source, export_to_uri, import_from_uri
+
+
+class PluginJsonLinesTestCase(utils.RowsTestMixIn, unittest.TestCase):
+
+    plugin_name = "jsonl"
+    file_extension = "jsonl"
+    filename = "tests/data/all-field-types.jsonl"
+    encoding = "utf-8"
+    expected_meta = {
+        "imported_from": "jsonl",
+        "source": Source(uri=filename, plugin_name=plugin_name, encoding=encoding),
+    }
+
+    def test_imports(self):
+        self.assertIs(
+            rows.import_from_jsonl, rows.plugins.plugin_jsonl.import_from_jsonl
+        )
+        self.assertIs(rows.export_to_jsonl, rows.plugins.plugin_jsonl.export_to_jsonl)
+
+    @mock.patch("rows.plugins.plugin_jsonl.create_table")
+    def test_import_from_jsonl_uses_create_table(self, mocked_create_table):
+        mocked_create_table.return_value = 42
+        kwargs = {"some_key": 123, "other": 456}
+        result = rows.import_from_jsonl(self.filename, encoding=self.encoding, **kwargs)
+        self.assertTrue(mocked_create_table.called)
+        self.assertEqual(mocked_create_table.call_count, 1)
+        self.assertEqual(result, 42)
+
+    @mock.patch("rows.plugins.plugin_jsonl.create_table")
+    def test_import_from_jsonl_retrieve_desired_data(self, mocked_create_table):
+        mocked_create_table.return_value = 42
+
+        # import using filename
+        rows.import_from_jsonl(self.filename)
+        call_args = mocked_create_table.call_args_list[0]
+        self.assert_create_table_data(call_args, expected_meta=self.expected_meta)
+
+        # import using fobj
+        with open(self.filename, mode="rb") as fobj:
+            rows.import_from_jsonl(fobj)
+            call_args = mocked_create_table.call_args_list[1]
+            self.assert_create_table_data(call_args, expected_meta=self.expected_meta)
+
+    def test_import_from_jsonl_field_names_from_samples(self):
+        data = BytesIO(
+            b'{"a": 1}\n\n{"b": "x", "a": 2}\n{"a": 3, "c": true}\n'
+        )
+        table = rows.import_from_jsonl(data, samples=2)
+        self.assertEqual(table.field_names, ["a", "b"])
+        self.assertEqual(
+            [(row.a, row.b) for row in table], [(1, None), (2, "x"), (3, None)]
+        )
+
+        data.seek(0)
+        table = rows.import_from_jsonl(data)
+        self.assertEqual(table.field_names, ["a", "b", "c"])
+
+    def test_import_from_jsonl_invalid_line(self):
+        with self.assertRaises(ValueError):
+            rows.import_from_jsonl(BytesIO(b'{"a": 1}\n[1, 2]\n'))
+
+    @mock.patch("rows.plugins.plugin_jsonl.prepare_to_export")
+    def test_export_to_jsonl_uses_prepare_to_export(self, mocked_prepare_to_export):
+        temp = tempfile.NamedTemporaryFile(delete=False, mode="wb")
+        self.files_to_delete.append(temp.name)
+        kwargs = {"test": 123, "parameter": 3.14}
+        mocked_prepare_to_export.return_value = iter([utils.table.fields.keys()])
+
+        rows.export_to_jsonl(utils.table, temp.name, **kwargs)
+        self.assertTrue(mocked_prepare_to_export.called)
+        self.assertEqual(mocked_prepare_to_export.call_count, 1)
+
+        call = mocked_prepare_to_export.call_args
+        self.assertEqual(call[0], (utils.table,))
+        self.assertEqual(call[1], kwargs)
+
+    def test_export_to_jsonl_filename(self):
+        temp = tempfile.NamedTemporaryFile(delete=False, mode="wb")
+        self.files_to_delete.append(temp.name)
+        rows.export_to_jsonl(utils.table, temp.name)
+        table = rows.import_from_jsonl(temp.name)
+        self.assert_table_equal(table, utils.table)
+
+    def test_export_to_jsonl_fobj(self):
+        temp = tempfile.NamedTemporaryFile(delete=False, mode="wb")
+        self.files_to_delete.append(temp.name)
+        rows.export_to_jsonl(utils.table, temp.file)
+
+        table = rows.import_from_jsonl(temp.name)
+        self.assert_table_equal(table, utils.table)
+
+    def test_export_to_jsonl_one_object_per_line(self):
+        result = rows.export_to_jsonl(utils.table)
+        lines = result.decode("utf-8").splitlines()
+        self.assertEqual(len(lines), len(utils.table))
+        self.assertEqual(
+            list(json.loads(lines[0]).keys()), list(utils.table.field_names)
+        )
+
+    def test_export_to_jsonl_callback(self):
+        callback = mock.Mock()
+        rows.export_to_jsonl(utils.table, batch_size=3, callback=callback)
+        self.assertEqual(
+            [call[0][0] for call in callback.call_args_list], [3, 6, len(utils.table)]
+        )
+
+    def test_export_to_jsonl_compressed(self):
+        temp = tempfile.NamedTemporaryFile(delete=False, suffix=".jsonl.gz")
+        self.files_to_delete.append(temp.name)
+        export_to_uri(utils.table, temp.name)
+        with gzip.open(temp.name, mode="rb") as fobj:
+            self.assertEqual(fobj.read(), rows.export_to_jsonl(utils.table))
+
+        table = import_from_uri(temp.name)
+        self.assert_table_equal(table, utils.table)
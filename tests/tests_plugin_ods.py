@@ -103,3 +103,28 @@ class PluginOdsTestCase(utils.RowsTestMixIn, unittest.TestCase):
         assert len(data) == 2
         assert data[0] == [4, 7.89, 7.89, Decimal("0.1364")]
         assert data[1] == [5, 9.87, 9.87, Decimal("0.1314")]
+
+    def test_sheet_names(self):
+        result = rows.plugins.ods.sheet_names("tests/data/multiple-sheets.ods")
+        assert result == ["Sheet1", "Other sheet"]
+
+    def test_import_sheet_by_name_or_index(self):
+        filename = "tests/data/multiple-sheets.ods"
+        expected = [[1, None, "x"], [2, 2, None]]
+        for kwargs in ({"sheet_name": "Other sheet"}, {"index": 1}):
+            result = rows.import_from_ods(filename, **kwargs)
+            assert result.meta["name"] == "Other sheet"
+            assert result.field_names == ["id", "value", "other"]
+            assert [list(row) for row in result] == expected
+
+        with self.assertRaises(ValueError):
+            rows.import_from_ods(filename, sheet_name="Nonexistent")
+        with self.assertRaises(IndexError):
+            rows.import_from_ods(filename, index=2)
+
+    def test_end_column_with_repeated_cells(self):
+        result = rows.import_from_ods(
+            "tests/data/multiple-sheets.ods", sheet_name="Other sheet", end_column=1
+        )
+        assert result.field_names == ["id", "value"]
+        assert [list(row) for row in result] == [[1, None], [2, 2]]
@@ -17,13 +17,18 @@
 
 from __future__ import unicode_literals
 
+import tempfile
 import unittest
 from collections import OrderedDict
+from decimal import Decimal
+from io import BytesIO
 from pathlib import Path
 
 import mock
 
 import rows
+import tests.utils as utils
+from rows.plugins import plugin_parquet
 
 DATA = [
     ["nation_key", "name", "region_key", "comment_col"],
@@ -145,11 +150,12 @@ class PluginParquetTestCase(unittest.TestCase):
             rows.import_from_parquet, rows.plugins.plugin_parquet.import_from_parquet
         )
 
+    @unittest.skipIf(plugin_parquet.parquet is None, "parquet is not installed")
     @mock.patch("rows.plugins.plugin_parquet.create_table")
     def test_import_from_parquet_uses_create_table(self, mocked_create_table):
         mocked_create_table.return_value = 42
         kwargs = {"some_key": 123, "other": 456}
-        result = rows.import_from_parquet(self.filename, **kwargs)
+        result = rows.import_from_parquet(self.filename, backend="parquet", **kwargs)
         self.assertTrue(mocked_create_table.called)
         self.assertEqual(mocked_create_table.call_count, 1)
         self.assertEqual(result, 42)
@@ -171,14 +177,127 @@ class PluginParquetTestCase(unittest.TestCase):
         self.assertEqual(meta, expected_meta)
         self.assertEqual(source.uri, Path(self.filename))
 
+    @unittest.skipIf(plugin_parquet.parquet is None, "parquet is not installed")
     @mock.patch("rows.plugins.plugin_parquet.create_table")
     def test_import_from_parquet_retrieve_desired_data(self, mocked_create_table):
         mocked_create_table.return_value = 42
 
         # import using filename
-        rows.import_from_parquet(self.filename)
+        rows.import_from_parquet(self.filename, backend="parquet")
         args = mocked_create_table.call_args[0][0]
 
         self.assertEqual(args, DATA)
 
     # TODO: test all supported field types
+
+
+@unittest.skipIf(not plugin_parquet.has_pyarrow, "pyarrow is not installed")
+class PluginParquetPyarrowTestCase(utils.RowsTestMixIn, unittest.TestCase):
+
+    plugin_name = "parquet"
+    filename = "tests/data/nation.dict.parquet"
+
+    def test_imports(self):
+        self.assertIs(
+            rows.export_to_parquet, rows.plugins.plugin_parquet.export_to_parquet
+        )
+
+    @mock.patch("rows.plugins.plugin_parquet.create_table")
+    def test_import_from_parquet_uses_schema_types(self, mocked_create_table):
+        mocked_create_table.return_value = 42
+        result = rows.import_from_parquet(self.filename)
+        self.assertEqual(result, 42)
+
+        call = mocked_create_table.call_args
+        expected_fields = OrderedDict(
+            [
+                ("nation_key", rows.fields.IntegerField),
+                ("name", rows.fields.BinaryField),
+                ("region_key", rows.fields.IntegerField),
+                ("comment_col", rows.fields.BinaryField),
+            ]
+        )
+        self.assertDictEqual(call[1]["fields"], expected_fields)
+        self.assertEqual(list(call[0][0]), DATA)
+
+    def test_import_from_parquet_projection(self):
+        with mock.patch.object(
+            plugin_parquet, "_iterate_parquet_rows", wraps=plugin_parquet._iterate_parquet_rows
+        ) as mocked:
+            table = rows.import_from_parquet(
+                self.filename, import_fields=["name", "nation_key"]
+            )
+        self.assertEqual(mocked.call_args[0][1], ["nation_key", "name"])
+        self.assertEqual(table.field_names, ["name", "nation_key"])
+        self.assertEqual(
+            [(row.name, row.nation_key) for row in table],
+            [(row[1], row[0]) for row in DATA[1:]],
+        )
+
+        with self.assertRaises(ValueError):
+            rows.import_from_parquet(self.filename, import_fields=["invalid"])
+
+    def test_export_to_parquet(self):
+        temp = tempfile.NamedTemporaryFile(delete=False, suffix=".parquet")
+        self.files_to_delete.append(temp.name)
+        rows.export_to_parquet(utils.table, temp.name, row_group_size=3)
+        parquet_file = plugin_parquet.pyarrow_parquet.ParquetFile(temp.name)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+
+        for workers in (None, 2):
+            table = rows.import_from_parquet(temp.name, workers=workers)
+            expected_fields = utils.table.fields.copy()
+            expected_fields["percent_column"] = rows.fields.DecimalField
+            self.assertEqual(table.fields, expected_fields)
+            self.assertEqual(list(table), list(utils.table))
+
+    def test_export_to_parquet_return_data(self):
+        data = rows.export_to_parquet(utils.table, compression=None)
+        table = rows.import_from_parquet(BytesIO(data))
+        self.assertEqual(list(table), list(utils.table))
+
+        empty_table = rows.Table(fields=utils.table.fields)
+        data = rows.export_to_parquet(empty_table)
+        table = rows.import_from_parquet(BytesIO(data))
+        self.assertEqual(table.field_names, utils.table.field_names)
+        self.assertEqual(len(table), 0)
+
+    def test_export_to_parquet_decimal_scale(self):
+        decimal_fields = OrderedDict([("value", rows.fields.DecimalField)])
+        table = rows.Table(fields=decimal_fields)
+        for value in (None, "1", "1.25", "NaN", "-Infinity", "123.456"):
+            table.append({"value": None if value is None else Decimal(value)})
+        data = rows.export_to_parquet(table, row_group_size=1)
+        parquet_file = plugin_parquet.pyarrow_parquet.ParquetFile(BytesIO(data))
+        self.assertEqual(parquet_file.metadata.num_row_groups, 6)
+        self.assertEqual(str(parquet_file.schema_arrow.types[0]), "decimal128(38, 3)")
+        result = rows.import_from_parquet(BytesIO(data))
+        self.assertEqual(
+            [row.value for row in result],
+            [None, Decimal("1"), Decimal("1.25"), None, None, Decimal("123.456")],
+        )
+
+    def test_export_to_parquet_lazy_table_decimals(self):
+        decimal_fields = OrderedDict([("value", rows.fields.DecimalField)])
+        values = [["1"], ["1.25"]]
+
+        table = rows.plugins.utils.create_table(
+            [["value"]] + values, force_types=decimal_fields, lazy=True
+        )
+        data = rows.export_to_parquet(table, row_group_size=1)
+        result = rows.import_from_parquet(BytesIO(data))
+        self.assertEqual(result.fields["value"], rows.fields.TextField)
+        self.assertEqual([row.value for row in result], ["1", "1.25"])
+
+        table = rows.plugins.utils.create_table(
+            [["value"]] + values, force_types=decimal_fields, lazy=True
+        )
+        schema = plugin_parquet.pyarrow.schema(
+            [("value", plugin_parquet.pyarrow.decimal128(10, 2))]
+        )
+        data = rows.export_to_parquet(table, row_group_size=1, schema=schema)
+        result = rows.import_from_parquet(BytesIO(data))
+        self.assertEqual(result.fields["value"], rows.fields.DecimalField)
+        self.assertEqual(
+            [row.value for row in result], [Decimal("1.00"), Decimal("1.25")]
+        )
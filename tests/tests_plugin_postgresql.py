@@ -17,13 +17,16 @@
 
 from __future__ import unicode_literals
 
+import csv
 import os
 import tempfile
 import unittest
+from collections import OrderedDict
 from textwrap import dedent
 
 import mock
 import six
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 
 import rows
 import rows.plugins.postgresql
@@ -118,13 +121,15 @@ class PluginPostgreSQLTestCase(utils.RowsTestMixIn, unittest.TestCase):
         )
         self.assertFalse(connection.closed)
         connection_type = type(connection)
-        connection.close()
 
+        # Rows are fetched lazily, so the connection must be open here
         call_args = mocked_create_table.call_args_list[1]
         meta = call_args[1].pop("meta")
         call_args[1]["meta"] = {}
         self.assert_create_table_data(call_args, expected_meta={})
         self.assertTrue(isinstance(meta["source"].fobj, connection_type))
+        self.assertFalse(connection.closed)
+        connection.close()
 
     def test_postgresql_injection(self):
         with self.assertRaises(ValueError):
@@ -230,6 +235,30 @@ class PluginPostgreSQLTestCase(utils.RowsTestMixIn, unittest.TestCase):
         for row in table:
             self.assertTrue(row.float_column > 3)
 
+    def test_import_from_postgresql_lazy(self):
+        connection, table_name = rows.export_to_postgresql(
+            utils.table, self.uri, close_connection=False, table_name="rows_10"
+        )
+        expected = rows.import_from_postgresql(connection, table_name="rows_10")
+        # Non-lazy imports end the transaction (which locks the table)
+        self.assertEqual(
+            connection.get_transaction_status(),
+            TRANSACTION_STATUS_IDLE,
+        )
+        table = rows.import_from_postgresql(
+            connection, table_name="rows_10", itersize=2, lazy=True, samples=2
+        )
+        self.assertEqual(list(table.fields.keys()), list(expected.fields.keys()))
+        self.assertEqual(len(list(table)), len(expected))
+        self.assertFalse(connection.closed)
+
+        # Client-side cursor
+        table = rows.import_from_postgresql(
+            connection, table_name="rows_10", itersize=None
+        )
+        self.assertEqual(list(table), list(expected))
+        connection.close()
+
     def test_pgimport_force_null(self):
         temp = tempfile.NamedTemporaryFile()
         filename = "{}.csv".format(temp.name)
@@ -257,3 +286,206 @@ class PluginPostgreSQLTestCase(utils.RowsTestMixIn, unittest.TestCase):
         self.assertEqual(table[0].field2, 4)
         self.assertIs(table[1].field1, None)
         self.assertEqual(table[1].field2, 2)
+
+    def test_pgimport_pgexport_psycopg2_backend(self):
+        temp = tempfile.NamedTemporaryFile()
+        filename = "{}.csv".format(temp.name)
+        output_filename = "{}-output.csv".format(temp.name)
+        temp.close()
+        self.files_to_delete.extend([filename, output_filename])
+        with open(filename, mode="wb") as fobj:
+            fobj.write(b"field1,field2\na,1\nb,2\n")
+
+        connection = pgconnect(self.uri)
+        callback = mock.Mock()
+        result = rows.utils.pgimport(
+            filename=filename,
+            database_uri=self.uri,
+            table_name="rows_psycopg2_backend",
+            backend="psycopg2",
+            connection=connection,
+            callback=callback,
+        )
+        self.assertFalse(connection.closed)  # Provided connection is reused
+        connection.close()
+        self.assertEqual(result["rows_imported"], 2)
+        self.assertEqual(result["bytes_read"], os.stat(filename).st_size)
+        self.assertEqual(callback.call_args[0][1], result["bytes_read"])
+
+        result = rows.utils.pgexport(
+            database_uri=self.uri,
+            table_name_or_query="rows_psycopg2_backend",
+            filename=output_filename,
+            backend="psycopg2",
+        )
+        with open(output_filename, mode="rb") as fobj:
+            data = fobj.read()
+        self.assertEqual(data, b"field1,field2\na,1\nb,2\n")
+        self.assertEqual(result["bytes_written"], len(data))
+
+        result = rows.plugins.postgresql.pg2pg(
+            database_uri_from=self.uri,
+            database_uri_to=self.uri,
+            table_name_from="rows_psycopg2_backend",
+            table_name_to="rows_psycopg2_backend_copy",
+            backend="psycopg2",
+        )
+        self.assertEqual(result["rows_imported"], 2)
+        table = rows.import_from_postgresql(self.uri, "rows_psycopg2_backend_copy")
+        self.assertEqual([(row.field1, row.field2) for row in table], [("a", 1), ("b", 2)])
+
+    def test_pgimport_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            rows.plugins.postgresql.PostgresCopy(self.uri, backend="invalid")
+
+    def test_pgimport_jobs(self):
+        temp = tempfile.NamedTemporaryFile()
+        filename = "{}.csv".format(temp.name)
+        temp.close()
+        self.files_to_delete.append(filename)
+        with open(filename, mode="w", encoding="utf-8", newline="") as fobj:
+            writer = csv.writer(fobj)
+            writer.writerow(["id", "text"])
+            for index in range(1000):
+                writer.writerow([index, "line 1\nline 2" if index % 3 else "a"])
+
+        callback = mock.Mock()
+        result = rows.utils.pgimport(
+            filename=filename,
+            database_uri=self.uri,
+            table_name="rows_jobs",
+            jobs=4,
+            callback=callback,
+        )
+        self.assertEqual(result["rows_imported"], 1000)
+        self.assertEqual(result["bytes_read"], os.stat(filename).st_size)
+        self.assertEqual(callback.call_args[0][1], result["bytes_read"])
+        table = rows.import_from_postgresql(self.uri, "rows_jobs")
+        self.assertEqual(sorted(row.id for row in table), list(range(1000)))
+
+    def test_export_to_postgresql_copy_format(self):
+        class CustomField(fields.TextField):
+            pass
+
+        original_get_copy_sql = rows.plugins.postgresql.get_copy_sql
+        with mock.patch(
+            "rows.plugins.postgresql.get_copy_sql", wraps=original_get_copy_sql
+        ) as mocked_get_copy_sql:
+            rows.export_to_postgresql(utils.table, self.uri, table_name="rows_11")
+            self.assertEqual(
+                mocked_get_copy_sql.call_args[1]["output_format"], "BINARY"
+            )
+
+            table = rows.Table(
+                fields=OrderedDict([("id", fields.IntegerField), ("custom", CustomField)])
+            )
+            table.append({"id": 1, "custom": "tab\tand\nnew line"})
+            table.append({"id": 2, "custom": None})
+            rows.export_to_postgresql(table, self.uri, table_name="rows_12")
+            self.assertEqual(
+                mocked_get_copy_sql.call_args[1]["output_format"], "TEXT"
+            )
+
+        result = rows.import_from_postgresql(self.uri, table_name="rows_11")
+        self.assert_table_equal(result, utils.table)
+        # The custom field is stored as `BYTEA` (imported as `BinaryField`)
+        result = rows.import_from_postgresql(self.uri, table_name="rows_12")
+        self.assertEqual(result.fields["custom"], fields.BinaryField)
+        self.assertEqual(result[0].custom, b"tab\tand\nnew line")
+        self.assertEqual(result[1].custom, b"")  # `BinaryField` deserializes `None`
+
+    def test_export_to_postgresql_existing_table_column_types(self):
+        connection = pgconnect(self.uri)
+        cursor = connection.cursor()
+        cursor.execute(
+            'CREATE TABLE "rows_13" ("id" INTEGER, "value" DOUBLE PRECISION)'
+        )
+        connection.commit()
+        connection.close()
+
+        table = rows.Table(
+            fields=OrderedDict([("id", fields.IntegerField), ("value", fields.FloatField)])
+        )
+        table.append({"id": 1, "value": 1.5})
+        table.append({"id": None, "value": -0.25})
+        original_get_copy_sql = rows.plugins.postgresql.get_copy_sql
+        with mock.patch(
+            "rows.plugins.postgresql.get_copy_sql", wraps=original_get_copy_sql
+        ) as mocked_get_copy_sql:
+            rows.export_to_postgresql(table, self.uri, table_name="rows_13")
+            self.assertEqual(
+                mocked_get_copy_sql.call_args[1]["output_format"], "TEXT"
+            )
+
+        result = rows.import_from_postgresql(self.uri, table_name="rows_13")
+        self.assertEqual([tuple(row) for row in result], [(1, 1.5), (None, -0.25)])
+
+    def test_pg2pg_jobs(self):
+        table = rows.Table(fields=OrderedDict([("id", fields.IntegerField)]))
+        for index in range(1000):
+            table.append({"id": index})
+        rows.export_to_postgresql(table, self.uri, table_name="rows_partitioned")
+
+        for partition_by in (None, "id"):
+            table_name_to = "rows_partitioned_{}".format(partition_by or "ctid")
+            callback = mock.Mock()
+            result = rows.plugins.postgresql.pg2pg(
+                database_uri_from=self.uri,
+                database_uri_to=self.uri,
+                table_name_from="rows_partitioned",
+                table_name_to=table_name_to,
+                jobs=3,
+                partition_by=partition_by,
+                callback=callback,
+            )
+            self.assertEqual(len(result["partitions"]), 3)
+            self.assertEqual(result["rows_imported"], 1000)
+            self.assertEqual(
+                sum(partition["rows_imported"] for partition in result["partitions"]),
+                1000,
+            )
+            self.assertEqual(callback.call_args[0][1], result["bytes_written"])
+            copied = rows.import_from_postgresql(self.uri, table_name_to)
+            self.assertEqual(sorted(row.id for row in copied), list(range(1000)))
+
+    def test_export_to_postgresql_indexes(self):
+        connection, table_name = rows.export_to_postgresql(
+            utils.table,
+            self.uri,
+            close_connection=False,
+            table_name="rows_13",
+            indexes=["integer_column", "date_column,unicode_column"],
+        )
+        cursor = connection.cursor()
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s ORDER BY 1",
+            (table_name,),
+        )
+        self.assertEqual(
+            [row[0] for row in cursor.fetchall()],
+            ["idx_rows_13_date_column_unicode_column", "idx_rows_13_integer_column"],
+        )
+        cursor.close()
+        connection.close()
+
+    def test_pg_create_indexes_sql(self):
+        self.assertEqual(rows.plugins.postgresql.pg_create_indexes_sql("t", []), [])
+        self.assertEqual(
+            rows.plugins.postgresql.pg_create_indexes_sql("t", [["a"], ["b", "c"]]),
+            [
+                'CREATE INDEX IF NOT EXISTS "idx_t_a" ON "t" ("a")',
+                'CREATE INDEX IF NOT EXISTS "idx_t_b_c" ON "t" ("b", "c")',
+                'ANALYZE "t"',
+            ],
+        )
+
+    def test_pg_index_name_long_names(self):
+        pg_index_name = rows.plugins.postgresql.pg_index_name
+        table_name = "t" * 60
+        first = pg_index_name(table_name, ["field_1"])
+        second = pg_index_name(table_name, ["field_2"])
+        self.assertNotEqual(first, second)
+        self.assertEqual(len(first), 63)
+        self.assertTrue(first.startswith("idx_" + "t" * 50))
+        self.assertEqual(first, pg_index_name(table_name, ["field_1"]))
+        self.assertLessEqual(len(pg_index_name("á" * 40, ["a"]).encode("utf-8")), 63)
@@ -220,3 +220,190 @@ class PluginSqliteTestCase(utils.RowsTestMixIn, unittest.TestCase):
         cursor = connection.cursor()
         cursor.execute("SELECT * FROM table1")
         self.assertEqual(list(cursor.fetchall()), [(None,) for _ in range(10)])
+
+    def test_import_from_sqlite_lazy(self):
+        connection = rows.export_to_sqlite(utils.table, ":memory:")
+        expected = rows.import_from_sqlite(connection)
+        table = rows.import_from_sqlite(
+            connection, batch_size=2, lazy=True, samples=3
+        )
+        self.assertEqual(table.fields, expected.fields)
+        self.assertEqual(list(table), list(expected))
+
+    def test_import_from_sqlite_declared_types(self):
+        connection = sqlite3.connect(":memory:")
+        connection.execute(
+            "CREATE TABLE t (id BIGINT, name VARCHAR(10), value DOUBLE, data, day DATE)"
+        )
+        connection.execute("INSERT INTO t VALUES (1, '2', 3, '4', '2020-01-02')")
+        table = rows.import_from_sqlite(
+            connection,
+            table_name="t",
+            declared_types=True,
+            force_types={"value": fields.DecimalField},
+        )
+        self.assertEqual(
+            list(table.fields.items()),
+            [
+                ("id", fields.IntegerField),
+                ("name", fields.TextField),
+                ("value", fields.DecimalField),
+                ("data", fields.IntegerField),  # No declared type: detected
+                ("day", fields.DateField),  # NUMERIC affinity: detected
+            ],
+        )
+        self.assertEqual(table[0].name, "2")
+
+    def test_import_from_sqlite_declared_types_blob(self):
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE t (text_data BLOB, binary_data BLOB)")
+        connection.execute("INSERT INTO t VALUES ('some text', ?)", (b"\x00\x01",))
+        table = rows.import_from_sqlite(
+            connection, table_name="t", declared_types=True
+        )
+        # SQLite accepts any type of value in BLOB columns: types are detected
+        self.assertEqual(table.fields["text_data"], fields.TextField)
+        self.assertEqual(table.fields["binary_data"], fields.BinaryField)
+        self.assertEqual(list(table[0]), ["some text", b"\x00\x01"])
+
+    def test_export_to_sqlite_bulk(self):
+        temp = tempfile.NamedTemporaryFile(delete=False)
+        filename = "{}.{}".format(temp.name, self.file_extension)
+        self.files_to_delete.append(filename)
+        connection = sqlite3.connect(filename)
+
+        def get_pragmas():
+            return [
+                connection.execute("PRAGMA {}".format(name)).fetchone()[0]
+                for name, _ in rows.plugins.sqlite.BULK_PRAGMAS
+            ]
+
+        pragmas = get_pragmas()
+        myfunc = mock.Mock()
+        rows.export_to_sqlite(utils.table, connection, bulk=True, callback=myfunc)
+        self.assertEqual(get_pragmas(), pragmas)
+        self.assertEqual(myfunc.call_count, 1)  # Bigger batches
+        self.assertFalse(connection.in_transaction)
+        table = rows.import_from_sqlite(filename)
+        self.assert_table_equal(table, utils.table)
+
+        # If an error occurs, nothing is inserted and pragmas are restored
+        table = rows.import_from_dicts([{"id": number} for number in range(10)])
+        myfunc = mock.Mock(side_effect=[None, RuntimeError("stop")])
+        with self.assertRaises(RuntimeError):
+            rows.export_to_sqlite(
+                table,
+                connection,
+                table_name="table2",
+                bulk=True,
+                batch_size=3,
+                callback=myfunc,
+            )
+        self.assertEqual(get_pragmas(), pragmas)
+        self.assertEqual(
+            connection.execute("SELECT COUNT(*) FROM table2").fetchone()[0], 0
+        )
+
+    def test_export_to_sqlite_indexes(self):
+        connection = rows.export_to_sqlite(
+            utils.table,
+            ":memory:",
+            indexes=["integer_column", ["date_column", "unicode_column"]],
+        )
+        indexes = connection.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index'"
+        ).fetchall()
+        self.assertEqual(
+            indexes,
+            [
+                (
+                    "idx_table1_integer_column",
+                    'CREATE INDEX "idx_table1_integer_column" ON "table1" '
+                    '("integer_column")',
+                ),
+                (
+                    "idx_table1_date_column_unicode_column",
+                    'CREATE INDEX "idx_table1_date_column_unicode_column" ON '
+                    '"table1" ("date_column", "unicode_column")',
+                ),
+            ],
+        )
+        # Table was analyzed
+        self.assertEqual(
+            connection.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0], 2
+        )
+
+        with self.assertRaises(ValueError):
+            rows.export_to_sqlite(utils.table, ":memory:", indexes=["invalid"])
+
+
+@unittest.skipIf(rows.plugins.sqlite_vtable is None, "apsw is not installed")
+class SqliteVirtualTableTestCase(unittest.TestCase):
+
+    filename = "tests/data/all-field-types.csv"
+
+    def test_query_csv(self):
+        result = rows.plugins.sqlite_vtable.query_csv(
+            "SELECT integer_column, date_column FROM table1 WHERE bool_column = 1",
+            [self.filename],
+        )
+        self.assertEqual(result.field_names, ["integer_column", "date_column"])
+        self.assertEqual(
+            [(row.integer_column, str(row.date_column)) for row in result],
+            [(1, "2015-01-01"), (3, "2050-01-02"), (5, "2015-03-04")],
+        )
+
+    def test_query_csv_join(self):
+        result = rows.plugins.sqlite_vtable.query_csv(
+            "SELECT COUNT(*) AS total FROM table1 "
+            "JOIN table2 ON table1.integer_column = table2.integer_column",
+            [self.filename, self.filename],
+        )
+        self.assertEqual(result[0].total, 6)  # `integer_column` has a null value
+
+    def test_query_csv_limit_stops_scan(self):
+        read_rows = []
+        csv_reader = rows.plugins.sqlite_vtable.csv_reader
+
+        def counting_csv_reader(*args, **kwargs):
+            for row in csv_reader(*args, **kwargs):
+                read_rows.append(row)
+                yield row
+
+        with mock.patch(
+            "rows.plugins.sqlite_vtable.csv_reader", side_effect=counting_csv_reader
+        ):
+            result = rows.plugins.sqlite_vtable.query_csv(
+                "SELECT integer_column FROM table1 LIMIT 2 OFFSET 1", [self.filename]
+            )
+        self.assertEqual([row.integer_column for row in result], [2, 3])
+        self.assertEqual(len(read_rows), 4)  # Header + offset + limit
+
+    def test_query_csv_closes_connection(self):
+        apsw = rows.plugins.sqlite_vtable.apsw
+        connections = []
+        create_connection = rows.plugins.sqlite_vtable.create_connection
+
+        def saving_create_connection(*args, **kwargs):
+            connections.append(create_connection(*args, **kwargs))
+            return connections[-1]
+
+        with mock.patch(
+            "rows.plugins.sqlite_vtable.create_connection",
+            side_effect=saving_create_connection,
+        ):
+            result = rows.plugins.sqlite_vtable.query_csv(
+                "SELECT integer_column FROM table1", [self.filename], lazy=True
+            )
+            self.assertEqual(len(list(result)), 7)
+            with self.assertRaises(ValueError):
+                rows.plugins.sqlite_vtable.query_csv(
+                    "SELECT * FROM table1", [self.filename], import_fields=["x"]
+                )
+            with self.assertRaises(apsw.SQLError):
+                rows.plugins.sqlite_vtable.query_csv("SELECT * FROM t", [self.filename])
+
+        self.assertEqual(len(connections), 3)
+        for connection in connections:
+            with self.assertRaises(apsw.ConnectionClosedError):
+                connection.cursor()
@@ -205,6 +205,51 @@ class PluginUtilsTestCase(utils.RowsTestMixIn, unittest.TestCase):
         for field_name, field_type in force_types.items():
             self.assertEqual(table.fields[field_name], field_type)
 
+    def test_create_table_lazy(self):
+        header = ["field1", "field2"]
+        table_rows = [["1", "3.14"], ["2", "2.71"], ["3", "text"]]
+        consumed = []
+
+        def data():
+            yield header
+            for row in table_rows:
+                consumed.append(row)
+                yield row
+
+        table = plugins_utils.create_table(data(), samples=2, lazy=True)
+        # Only the samples were read to detect the field types
+        self.assertEqual(len(consumed), 2)
+        self.assertEqual(table.fields["field1"], rows.fields.IntegerField)
+        self.assertEqual(table.fields["field2"], rows.fields.FloatField)
+        self.assertEqual("<rows.Table 2 fields, ? rows>", repr(table))
+
+        result = plugins_utils.prepare_to_export(table)
+        self.assertEqual(next(result), header)
+        self.assertEqual(next(result), [1, 3.14])
+        self.assertEqual(next(result), [2, 2.71])
+        with self.assertRaises(ValueError):
+            next(result)  # "text" is not a `FloatField`
+
+    def test_create_table_lazy_closes_source(self):
+        source = mock.Mock(should_close=True, should_delete=False)
+        data = [["field1"], ["1"], ["2"]]
+        table = plugins_utils.create_table(
+            data, meta={"source": source}, samples=1, lazy=True
+        )
+        self.assertFalse(source.fobj.close.called)
+        self.assertEqual([row.field1 for row in table], [1, 2])
+        self.assertTrue(source.fobj.close.called)
+
+    def test_create_table_columnar(self):
+        data = [["field1", "field2"], ["1", "Álvaro"], ["2", "turicas"]]
+        table = plugins_utils.create_table(data, columnar=True)
+        self.assertIs(type(table), rows.ColumnarTable)
+        self.assertEqual(list(table["field1"]), [1, 2])
+        self.assertEqual(list(table["field2"]), ["Álvaro", "turicas"])
+
+        with self.assertRaises(ValueError):
+            plugins_utils.create_table(data, columnar=True, lazy=True)
+
     def test_create_table_different_number_of_fields(self):
         header = ["field1", "field2"]
         table_rows = [
@@ -266,6 +311,18 @@ class PluginUtilsTestCase(utils.RowsTestMixIn, unittest.TestCase):
             possible_field_names_errors(error_fields),
         )
 
+    def test_prepare_to_export_with_ColumnarTable(self):
+        table = rows.ColumnarTable(
+            fields=OrderedDict(
+                [("id", fields.IntegerField), ("name", fields.TextField)]
+            )
+        )
+        table.append({"id": 1, "name": "Álvaro"})
+        table.append({"id": None, "name": "turicas"})
+        result = plugins_utils.prepare_to_export(table, export_fields=["name", "id"])
+        self.assertEqual(next(result), ["name", "id"])
+        self.assertEqual(list(result), [["Álvaro", 1], ["turicas", None]])
+
     def test_prepare_to_export_with_FlexibleTable(self):
         flexible = rows.FlexibleTable()
         for row in utils.table:
@@ -299,6 +356,22 @@ class PluginUtilsTestCase(utils.RowsTestMixIn, unittest.TestCase):
             values = [expected_row[field_name] for field_name in export_fields]
             self.assertEqual(values, row)
 
+    def test_prepare_indexes(self):
+        field_names = ["id", "name", "birth_date"]
+        self.assertEqual(plugins_utils.prepare_indexes(None, field_names), [])
+        self.assertEqual(
+            plugins_utils.prepare_indexes(
+                ["id", "name, Birth Date", ("birth_date", "id")], field_names
+            ),
+            [["id"], ["name", "birth_date"], ["birth_date", "id"]],
+        )
+
+        with self.assertRaises(ValueError) as exception_context:
+            plugins_utils.prepare_indexes(["id,other"], field_names)
+        self.assertEqual(
+            exception_context.exception.args[0], 'Invalid field names: "other"'
+        )
+
     def test_prepare_to_export_wrong_obj_type(self):
         """`prepare_to_export` raises exception if obj isn't `*Table`"""
 
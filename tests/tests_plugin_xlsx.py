@@ -74,11 +74,13 @@ class PluginXlsxTestCase(utils.RowsTestMixIn, unittest.TestCase):
         call_args = mocked_create_table.call_args_list[0]
         self.assert_create_table_data(call_args, expected_meta=self.expected_meta)
 
-        # import using fobj
+        # import using fobj (rows are read lazily, while the file is open)
         with open(self.filename, "rb") as fobj:
             rows.import_from_xlsx(fobj)
-        call_args = mocked_create_table.call_args_list[1]
-        self.assert_create_table_data(call_args, expected_meta=self.expected_meta)
+            call_args = mocked_create_table.call_args_list[1]
+            self.assert_create_table_data(
+                call_args, expected_meta=self.expected_meta
+            )
 
     def test_export_to_xlsx_filename(self):
         filename = self.get_temp_filename()
@@ -142,7 +144,7 @@ class PluginXlsxTestCase(utils.RowsTestMixIn, unittest.TestCase):
             [7.89, 7.89, "13.64%", datetime.datetime(2015, 8, 18, 0, 0)],
             [9.87, 9.87, "13.14%", datetime.datetime(2015, 3, 4, 0, 0)],
         ]
-        self.assertEqual(expected_data, call_args[0][0])
+        self.assertEqual(expected_data, list(call_args[0][0]))
 
     def test_issue_290_can_read_sheet(self):
         rows.import_from_xlsx("tests/data/text_in_percent_cell.xlsx")
@@ -220,3 +222,57 @@ class PluginXlsxTestCase(utils.RowsTestMixIn, unittest.TestCase):
         self.assertEqual(
             list(table3), list(rows.import_from_xlsx(filename, sheet_name="Sheet2"))
         )
+
+    @mock.patch("rows.plugins.xlsx.Workbook", wraps=rows.plugins.xlsx.Workbook)
+    def test_export_new_file_uses_write_only_workbook(self, mocked_workbook):
+        table = rows.Table(
+            fields=OrderedDict(
+                [
+                    ("date", rows.fields.DateField),
+                    ("percent", rows.fields.PercentField),
+                    ("text", rows.fields.TextField),
+                ]
+            )
+        )
+        table.append(
+            {"date": datetime.date(2020, 1, 2), "percent": "12.5%", "text": "a"}
+        )
+        table.append({"date": None, "percent": None, "text": "b"})
+        data = rows.export_to_xlsx(table)
+        self.assertEqual(mocked_workbook.call_args[1], {"write_only": True})
+
+        workbook = rows.plugins.xlsx.load_workbook(BytesIO(data))
+        sheet = workbook.active
+        self.assertEqual(sheet["A2"].number_format, "YYYY-MM-DD")
+        self.assertEqual(sheet["B2"].number_format, "0.00%")
+        self.assertEqual(sheet["C2"].number_format, "General")
+        self.assertEqual(list(rows.import_from_xlsx(BytesIO(data))), list(table))
+
+    def test_import_fields(self):
+        table = rows.import_from_xlsx(
+            self.filename, import_fields=["percent_column", "integer_column"]
+        )
+        self.assertEqual(table.field_names, ["percent_column", "integer_column"])
+        self.assertEqual(
+            [row.integer_column for row in table], [1, 2, 3, 4, 5, 6, None]
+        )
+        self.assertEqual(table[0].percent_column, Decimal("0.01"))
+
+        # Rows are skipped only if all their cells are empty
+        workbook = rows.plugins.xlsx.Workbook()
+        sheet = workbook.active
+        for row in (["a", "b", "c"], [1, 2, 3], [None, None, 4], [2, None, None]):
+            sheet.append(row)
+        data = BytesIO()
+        workbook.save(data)
+        data.seek(0)
+        table = rows.import_from_xlsx(data, import_fields=["a"])
+        self.assertEqual(table.field_names, ["a"])
+        self.assertEqual([row.a for row in table], [1, None, 2])
+
+        with self.assertRaises(ValueError):
+            rows.import_from_xlsx(self.filename, import_fields=["nonexistent"])
+
+    def test_import_lazy(self):
+        table = rows.import_from_xlsx(self.filename, lazy=True, samples=2)
+        self.assertEqual(len(list(table)), 7)
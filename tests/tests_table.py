@@ -28,9 +28,18 @@ import six
 
 import rows
 import rows.fields as fields
-from rows.table import FlexibleTable, Table
+from rows.table import ColumnarTable, FlexibleTable, Table
 from rows.utils import Source
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 binary_type_name = six.binary_type.__name__
 
 
@@ -346,6 +355,178 @@ class TableTestCase(unittest.TestCase):
         self.assertFalse(table2._rows.__iter__.called)
 
 
+class TestColumnarTable(unittest.TestCase):
+    def setUp(self):
+        self.table = ColumnarTable(
+            fields=collections.OrderedDict(
+                [
+                    ("id", rows.fields.IntegerField),
+                    ("score", rows.fields.FloatField),
+                    ("active", rows.fields.BoolField),
+                    ("name", rows.fields.TextField),
+                    ("birthdate", rows.fields.DateField),
+                ]
+            )
+        )
+        self.table.append(
+            {
+                "id": 1,
+                "score": 1.5,
+                "active": True,
+                "name": "Álvaro",
+                "birthdate": "1987-04-29",
+            }
+        )
+        self.table.append({"id": None, "score": None, "active": None, "name": None})
+        self.table.append({"id": "3", "score": "3.5", "active": "false", "name": ""})
+
+    def test_ColumnarTable_is_present_on_main_namespace(self):
+        self.assertIn("ColumnarTable", dir(rows))
+        self.assertIs(ColumnarTable, rows.ColumnarTable)
+
+    def test_inheritance(self):
+        self.assertTrue(issubclass(ColumnarTable, Table))
+
+    def test_typed_columns(self):
+        self.assertIsInstance(self.table["id"], rows.table.IntegerColumn)
+        self.assertIsInstance(self.table["score"], rows.table.FloatColumn)
+        self.assertIsInstance(self.table["active"], rows.table.BoolColumn)
+        self.assertIsInstance(self.table["name"], rows.table.TextColumn)
+        self.assertIsInstance(self.table["birthdate"], rows.table.Column)
+        self.assertEqual(self.table["id"].data.typecode, "q")
+        self.assertEqual(self.table["score"].data.typecode, "d")
+        self.assertEqual(bytes(self.table["name"].data), "Álvaro".encode("utf-8"))
+        self.assertEqual(list(self.table["name"].offsets), [0, 7, 7, 7])
+        self.assertEqual(self.table["id"].null_count, 1)
+
+    def test_column_access_does_not_copy(self):
+        self.assertIs(self.table["id"], self.table["id"])
+        self.assertEqual(self.table["id"].values.tolist(), [1, 0, 3])
+        self.assertEqual(list(self.table["id"]), [1, None, 3])
+        self.assertEqual(list(self.table["active"]), [True, None, False])
+        self.assertEqual(list(self.table["name"]), ["Álvaro", None, ""])
+
+    def test_row_access(self):
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(
+            self.table[0],
+            self.table.Row(1, 1.5, True, "Álvaro", datetime.date(1987, 4, 29)),
+        )
+        self.assertEqual(self.table[1], self.table.Row(None, None, None, None, None))
+        self.assertEqual(self.table[-1].name, "")
+        self.assertEqual([row.id for row in self.table], [1, None, 3])
+
+    def test_insert_update_and_delete_rows(self):
+        self.table.insert(1, {"id": 2, "name": "inserted"})
+        self.table[0] = {"id": 10, "name": "changed"}
+        del self.table[2]
+        self.assertEqual(list(self.table["id"]), [10, 2, 3])
+        self.assertEqual(list(self.table["name"]), ["changed", "inserted", ""])
+        self.assertEqual(list(self.table["active"]), [None, None, False])
+
+    def test_setitem_and_delitem_column(self):
+        self.table["new"] = ["1", "2", "3"]
+        self.assertEqual(self.table.fields["new"], rows.fields.IntegerField)
+        self.assertEqual(self.table[2].new, 3)
+
+        del self.table["score"]
+        self.assertNotIn("score", self.table.field_names)
+        self.assertEqual(
+            self.table[0],
+            self.table.Row(1, True, "Álvaro", datetime.date(1987, 4, 29), 1),
+        )
+
+    def test_big_integers(self):
+        self.table.append({"id": 2 ** 70})
+        self.assertEqual(list(self.table["id"]), [1, None, 3, 2 ** 70])
+
+    def test_big_integers_setitem_and_insert(self):
+        self.table[1] = {"id": 2 ** 70}
+        self.assertEqual(list(self.table["id"]), [1, 2 ** 70, 3])
+        self.table.insert(0, {"id": 2 ** 71})
+        self.assertEqual(list(self.table["id"]), [2 ** 71, 1, 2 ** 70, 3])
+        self.assertIs(type(self.table["id"]), rows.table.Column)
+        self.assertEqual(list(self.table["name"]), [None, "Álvaro", None, ""])
+
+    def test_order_by_and_slicing(self):
+        del self.table[1]
+        self.table.order_by("-id")
+        self.assertEqual(list(self.table["id"]), [3, 1])
+        self.assertEqual(list(self.table["name"]), ["", "Álvaro"])
+
+        result = self.table[1:]
+        self.assertIs(type(result), ColumnarTable)
+        self.assertEqual(list(result["name"]), ["Álvaro"])
+
+    def test_add(self):
+        result = self.table + self.table
+        self.assertIs(type(result), ColumnarTable)
+        self.assertEqual(len(result), 6)
+        self.assertEqual(list(result)[:3], list(self.table))
+
+    def test_columns(self):
+        columns = self.table.columns()
+        self.assertEqual(list(columns.keys()), self.table.field_names)
+        self.assertIs(columns["id"], self.table["id"])
+
+        table = Table(fields=self.table.fields)
+        for row in self.table:
+            table.append(row._asdict())
+        columns = table.columns()
+        self.assertIsInstance(columns["id"], rows.table.IntegerColumn)
+        self.assertEqual(list(columns["name"]), ["Álvaro", None, ""])
+
+    def test_columns_lazy_table(self):
+        table = rows.plugins.utils.create_table(
+            [["id"], ["1"], ["2"]], force_types={"id": fields.IntegerField}, lazy=True
+        )
+        with self.assertRaises(ValueError):
+            table.columns()
+        with self.assertRaises(ValueError):
+            table.to_arrow()
+        with self.assertRaises(ValueError):
+            table.to_numpy("id")
+        self.assertEqual([row.id for row in table], [1, 2])  # Not consumed
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_arrow_round_trip(self):
+        arrow_table = self.table.to_arrow()
+        self.assertEqual(arrow_table.column_names, self.table.field_names)
+        self.assertEqual(arrow_table.column("id").to_pylist(), [1, None, 3])
+        self.assertEqual(arrow_table.column("active").to_pylist(), [True, None, False])
+        self.assertEqual(arrow_table.column("name").to_pylist(), ["Álvaro", None, ""])
+        # The table can still grow while the Arrow table exists
+        self.table.append({"id": 4})
+        self.assertEqual(arrow_table.num_rows, 3)
+        del self.table[-1]
+
+        result = Table.from_arrow(arrow_table, meta={"name": "test"})
+        self.assertIs(type(result), ColumnarTable)
+        self.assertEqual(dict(result.fields), dict(self.table.fields))
+        self.assertEqual(list(result), list(self.table))
+        self.assertEqual(result.meta, {"name": "test"})
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_from_arrow_sliced_and_chunked(self):
+        arrow_table = pyarrow.concat_tables(
+            [self.table.to_arrow(), self.table.to_arrow()]
+        ).slice(1, 4)
+        result = Table.from_arrow(arrow_table)
+        self.assertEqual(list(result["id"]), [None, 3, 1, None])
+        self.assertEqual(list(result["name"]), [None, "", "Álvaro", None])
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_to_numpy(self):
+        values = self.table.to_numpy("score")
+        self.assertEqual(values.dtype, numpy.float64)
+        self.assertEqual(values.mask.tolist(), [False, True, False])
+        self.assertEqual(values.compressed().tolist(), [1.5, 3.5])
+        self.assertEqual(self.table.to_numpy("birthdate").dtype.str, "<M8[D]")
+        self.assertEqual(self.table.to_numpy("name").dtype, object)
+        with self.assertRaises(KeyError):
+            self.table.to_numpy("unknown")
+
+
 class TestFlexibleTable(unittest.TestCase):
     def setUp(self):
         self.table = FlexibleTable()
@@ -357,6 +538,22 @@ class TestFlexibleTable(unittest.TestCase):
     def test_inheritance(self):
         self.assertTrue(issubclass(FlexibleTable, Table))
 
+    def test_columns(self):
+        self.table.append({"a": 1})
+        self.table.append({"a": None, "b": "spam"})
+        columns = self.table.columns()
+        self.assertIsInstance(columns["a"], rows.table.IntegerColumn)
+        self.assertEqual(list(columns["a"]), [1, None])
+        self.assertEqual(list(columns["b"]), [None, "spam"])
+
+        if pyarrow is not None:
+            arrow_table = self.table.to_arrow()
+            self.assertEqual(arrow_table.column_names, ["a", "b"])
+            self.assertEqual(arrow_table.column("b").to_pylist(), [None, "spam"])
+        if numpy is not None:
+            values = self.table.to_numpy("a")
+            self.assertEqual(values.compressed().tolist(), [1])
+
     def test_flexible_append_detect_field_type(self):
         self.assertEqual(len(self.table.fields), 0)
 